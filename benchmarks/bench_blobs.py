@@ -0,0 +1,115 @@
+"""
+Volumen de resultados con y sin el almacén de blobs (core.blobs).
+
+Uso (desde la raíz del proyecto):
+
+    python benchmarks/bench_blobs.py
+    python benchmarks/bench_blobs.py --emails 10000 --breaches-per-email 12
+
+Simula un batch de breach_recon + email_recon sobre los emails de una
+organización: cada email aparece en unas pocas filtraciones de un conjunto
+común (los 'details' de HIBP se repiten de un email a otro) y los enlaces de
+búsqueda de email_recon solo cambian en el propio email. Escribe los
+documentos con un NDJSONSink sin blobs y con blobs, y compara los bytes en
+disco (segmentos + blobs.sqlite3) y el tiempo de escritura y de lectura.
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import quote
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from corrosive_rage.core.blobs import get_blob_store  # noqa: E402
+from corrosive_rage.core.serialization import read_result  # noqa: E402
+from corrosive_rage.core.sinks import NDJSONSink  # noqa: E402
+
+DOMAIN = "corp.example"
+
+
+def build_breaches(count):
+    return [{
+        "Name": f"Breach{i}",
+        "Title": f"Breach {i}",
+        "Domain": f"breach{i}.com",
+        "BreachDate": f"20{10 + i % 14}-0{1 + i % 9}-15",
+        "AddedDate": "2021-03-02T08:44:31Z",
+        "PwnCount": 1000 * i + 17,
+        "Description": f"In {2010 + i % 14}, the service breach{i}.com suffered a data breach that exposed "
+                       "email addresses, usernames and passwords stored as salted hashes. " * 4,
+        "LogoPath": f"https://haveibeenpwned.com/Content/Images/PwnedLogos/Breach{i}.png",
+        "DataClasses": ["Email addresses", "Passwords", "Usernames", "IP addresses"],
+        "IsVerified": True, "IsFabricated": False, "IsSensitive": False,
+    } for i in range(count)]
+
+
+def documents(emails, breaches, per_email):
+    rng = random.Random(1)
+    for i in range(emails):
+        email = f"user{i}@{DOMAIN}"
+        details = rng.sample(breaches, per_email)
+        yield {"target": email, "module": "breach_recon", "timestamp": "2025-11-17T12:57:08",
+               "findings": {"target": email, "module": "breachrecon", "findings": [
+                   {"type": "breaches_found", "data": {"email": email, "breach_count": len(details),
+                                                       "details": details}}]}}
+        encoded = quote(email)
+        yield {"target": email, "module": "email_recon", "timestamp": "2025-11-17T12:57:09",
+               "findings": {"target": email, "module": "emailrecon", "findings": [
+                   {"type": "search_engine_links", "data": [
+                       {"name": "Google", "url": f"https://www.google.com/search?q=\"{encoded}\""},
+                       {"name": "Bing", "url": f"https://www.bing.com/search?q=\"{encoded}\""},
+                       {"name": "DuckDuckGo", "url": f"https://duckduckgo.com/?q=\"{encoded}\""},
+                       {"name": "Facebook", "url": f"https://www.facebook.com/search/people/?q={encoded}"},
+                       {"name": "Twitter", "url": f"https://twitter.com/search?q=\"{encoded}\"&f=user"},
+                   ]},
+                   {"type": "have_i_been_pwned_link",
+                    "data": {"search_url": f"https://haveibeenpwned.com/Account/{email}"}}]}}
+
+
+def disk_usage(directory):
+    return sum(path.stat().st_size for path in Path(directory).iterdir() if path.is_file())
+
+
+def run(directory, docs, blobs):
+    store = get_blob_store(directory) if blobs else None
+    sink = NDJSONSink(directory, blobs=store)
+    start = time.perf_counter()
+    locations = [sink.write(doc) for doc in docs]
+    sink.close()
+    write_time = time.perf_counter() - start
+    if store is not None:
+        # Que el WAL no cuente en el tamaño
+        store._conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    start = time.perf_counter()
+    for location in locations[:200]:
+        read_result(location)
+    read_time = (time.perf_counter() - start) / min(len(locations), 200)
+    return write_time, read_time, disk_usage(directory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del almacén de blobs")
+    parser.add_argument("--emails", type=int, default=2000)
+    parser.add_argument("--breaches", type=int, default=150, help="Filtraciones distintas en total")
+    parser.add_argument("--breaches-per-email", type=int, default=8)
+    args = parser.parse_args()
+
+    breaches = build_breaches(args.breaches)
+    docs = list(documents(args.emails, breaches, args.breaches_per_email))
+    print(f"{len(docs)} documentos ({args.emails} emails, {args.breaches_per_email} filtraciones de "
+          f"{args.breaches} por email)\n")
+    print(f"{'':<12} {'escribir':>10} {'leer/doc':>10} {'en disco':>10}")
+    sizes = {}
+    for label, blobs in (("sin blobs", False), ("con blobs", True)):
+        with tempfile.TemporaryDirectory() as directory:
+            write_time, read_time, size = run(directory, docs, blobs)
+        sizes[label] = size
+        print(f"{label:<12} {write_time * 1000:>8.0f}ms {read_time * 1e6:>8.0f}µs {size / 1e6:>8.2f}MB")
+    print(f"\nreducción: {sizes['sin blobs'] / sizes['con blobs']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
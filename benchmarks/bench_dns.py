@@ -0,0 +1,142 @@
+"""
+Rendimiento del resolutor DNS en bloque (core.dns) contra un servidor local.
+
+Uso (desde la raíz del proyecto):
+
+    python benchmarks/bench_dns.py
+    python benchmarks/bench_dns.py --names 50000 --concurrency 1000 --latency 20
+
+Levanta en un hilo un servidor DNS de prueba en 127.0.0.1 que responde con
+una latencia simulada ('--latency' ms): los nombres 'live*' tienen A y AAAA,
+los 'alias*' un CNAME a un 'live', el apex un MX, las IPs de 10.0.0.0/8 un
+PTR y el resto NXDOMAIN. Resuelve '--names' subdominios (A, AAAA, MX) y sus
+PTR con DNSResolver.resolve_many() / reverse_many(), comprueba las
+respuestas y mide las consultas por segundo, en frío y desde la caché.
+"""
+import argparse
+import asyncio
+import ipaddress
+import socket
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from corrosive_rage.core.dns import QTYPES, DNSCache, DNSResolver, _read_name, encode_name  # noqa: E402
+
+APEX = "example.test"
+
+
+def record(name, rtype, rdata, ttl=300):
+    return encode_name(name) + struct.pack("!HHIH", QTYPES[rtype], 1, ttl, len(rdata)) + rdata
+
+
+def answer(query):
+    qid = struct.unpack_from("!H", query)[0]
+    name, end = _read_name(query, 12)
+    qtype = struct.unpack_from("!H", query, end)[0]
+    question = query[12:end + 4]
+    label = name.split(".")[0]
+    records, rcode = [], 0
+    if name.endswith(".in-addr.arpa") and name.count(".") == 5:
+        if qtype == QTYPES["PTR"]:
+            ip = ".".join(reversed(name.split(".")[:4]))
+            records.append(record(name, "PTR", encode_name(f"host-{ip.replace('.', '-')}.{APEX}")))
+    elif label.startswith("alias"):
+        target = f"live{label[5:]}.{APEX}"
+        records.append(record(name, "CNAME", encode_name(target)))
+        if qtype == QTYPES["A"]:
+            records.append(record(target, "A", bytes([10, 1, 2, 3])))
+    elif label.startswith("live"):
+        number = int(label[4:] or 0)
+        if qtype == QTYPES["A"]:
+            records.append(record(name, "A", ipaddress.IPv4Address(0x0A000000 + number).packed))
+        elif qtype == QTYPES["AAAA"]:
+            records.append(record(name, "AAAA", ipaddress.IPv6Address(0x20010DB8 << 96 | number).packed))
+    elif name == APEX:
+        if qtype == QTYPES["MX"]:
+            records.append(record(name, "MX", struct.pack("!H", 10) + encode_name(f"mail.{APEX}")))
+    else:
+        rcode = 3
+    header = struct.pack("!HHHHHH", qid, 0x8180 | rcode, 1, len(records), 0, 0)
+    return header + question + b"".join(records)
+
+
+class StubServer(asyncio.DatagramProtocol):
+    def __init__(self, latency):
+        self.latency = latency
+        self.queries = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 22)
+
+    def datagram_received(self, data, addr):
+        self.queries += 1
+        response = answer(data)
+        if self.latency:
+            asyncio.get_running_loop().call_later(self.latency, self.transport.sendto, response, addr)
+        else:
+            self.transport.sendto(response, addr)
+
+
+def start_server(latency):
+    ready = threading.Event()
+    state = {}
+
+    def serve():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        transport, protocol = loop.run_until_complete(loop.create_datagram_endpoint(
+            lambda: StubServer(latency), local_addr=("127.0.0.1", 0)))
+        state.update(port=transport.get_extra_info("sockname")[1], protocol=protocol)
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=serve, daemon=True).start()
+    ready.wait()
+    return state["port"], state["protocol"]
+
+
+def timed(label, count, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed * 1000:>8.0f}ms {count / elapsed:>10.0f} consultas/s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del resolutor DNS en bloque")
+    parser.add_argument("--names", type=int, default=10000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=10, help="Latencia simulada del servidor (ms)")
+    args = parser.parse_args()
+
+    port, server = start_server(args.latency / 1000)
+    resolver = DNSResolver([f"127.0.0.1:{port}"], timeout=2, concurrency=args.concurrency, cache=DNSCache())
+    # Una cuarta parte de nombres muertos y otra de alias
+    names = [f"{('live', 'live', 'alias', 'old')[i % 4]}{i}.{APEX}" for i in range(args.names)] + [APEX]
+    queries = len(names) * 3
+    print(f"{len(names)} nombres, {queries} consultas, latencia {args.latency:g}ms, "
+          f"concurrencia {args.concurrency}\n")
+
+    results = timed("A/AAAA/MX en frío", queries, lambda: resolver.resolve_many(names))
+    timed("A/AAAA/MX desde la caché", queries, lambda: resolver.resolve_many(names))
+    ips = [f"10.0.{i // 256 % 256}.{i % 256}" for i in range(args.names)]
+    ptrs = timed("PTR en frío", len(ips), lambda: resolver.reverse_many(ips))
+
+    assert results["live0." + APEX]["A"].records == ("10.0.0.0",)
+    assert results["alias2." + APEX]["A"].cname == ("live2." + APEX,)
+    assert results["old3." + APEX]["A"].rcode == "NXDOMAIN"
+    assert results[APEX]["MX"].records == ("10 mail." + APEX,)
+    assert ptrs["10.0.0.7"].records == ("host-10-0-0-7." + APEX,)
+    failed = sum(1 for by_type in results.values() for a in by_type.values() if a.rcode not in ("NOERROR", "NXDOMAIN"))
+    print(f"\nconsultas recibidas por el servidor: {server.queries}, sin respuesta: {failed}")
+
+
+if __name__ == "__main__":
+    main()
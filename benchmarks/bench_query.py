@@ -0,0 +1,104 @@
+"""
+Tiempo de respuesta de 'corrosive-rage query' sobre el índice de hallazgos.
+
+Uso (desde la raíz del proyecto):
+
+    python benchmarks/bench_query.py
+    python benchmarks/bench_query.py --findings 2000000
+
+Crea en una carpeta temporal un catálogo con '--findings' hallazgos
+(resultados de ip_recon y domain_recon de muchos objetivos a lo largo de
+60 días) y mide varias consultas típicas con ResultsCatalog.query(), que es
+lo que ejecuta el comando. La primera fila es el tiempo de construir el
+índice, que en uso normal se reparte entre todos los guardados.
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from corrosive_rage.core.catalog import ResultsCatalog, parse_predicate  # noqa: E402
+
+DAY = 86400
+COUNTRIES = ["Spain", "United States", "Germany", "France", "Netherlands"]
+VULNS = ["CVE-2021-44228", "CVE-2023-4966", "CVE-2019-0708", "CVE-2022-1388"]
+
+
+def ip_document(rng, i):
+    ip = f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"
+    findings = [
+        {"type": "geolocation", "data": {"country": rng.choice(COUNTRIES), "city": f"City{i % 500}",
+                                         "isp": f"ISP {i % 40}"}},
+        {"type": "reverse_dns", "data": {"hostname": f"host{i}.example.net"}},
+        {"type": "shodan_host_info", "data": {
+            "country": rng.choice(COUNTRIES), "org": f"Org {i % 300}",
+            "ports": rng.sample([22, 80, 443, 3389, 8080, 8443], 3),
+            "vulns": rng.sample(VULNS, 1) if rng.random() < 0.05 else []}},
+    ]
+    return {"target": ip, "module": "ip_recon", "timestamp": "2025-11-17T12:57:08",
+            "findings": {"target": ip, "module": "iprecon", "findings": findings}}
+
+
+def domain_document(rng, i):
+    domain = f"site{i}.example.com"
+    findings = [
+        {"type": "whois", "data": {"registrar": f"Registrar {i % 20}", "creation_date": "2010-01-01"}},
+        {"type": "subdomain_enumeration", "data": {
+            "subdomains": [f"h{k}.{domain}" for k in range(rng.randint(1, 20))], "count": 0}},
+    ]
+    return {"target": domain, "module": "domain_recon", "timestamp": "2025-11-17T12:57:08",
+            "findings": {"target": domain, "module": "domainrecon", "findings": findings}}
+
+
+def build(catalog, total):
+    rng = random.Random(1)
+    now = time.time()
+    count = i = 0
+    while count < total:
+        doc = ip_document(rng, i) if i % 2 else domain_document(rng, i)
+        saved_at = now - 60 * DAY + 60 * DAY * count / total
+        catalog.add(doc, f"/results/{i}.json", saved_at=saved_at)
+        count += len(doc["findings"]["findings"])
+        i += 1
+    return now
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    rows = sum(1 for _ in func())
+    print(f"{label:<58} {(time.perf_counter() - start) * 1000:>8.1f}ms {rows:>9} filas")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de consultas sobre el índice de hallazgos")
+    parser.add_argument("--findings", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        catalog = ResultsCatalog(Path(directory) / "catalog.sqlite3")
+        # Solo para construirlo más deprisa; no cambia el plan de las consultas
+        catalog._conn.execute("PRAGMA synchronous=OFF")
+        start = time.perf_counter()
+        now = build(catalog, args.findings)
+        print(f"{'construir el índice':<58} {time.perf_counter() - start:>8.1f}s  {args.findings:>9} hallazgos\n")
+
+        timed("shodan_host_info con vulns (último resultado)", lambda: catalog.query(
+            finding_type="shodan_host_info", where=[parse_predicate("vulns?")], latest=True))
+        timed("shodan_host_info con el puerto 3389, últimos 7 días", lambda: catalog.query(
+            finding_type="shodan_host_info", where=[parse_predicate("ports~3389")], since=now - 7 * DAY))
+        timed("subdomain_enumeration del último mes", lambda: catalog.query(
+            module="domain_recon", finding_type="subdomain_enumeration", since=now - 30 * DAY))
+        timed("geolocation con country=Spain, limit 1000", lambda: catalog.query(
+            finding_type="geolocation", where=[parse_predicate("country=Spain")], limit=1000))
+        timed("todos los hallazgos de un objetivo", lambda: catalog.query(target="site1000.example.com"))
+        timed("comodín *.example.com, últimas 24 h", lambda: catalog.query(
+            target="*.example.com", since=now - DAY))
+        catalog.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Coste de serializar y leer un resultado grande de domain_recon (crt.sh).
+
+Uso (desde la raíz del proyecto):
+
+    python benchmarks/bench_serialization.py
+    python benchmarks/bench_serialization.py --subdomains 500000 --runs 5
+
+Construye un documento como el que guarda domain_recon para un dominio con
+muchos certificados (WHOIS + cientos de miles de subdominios) y mide, con
+cada serializador disponible, el tiempo de escritura, el de lectura y el
+tamaño. La fila 'json indent=4' es lo que hacía antes __main__ para el
+fichero y otra vez para stdout. orjson y msgpack se omiten si no están
+instalados.
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from corrosive_rage.core import serialization  # noqa: E402
+
+APEX = "example.com"
+
+
+def build_document(count):
+    names = [f"host{i}.zone{i % 997}.{APEX}" for i in range(count)]
+    return {
+        "target": APEX,
+        "module": "domain_recon",
+        "timestamp": "2025-11-17T12:57:08.123456",
+        "findings": {
+            "target": APEX,
+            "module": "domainrecon",
+            "findings": [
+                {"type": "whois", "data": {
+                    "registrar": "Example Registrar, Inc.",
+                    "creation_date": "1995-08-14 04:00:00",
+                    "expiration_date": "2030-08-13 04:00:00",
+                    "emails": ["abuse@example-registrar.com", "hostmaster@example.com"],
+                }},
+                {"type": "subdomain_enumeration", "data": {
+                    "subdomains": names,
+                    "count": len(names),
+                    "wildcards": names[::50],
+                }},
+            ],
+        },
+    }
+
+
+def timed(func, runs):
+    samples = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de resultados")
+    parser.add_argument("--subdomains", type=int, default=200_000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    doc = build_document(args.subdomains)
+    cases = [
+        ("json indent=4 (antiguo)",
+         lambda: json.dumps(doc, indent=4, ensure_ascii=False).encode("utf-8"), json.loads),
+        ("json compacto",
+         lambda: json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), json.loads),
+    ]
+    if serialization.orjson is not None:
+        orjson = serialization.orjson
+        cases.append(("orjson indent=2", lambda: orjson.dumps(doc, option=orjson.OPT_INDENT_2), orjson.loads))
+        cases.append(("orjson compacto", lambda: orjson.dumps(doc), orjson.loads))
+    if serialization.msgpack is not None:
+        cases.append(("msgpack", lambda: serialization.packb(doc), serialization.unpackb))
+
+    print(f"Documento: {args.subdomains} subdominios, mediana de {args.runs} ejecuciones\n")
+    print(f"{'serializador':<26} {'escribir':>10} {'leer':>10} {'tamaño':>10}")
+    for label, dump, load in cases:
+        dump_time, data = timed(dump, args.runs)
+        load_time, _ = timed(lambda: load(data), args.runs)
+        print(f"{label:<26} {dump_time * 1000:>8.1f}ms {load_time * 1000:>8.1f}ms {len(data) / 1e6:>8.2f}MB")
+
+    missing = [name for name, mod in (("orjson", serialization.orjson), ("msgpack", serialization.msgpack)) if mod is None]
+    if missing:
+        print(f"\n(no instalados: {', '.join(missing)})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Mide el tiempo de arranque en frío de la CLI.
+
+Uso (desde la raíz del proyecto):
+
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 20
+
+Lanza cada caso en un proceso nuevo varias veces y muestra la mediana:
+'--help' de las dos CLIs, la importación de cada módulo por separado (lo que
+paga una ejecución de un solo módulo antes de la primera petición) y, como
+referencia, la importación de todos los módulos de golpe, que es lo que
+hacía antes __main__ en cada arranque. Sale con código 1 si algún caso
+supera su objetivo.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+sys.path.insert(0, str(SRC))
+
+from corrosive_rage.core.registry import BUILTIN_MODULES  # noqa: E402
+
+# Objetivos (mediana, en segundos) sobre el coste de arrancar el intérprete.
+# Los módulos se miden aparte: su coste lo ponen sus dependencias.
+HELP_TARGET = 0.10
+MODULE_TARGET = 0.40
+
+
+def measure(code, runs):
+    """Mediana del tiempo de pared de 'python -c code' en un proceso nuevo."""
+    env = dict(os.environ, PYTHONPATH=str(SRC))
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], env=env,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de arranque de la CLI")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = measure("pass", args.runs)
+    cases = [
+        ("python -m corrosive_rage --help",
+         "import sys; sys.argv = ['corrosive_rage', '--help']; import runpy; runpy.run_module('corrosive_rage', run_name='__main__')",
+         HELP_TARGET),
+        ("corrosive-rage --help",
+         "from corrosive_rage.cli import cli; cli(['--help'])",
+         HELP_TARGET),
+    ]
+    for name in BUILTIN_MODULES:
+        cases.append((f"cargar {name}",
+                      f"from corrosive_rage.core.registry import get_registry; get_registry().load({name!r})",
+                      MODULE_TARGET))
+    eager = "; ".join(f"import {path.split(':')[0]}" for path, _ in BUILTIN_MODULES.values()
+                      if "phone_recon" not in path)
+    cases.append(("todos los módulos (arranque antiguo)", eager, None))
+
+    print(f"Intérprete vacío: {baseline * 1000:.0f} ms (se resta de cada caso)\n")
+    print(f"{'caso':<42} {'ms':>7} {'objetivo':>9}")
+    failed = False
+    for label, code, target in cases:
+        elapsed = max(0.0, measure(code, args.runs) - baseline)
+        status = ""
+        if target is not None:
+            ok = elapsed <= target
+            failed |= not ok
+            status = f"{target * 1000:>6.0f} {'ok' if ok else 'LENTO'}"
+        print(f"{label:<42} {elapsed * 1000:>7.0f} {status}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Micro-benchmark de SubdomainSet frente a la deduplicación antigua basada en listas.
+
+Uso (desde la raíz del proyecto):
+
+    python benchmarks/bench_subdomains.py
+    python benchmarks/bench_subdomains.py --sizes 1000 100000 1000000
+
+Genera nombres sintéticos al estilo de crt.sh (duplicados, comodines,
+mayúsculas, puntos finales y nombres fuera de ámbito) y mide el tiempo de
+inserción + ordenación. La versión con listas solo se mide hasta 10^4
+nombres porque es cuadrática.
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from corrosive_rage.core.subdomains import SubdomainSet  # noqa: E402
+
+APEX = "example.com"
+LEGACY_LIMIT = 10_000
+
+
+def generate_names(count: int, seed: int = 1337):
+    """Nombres con ~30% de duplicados y algo de ruido típico de los certificados."""
+    rng = random.Random(seed)
+    unique = max(1, int(count * 0.7))
+    for _ in range(count):
+        i = rng.randrange(unique)
+        name = f"host{i}.zone{i % 997}.{APEX}"
+        roll = rng.random()
+        if roll < 0.05:
+            name = "*." + name
+        elif roll < 0.10:
+            name = name.upper() + "."
+        elif roll < 0.12:
+            name = f"host{i}.other.org"
+        yield name
+
+
+def legacy_dedupe(names, apex):
+    """Réplica del bucle original de domain_recon (lista + set + sorted)."""
+    subdomains = []
+    for name in names:
+        if name and name not in subdomains:
+            subdomains.append(name)
+    return sorted(set(s for s in subdomains if s and s != apex and not s.startswith("*.")))
+
+
+def bench(size: int):
+    names = list(generate_names(size))
+
+    start = time.perf_counter()
+    subdomains = SubdomainSet(APEX)
+    subdomains.update(names)
+    result = subdomains.sorted()
+    engine_time = time.perf_counter() - start
+
+    legacy_time = None
+    if size <= LEGACY_LIMIT:
+        start = time.perf_counter()
+        legacy_dedupe(names, APEX)
+        legacy_time = time.perf_counter() - start
+
+    return engine_time, legacy_time, len(result), subdomains.rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de SubdomainSet")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'nombres':>10} {'SubdomainSet':>14} {'ns/nombre':>10} {'lista (antiguo)':>16} {'únicos':>9} {'descartados':>12}")
+    for size in args.sizes:
+        engine_time, legacy_time, unique, rejected = bench(size)
+        legacy = f"{legacy_time:.3f}s" if legacy_time is not None else "-"
+        print(f"{size:>10} {engine_time:>13.3f}s {engine_time / size * 1e9:>10.0f} {legacy:>16} {unique:>9} {rejected:>12}")
+
+
+if __name__ == "__main__":
+    main()
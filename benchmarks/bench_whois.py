@@ -0,0 +1,102 @@
+"""
+Batch de WHOIS con el motor de core.whois frente a servidores que limitan.
+
+Uso (desde la raíz del proyecto):
+
+    python benchmarks/bench_whois.py
+    python benchmarks/bench_whois.py --domains 5000 --server-limit 40
+
+Simula un servidor WHOIS por TLD con una latencia fija que, como los reales,
+responde "limit exceeded" cuando recibe más de '--server-limit' consultas en
+un segundo. Lanza '--domains' nombres (la mitad son subdominios de otros
+dominios del batch) con WhoisEngine.lookup_many() y compara con consultar
+cada nombre tal cual, sin ritmo por servidor: consultas enviadas, respuestas
+limitadas y tiempo total. El tiempo está a escala (cupos por segundo en vez
+de por minuto).
+"""
+import argparse
+import collections
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from corrosive_rage.core.ratelimit import RateLimitRule  # noqa: E402
+from corrosive_rage.core.whois import WhoisEngine, is_throttled  # noqa: E402
+
+TLDS = ["com", "net", "org", "es", "de", "io", "co.uk", "fr"]
+
+
+class FakeServers:
+    def __init__(self, limit, latency):
+        self.limit = limit
+        self.latency = latency
+        self.recent = collections.defaultdict(collections.deque)
+        self.queries = 0
+        self.throttled = 0
+        self.lock = threading.Lock()
+
+    def fetch(self, domain, timeout):
+        server = domain.rsplit(".", 1)[-1]
+        with self.lock:
+            self.queries += 1
+            now = time.monotonic()
+            window = self.recent[server]
+            while window and now - window[0] > 1:
+                window.popleft()
+            window.append(now)
+            limited = len(window) > self.limit
+            if limited:
+                self.throttled += 1
+        time.sleep(self.latency)
+        if limited:
+            return "WHOIS LIMIT EXCEEDED - SEE WWW.EXAMPLE/WHOIS FOR DETAILS\n"
+        return (f"Domain Name: {domain.upper()}\nRegistrar: Example Registrar, Inc.\n"
+                f"Creation Date: 2010-01-01T00:00:00Z\nRegistry Expiry Date: 2030-01-01T00:00:00Z\n"
+                f"Registrant Email: admin@{domain}\n")
+
+
+def domains(count):
+    names = []
+    for i in range(count // 2):
+        apex = f"site{i}.{TLDS[i % len(TLDS)]}"
+        names += [apex, f"www.{apex}" if i % 2 else f"mail.shop.{apex}"]
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del motor WHOIS")
+    parser.add_argument("--domains", type=int, default=2000)
+    parser.add_argument("--server-limit", type=int, default=40, help="Consultas por segundo que admite cada servidor")
+    parser.add_argument("--latency", type=float, default=20, help="Latencia de cada consulta (ms)")
+    args = parser.parse_args()
+    names = domains(args.domains)
+    print(f"{len(names)} nombres en {len(TLDS)} TLDs, cada servidor admite {args.server_limit} consultas/s\n")
+    print(f"{'':<28} {'consultas':>10} {'limitadas':>10} {'fallidas':>9} {'tiempo':>9}")
+
+    # Sin motor: cada nombre tal cual, 32 hilos, sin ritmo ni reintentos
+    servers = FakeServers(args.server_limit, args.latency / 1000)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        texts = list(executor.map(lambda name: servers.fetch(name, 10), names))
+    failed = sum(1 for text in texts if is_throttled(text))
+    print(f"{'por nombre, sin ritmo':<28} {servers.queries:>10} {servers.throttled:>10} {failed:>9} "
+          f"{time.perf_counter() - start:>8.1f}s")
+
+    servers = FakeServers(args.server_limit, args.latency / 1000)
+    # Mismo margen que la regla por defecto (30/60 frente a cupos de ~40/60), a escala de segundos
+    rule = RateLimitRule(rate=args.server_limit * 0.75, period=1, burst=3, max_in_flight=4)
+    engine = WhoisEngine(default_rule=rule, backoff=0.5, fetch=servers.fetch)
+    start = time.perf_counter()
+    records = engine.lookup_many(names)
+    failed = sum(1 for record in records.values() if isinstance(record, Exception))
+    print(f"{'WhoisEngine.lookup_many':<28} {servers.queries:>10} {servers.throttled:>10} {failed:>9} "
+          f"{time.perf_counter() - start:>8.1f}s")
+    assert records[names[1]]["registrar"] == "Example Registrar, Inc."
+
+
+if __name__ == "__main__":
+    main()
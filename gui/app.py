@@ -1,17 +1,24 @@
 import logging
-import json
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, font
 from datetime import datetime
 import subprocess
 import os
 import threading
+import time
 import sys
+import tempfile
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.append(str(PROJECT_ROOT / "src"))
 
+from corrosive_rage.core.catalog import get_catalog  # noqa: E402
+from corrosive_rage.core.diffs import is_delta  # noqa: E402
+from corrosive_rage.core.serialization import (  # noqa: E402
+    EXTENSIONS, FORMAT_JSON, dumps, dumps_str, load_result, loads,
+)
+
 # ttkbootstrap (tema oscuro chulo, opcional)
 try:
     from ttkbootstrap import Style as TtkStyle
@@ -277,13 +284,10 @@ class OsintGui:
     # ============================================================
 
     def scan_modules(self):
-        mods_dir = PROJECT_ROOT / "src" / "corrosive_rage" / "modules"
-        modules = []
-        if mods_dir.exists():
-            for py in mods_dir.glob("*.py"):
-                if not py.name.startswith("_"):
-                    modules.append(py.stem)
-        return modules
+        # Mismo registro que la CLI (incluye módulos de terceros por entry points);
+        # no importa ningún módulo, solo lista sus nombres
+        from corrosive_rage.core.registry import get_registry
+        return get_registry().names()
 
     def toggle_select_all(self):
         value = self.select_all_var.get()
@@ -321,9 +325,8 @@ class OsintGui:
 
     def _run_modules_thread(self, target, modules):
         try:
-            for idx, mod in enumerate(modules, start=1):
-                self.update_output(f"\n[+] Ejecutando módulo {idx}/{len(modules)}: {mod}\n\n")
-                self.run_single_module(target, mod)
+            self.update_output(f"\n[+] Ejecutando {len(modules)} módulo(s) en un único proceso: {', '.join(modules)}\n\n")
+            self.run_modules(target, modules)
         finally:
             self.running = False
             self.progress.stop()
@@ -332,21 +335,27 @@ class OsintGui:
             self.spinner_var.set("")
 
     # ============================================================
-    #   EJECUCIÓN DE UN MÓDULO + CARGA DE JSON
+    #   EJECUCIÓN DE LOS MÓDULOS + CARGA DE JSON
     # ============================================================
 
-    def run_single_module(self, target, module):
+    def run_modules(self, target, modules):
+        """
+        Lanza un solo proceso 'corrosive_rage -m mod1,mod2,...': los módulos se
+        ejecutan a la vez compartiendo configuración, conexiones y caché, y
+        escriben un único JSON combinado.
+        """
         interpreter = sys.executable or "python"
         base_dir = PROJECT_ROOT
         results_dir = PROJECT_ROOT / "results"
         results_dir.mkdir(exist_ok=True)
 
-        cmd = [interpreter, "-m", "corrosive_rage", "-t", target, "-m", module]
+        cmd = [interpreter, "-m", "corrosive_rage", "-t", target, "-m", ",".join(modules)]
 
         env = os.environ.copy()
         env["PYTHONPATH"] = str(base_dir / "src")
 
         try:
+            started = time.time()
             process = subprocess.Popen(
                 cmd,
                 stdout=subprocess.PIPE,
@@ -365,47 +374,38 @@ class OsintGui:
             process.stdout.close()
             process.wait()
 
-            # Buscar el JSON más reciente asociado a este target y módulo
-            files = list(results_dir.glob("*.json"))
-            if not files:
-                self.update_output("[i] No hay archivos JSON en 'results'.\n")
+            if process.returncode != 0:
+                self.update_output(f"[!] La ejecución terminó con errores (código {process.returncode}); no se carga ningún resultado.\n")
                 return
 
-            safe_target_variants = {
-                target.lower(),
-                target.replace(".", "_").lower(),
-                self._safe_target(target).lower()
-            }
-            module_flat = module.replace("_", "").lower()
-
-            matches = []
-            for f in files:
-                stem_low = f.stem.lower()
-                stem_flat = stem_low.replace("_", "").replace("-", "")
-                if any(tv in stem_low for tv in safe_target_variants) and module_flat in stem_flat:
-                    matches.append(f)
-
-            if matches:
-                latest = max(matches, key=lambda f: f.stat().st_mtime)
-                self.last_run_files.append(latest)
-                try:
-                    data = json.loads(latest.read_text(encoding="utf-8"))
-                    self.show_json(data)
-                    self.update_output(f"[+] Resultado cargado: {latest.name}\n")
-                except Exception as e:
-                    self.update_output(f"[!] Error leyendo JSON {latest.name}: {e}\n")
-            else:
+            # El catálogo sabe qué guardó esta ejecución: solo cuenta lo
+            # guardado después de lanzarla, nunca un resultado anterior
+            module_label = modules[0] if len(modules) == 1 else "combined"
+            record = self.catalog().latest(target=target, module=module_label, since=started)
+            if record is None:
                 # No damos el coñazo con mensajes de error: simplemente informativo
-                self.update_output("[i] No se encontró un JSON asociado a este módulo (puede haberse guardado con otro nombre).\n")
+                self.update_output("[i] No se encontró un JSON asociado a esta ejecución (puede haberse guardado con otro nombre).\n")
+                return
 
-        except Exception as e:
-            self.update_output(f"\n[!] Error ejecutando módulo {module}: {e}\n")
+            latest = Path(record.location)
+            self.last_run_files.append(latest)
+            try:
+                data = load_result(latest)
+                self.show_json(data)
+                self.update_output(f"[+] Resultado cargado: {latest.name}\n")
+            except Exception as e:
+                self.update_output(f"[!] Error leyendo JSON {latest.name}: {e}\n")
 
-    # ============================================================
+        except Exception as e:
+            self.update_output(f"\n[!] Error ejecutando módulos {', '.join(modules)}: {e}\n")
 
     def _safe_target(self, target: str) -> str:
         return "".join(c if c.isalnum() or c == "_" else "_" for c in target.replace(".", "_"))
 
+    def catalog(self):
+        """Índice SQLite de los resultados guardados (results/catalog.sqlite3)."""
+        return get_catalog(PROJECT_ROOT / "results")
+
     # ============================================================
 
     def update_output(self, text: str):
@@ -417,7 +417,7 @@ class OsintGui:
     def show_json(self, data: dict):
         self.results_preview.config(state="normal")
         self.results_preview.delete("1.0", tk.END)
-        self.results_preview.insert(tk.END, json.dumps(data, indent=2, ensure_ascii=False))
+        self.results_preview.insert(tk.END, dumps_str(data, pretty=True))
         self.results_preview.config(state="disabled")
 
     def clear_output(self):
@@ -468,17 +468,21 @@ class OsintGui:
             messagebox.showinfo("Info", STRINGS["no_results_folder"])
             return
 
-        files = list(results_dir.glob("*.json"))
-        if not files:
+        record = self.catalog().latest()
+        if record is None:
             messagebox.showinfo("Info", STRINGS["no_results_files"])
             return
 
-        latest = max(files, key=lambda f: f.stat().st_mtime)
+        latest = Path(record.location)
 
         try:
-            data = json.loads(latest.read_text(encoding="utf-8"))
+            data = load_result(latest)
             self.show_json(data)
 
+            if not self.is_readable_as_is(latest):
+                # Con blobs o diferencias (o dentro de un segmento NDJSON) el
+                # fichero solo tiene referencias: se abre una copia completa
+                latest = self.write_rehydrated_copy(latest, data)
             if sys.platform.startswith("win"):
                 os.startfile(latest)  # type: ignore
             elif sys.platform == "darwin":
@@ -488,6 +492,24 @@ class OsintGui:
         except Exception as e:
             messagebox.showerror("Error", f"No se pudo abrir el archivo:\n{e}")
 
+    @staticmethod
+    def is_readable_as_is(location):
+        """Si el fichero es un JSON completo, sin referencias a blobs ni a otro resultado."""
+        if not location.is_file() or location.suffix != EXTENSIONS[FORMAT_JSON]:
+            return False
+        raw = loads(location.read_bytes())
+        return not (isinstance(raw, dict) and ('blobs' in raw or is_delta(raw)))
+
+    @staticmethod
+    def write_rehydrated_copy(location, data):
+        """Guarda el documento ya reconstruido en un JSON temporal y devuelve su ruta."""
+        copies_dir = Path(tempfile.gettempdir()) / "corrosive_rage"
+        copies_dir.mkdir(parents=True, exist_ok=True)
+        name = "".join(c if c.isalnum() or c in "._-" else "_" for c in location.name)
+        copy = copies_dir / f"{Path(name).stem}.json"
+        copy.write_bytes(dumps(data, pretty=True))
+        return copy
+
     def export_pdf_report(self):
         # Si no hay lista de archivos de esta sesión, intentamos inferirlos de la carpeta results
         if not self.last_run_files:
@@ -499,8 +521,9 @@ class OsintGui:
                 )
                 return
 
-            files = sorted(results_dir.glob("*.json"), key=lambda f: f.stat().st_mtime, reverse=True)
-            if not files:
+            catalog = self.catalog()
+            recent = catalog.find(limit=5)
+            if not recent:
                 messagebox.showinfo(
                     "Info",
                     "No hay archivos JSON en la carpeta 'results'."
@@ -508,14 +531,10 @@ class OsintGui:
                 return
 
             current_target = self.target_var.get().strip()
-            if current_target:
-                safe_target = self._safe_target(current_target).replace(".", "_").lower()
-                filtered = [f for f in files if safe_target in f.stem.lower()]
-            else:
-                filtered = []
+            filtered = catalog.find(target=current_target, limit=None) if current_target else []
 
-            selected = filtered or files[:5]
-            self.last_run_files = selected
+            selected = filtered or recent
+            self.last_run_files = [Path(record.location) for record in selected]
 
         try:
             from reportlab.lib.pagesizes import A4
@@ -551,7 +570,7 @@ class OsintGui:
 
             for json_file in self.last_run_files:
                 try:
-                    data = json.loads(json_file.read_text(encoding="utf-8"))
+                    data = load_result(json_file)
                 except Exception as e:
                     story.append(Paragraph(
                         f"Error leyendo {json_file.name}: {e}",
@@ -560,11 +579,12 @@ class OsintGui:
                     story.append(Spacer(1, 12))
                     continue
 
-                story.append(Paragraph(f"Módulo: {data.get('module', 'N/A')}", styles["Heading2"]))
+                module_label = ", ".join(data["modules"]) if data.get("modules") else data.get("module", "N/A")
+                story.append(Paragraph(f"Módulo: {module_label}", styles["Heading2"]))
                 story.append(Paragraph(f"Archivo: {json_file.name}", styles["Normal"]))
                 story.append(Spacer(1, 6))
 
-                pretty = json.dumps(data, indent=2, ensure_ascii=False)
+                pretty = dumps_str(data, pretty=True)
                 for line in pretty.splitlines():
                     story.append(Paragraph(line.replace(" ", "&nbsp;"), styles["Code"]))
                 story.append(Spacer(1, 12))
@@ -1,36 +1,32 @@
 import argparse
+import functools
 import sys
-import json
 from pathlib import Path
 from datetime import datetime
 import configparser
+import sqlite3
 
-# Mapeo de nombre -> clase, igual que antes
-from corrosive_rage.modules import (
-    domain_recon,
-    ip_recon,
-    email_recon,
-    username_recon,
-    dork_recon,
-    breach_recon,
-    company_recon,
-    metadata_recon
-)
-
-MODULES = {
-    'domain_recon': domain_recon.DomainReconModule,
-    'ip_recon': ip_recon.IpReconModule,
-    'email_recon': email_recon.EmailReconModule,
-    'username_recon': username_recon.UsernameReconModule,
-    'dork_recon': dork_recon.DorkReconModule,
-    'breach_recon': breach_recon.BreachReconModule,
-    'company_recon': company_recon.CompanyReconModule,
-    'metadata_recon': metadata_recon.MetadataReconModule,
-}
+from corrosive_rage.core.batch import DEFAULT_WORKERS, BatchRunner, iter_targets
+from corrosive_rage.core.cache import MODE_DEFAULT, MODE_OFF, MODE_REFRESH
+from corrosive_rage.core.catalog import get_catalog
+from corrosive_rage.core.diffs import DEFAULT_MAX_DELTA_CHAIN, plan_save
+from corrosive_rage.core.journal import STATE_DONE, STATE_FAILED, STATE_QUEUED, STATE_RUNNING, JobJournal
+from corrosive_rage.core.registry import get_registry
+from corrosive_rage.core.resilience import format_breaker_summary, get_breakers
+from corrosive_rage.core.serialization import FORMAT_JSON, FORMAT_MSGPACK, dumps_str
+from corrosive_rage.core.sinks import COMPRESSION_GZIP, COMPRESSION_NONE, COMPRESSION_ZSTD, SINK_FILE, SINK_NDJSON, FileSink, build_sink
+
+# Los módulos y la pila HTTP (requests, asyncio, shodan, whois...) se importan
+# solo cuando hacen falta, para que '--help' y los errores de uso sean
+# inmediatos y cada ejecución cargue únicamente lo que usa.
+
+# Nombre de "módulo" de los documentos que combinan varios módulos
+COMBINED_MODULE = 'combined'
 
 # 🔹 BASES de ruta bien definidas
 PROJECT_ROOT = Path(__file__).resolve().parents[2]   # C:\...\corrosive_rage
 SRC_ROOT = PROJECT_ROOT / "src"
+RESULTS_DIR = PROJECT_ROOT / "results"
 
 
 def load_config():
@@ -61,62 +57,334 @@ def load_config():
     return config
 
 
+def export_http_traces(trace_file, metrics_file):
+    """Exporta las trazas HTTP de la ejecución si se pidió por línea de comandos."""
+    from corrosive_rage.core.tracing import get_collector
+
+    collector = get_collector()
+    try:
+        if trace_file:
+            collector.export_json(Path(trace_file))
+            print(f"[*] Traza HTTP guardada en: {trace_file}")
+        if metrics_file:
+            collector.export_prometheus(Path(metrics_file))
+            print(f"[*] Métricas HTTP guardadas en: {metrics_file}")
+    except OSError as e:
+        print(f"[!] No se pudieron exportar las trazas HTTP: {e}")
+
+
+def run_module(module_name, target, config):
+    """Ejecuta un módulo sobre un objetivo y devuelve el documento de resultados."""
+    from corrosive_rage.core.tracing import module_scope
+
+    # Importar (solo ahora) e instanciar el módulo correspondiente
+    module_class = get_registry().load(module_name)
+    module_instance = module_class(target=target, config=config)
+
+    # Ejecutar (las peticiones HTTP quedan etiquetadas con el módulo)
+    with module_scope(module_name):
+        module_instance.run()
+
+    # Recoger resultados
+    return {
+        'target': target,
+        'module': module_name,
+        'timestamp': datetime.now().isoformat(),
+        'findings': module_instance.results.to_dict()
+    }
+
+
+def parse_modules(module_arg):
+    """
+    Interpreta -m: un módulo (o su alias corto), varios separados por comas
+    o 'all'. Devuelve la lista de nombres canónicos o lanza ValueError con
+    los desconocidos.
+    """
+    registry = get_registry()
+    if module_arg.strip().lower() == 'all':
+        return registry.names()
+    names = []
+    unknown = []
+    for raw_name in module_arg.split(','):
+        if not raw_name.strip():
+            continue
+        name = registry.resolve(raw_name)
+        if name is None:
+            unknown.append(raw_name.strip())
+        elif name not in names:
+            names.append(name)
+    if unknown or not names:
+        raise ValueError(', '.join(unknown) or module_arg)
+    return names
+
+
+def run_modules(module_names, target, config):
+    """
+    Ejecuta uno o varios módulos sobre el mismo objetivo. Con varios, corren
+    a la vez en el mismo proceso (compartiendo configuración, pools HTTP y
+    caché) y se devuelve un único documento combinado.
+    """
+    if len(module_names) == 1:
+        return run_module(module_names[0], target, config)
+
+    import asyncio
+
+    from corrosive_rage.core.aio import gather_limited
+    from corrosive_rage.core.tracing import module_scope
+
+    registry = get_registry()
+    instances = {}
+
+    async def run_one(name):
+        # La importación del módulo también cuenta como parte de su ejecución:
+        # si le faltan dependencias, solo falla él
+        instances[name] = registry.load(name)(target=target, config=config)
+        with module_scope(name):
+            return await instances[name].arun()
+
+    outcomes = asyncio.run(gather_limited(
+        [functools.partial(run_one, name) for name in module_names], len(module_names)
+    ))
+
+    results = {}
+    for name, outcome in zip(module_names, outcomes):
+        if isinstance(outcome, BaseException):
+            results[name] = {'error': f"{type(outcome).__name__}: {outcome}"}
+        else:
+            results[name] = instances[name].results.to_dict()
+
+    return {
+        'target': target,
+        'module': COMBINED_MODULE,
+        'modules': module_names,
+        'timestamp': datetime.now().isoformat(),
+        'results': results
+    }
+
+
+def max_delta_chain(config, full=False):
+    """
+    Saltos máximos de diferencias encadenadas antes de volver a guardar un
+    resultado completo; 0 si el guardado incremental está desactivado.
+    """
+    if full or not config.getboolean('results', 'incremental', fallback=True):
+        return 0
+    return config.getint('results', 'max_delta_chain', fallback=DEFAULT_MAX_DELTA_CHAIN)
+
+
+def save_results(output_data, sink=None, max_chain=0):
+    """
+    Guarda el documento en el destino de resultados (por defecto, un JSON por
+    ejecución SIEMPRE en <PROJECT_ROOT>/results), lo registra en el catálogo
+    de resultados y devuelve dónde quedó. Con 'max_chain' > 0, si ya hay un
+    resultado del mismo objetivo y módulo solo se guardan los hallazgos
+    añadidos y eliminados respecto a él.
+    """
+    catalog = get_catalog(RESULTS_DIR)
+    document, extra = output_data, {}
+    try:
+        document, extra = plan_save(catalog, output_data, max_chain)
+    except sqlite3.Error as e:
+        print(f"[!] No se pudo consultar el catálogo, se guarda el resultado completo: {e}")
+    location = (sink or FileSink(RESULTS_DIR)).write(document)
+    try:
+        catalog.add(output_data, location, **extra)
+    except sqlite3.Error as e:
+        # El resultado ya está guardado; solo falla su indexación
+        print(f"[!] No se pudo indexar el resultado en el catálogo: {e}")
+    return location
+
+
+def print_breaker_summary():
+    breakers = get_breakers().summary()
+    if breakers:
+        print("[!] Hosts con fallos durante la ejecución (circuit breakers):")
+        print(format_breaker_summary(breakers) + "\n")
+
+
+def run_target(module_names, target, config, pipeline=None):
+    """
+    Ejecuta los módulos sobre un objetivo o, si se pasa un Pipeline, usa el
+    objetivo como semilla y expande el grafo de reconocimiento a partir de él.
+    """
+    if pipeline is not None:
+        return pipeline.run(target, config, module_names)
+    return run_modules(module_names, target, config)
+
+
+def module_errors(output_data, module_names):
+    """
+    Errores por módulo de un documento: los de un resultado combinado
+    ({'results': {módulo: {'error': ...}}}) o, en un pipeline, el primero de
+    sus pasos fallidos (bajo el nombre de su único trabajo).
+    """
+    if isinstance(output_data.get('results'), dict):
+        return {name: result['error'] for name, result in output_data['results'].items()
+                if isinstance(result, dict) and 'error' in result}
+    if isinstance(output_data.get('runs'), list):
+        failed = [run for run in output_data['runs'] if run.get('error')]
+        if failed:
+            return {name: f"{failed[0]['module']}({failed[0].get('value', '')}): {failed[0]['error']}"
+                    for name in module_names}
+    return {}
+
+
+def default_journal_path(targets_file, module_names, pipeline=None):
+    """Diario por defecto: results/journals/<fichero>.<módulos>.journal"""
+    modules = "-".join(module_names) + ("-pipeline" if pipeline is not None else "")
+    return RESULTS_DIR / "journals" / f"{targets_file.stem}.{modules}.journal"
+
+
+def run_batch(module_names, targets_file, config, workers, max_in_flight, pipeline=None,
+              journal_path=None, resume=False, sink=None, max_chain=0):
+    """
+    Modo batch: recorre el fichero de objetivos de forma perezosa, descarta
+    duplicados y reparte los trabajos en un pool de hilos con memoria acotada.
+    Cada trabajo queda anotado en un diario; con 'resume' se saltan los que
+    ya terminaron bien en una ejecución anterior y se repiten el resto.
+    """
+    journal_path = journal_path or default_journal_path(targets_file, module_names, pipeline)
+    # Una entrada por (objetivo, módulo); el pipeline es un solo trabajo por semilla
+    journal_modules = ([",".join(module_names) + ":pipeline"] if pipeline is not None else list(module_names))
+    journal = JobJournal(journal_path, resume=resume)
+    if resume and journal.previous:
+        print(f"[*] Reanudando desde {journal_path}: {journal.previous.get(STATE_DONE, 0)} trabajos ya hechos")
+
+    def pending_modules(target):
+        return [name for name in journal_modules if not journal.is_done(target, name)]
+
+    def job(target):
+        pending = pending_modules(target)
+        for name in pending:
+            journal.record(target, name, STATE_RUNNING)
+        try:
+            output_data = run_target(module_names if pipeline is not None else pending, target, config, pipeline)
+            filename = save_results(output_data, sink, max_chain)
+        except Exception as e:
+            for name in pending:
+                journal.record(target, name, STATE_FAILED, error=f"{type(e).__name__}: {e}")
+            print(f"[!] {target}: {type(e).__name__}: {e}", flush=True)
+            return False
+        # Un módulo que falló dentro de un resultado combinado (o un paso del
+        # pipeline) queda como fallido para repetirlo al reanudar
+        errors = module_errors(output_data, pending)
+        for name in pending:
+            if name in errors:
+                journal.record(target, name, STATE_FAILED, result=filename, error=errors[name])
+            else:
+                journal.record(target, name, STATE_DONE, result=filename)
+        if errors:
+            print(f"[!] {target}: {filename} (con errores: {', '.join(errors)})", flush=True)
+            return False
+        print(f"[+] {target}: {filename}", flush=True)
+        return True
+
+    print(f"[*] Modo batch: {targets_file} ({workers} workers, máx. {max_in_flight or workers * 2} en vuelo)")
+    runner = BatchRunner(
+        job, workers=workers, max_in_flight=max_in_flight,
+        skip=lambda target: not pending_modules(target),
+        on_submit=lambda target: [journal.record(target, name, STATE_QUEUED) for name in pending_modules(target)],
+    )
+    targets = iter_targets(targets_file)
+    if 'ip_recon' in module_names and pipeline is None:
+        # Se leen objetivos por delante para geolocalizar sus IPs en lotes de 100
+        from corrosive_rage.core.geoip import get_geo_batcher, prefetch_ahead
+        targets = prefetch_ahead(targets, get_geo_batcher(),
+                                 skip=lambda target: journal.is_done(target, 'ip_recon'))
+    with journal:
+        stats = runner.run(targets)
+
+    print(f"\n[+] Batch completado: {stats.format()}\n")
+    print_breaker_summary()
+    return stats
+
+
 def main():
     parser = argparse.ArgumentParser(description="Corrosive's Rage - OSINT Toolkit CLI")
-    parser.add_argument('-t', '--target', required=True, help='El objetivo a investigar (dominio, email, IP, etc.)')
-    parser.add_argument('-m', '--module', required=True, help='El módulo a usar (ej: domain_recon, ip_recon)')
+    parser.add_argument('-t', '--target', required=True, help='El objetivo a investigar (dominio, email, IP, etc.) o un fichero con un objetivo por línea')
+    parser.add_argument('-m', '--module', required=True, help="El módulo a usar (ej: domain_recon), varios separados por comas (domain_recon,ip_recon) o 'all'")
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument('--no-cache', action='store_true', help='No leer ni escribir la caché de respuestas')
+    cache_group.add_argument('--refresh', action='store_true', help='Ignorar la caché y volver a consultar (actualizándola)')
+    parser.add_argument('--trace-file', help='Guardar la traza de tiempos de cada petición HTTP en este JSON')
+    parser.add_argument('--metrics-file', help='Guardar métricas HTTP en formato textfile de Prometheus')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Hilos de trabajo en modo batch')
+    parser.add_argument('--max-in-flight', type=int, default=None, help='Máximo de trabajos encolados o en ejecución en modo batch (por defecto 2 x workers)')
+    parser.add_argument('--journal', help='Diario de trabajos del modo batch (por defecto results/journals/<fichero>.<módulos>.journal)')
+    parser.add_argument('--resume', action='store_true', help='Reanudar un batch: saltar los trabajos ya completados según el diario y repetir los fallidos')
+    parser.add_argument('--sink', choices=[SINK_FILE, SINK_NDJSON], default=None, help="Destino de resultados: 'file' (un JSON por ejecución, por defecto) o 'ndjson' (segmentos rotados); por defecto el de [results] en config.ini")
+    parser.add_argument('--compress', choices=[COMPRESSION_NONE, COMPRESSION_GZIP, COMPRESSION_ZSTD], default=None, help='Compresión de los segmentos NDJSON')
+    parser.add_argument('--segment-size', type=int, default=None, help='Tamaño máximo de cada segmento NDJSON en MB')
+    parser.add_argument('--format', choices=[FORMAT_JSON, FORMAT_MSGPACK], default=None, help="Formato de los ficheros de resultados con --sink file: 'json' (por defecto) o 'msgpack'")
+    parser.add_argument('--full', action='store_true', help='Guardar el resultado completo aunque haya uno anterior del mismo objetivo y módulo (sin diferencias)')
+    parser.add_argument('-q', '--quiet', action='store_true', help='No volcar el JSON de resultados por la salida estándar')
+    parser.add_argument('--pipeline', action='store_true', help='Usar el objetivo como semilla y encadenar automáticamente los módulos que consumen lo descubierto')
+    parser.add_argument('--max-depth', type=int, default=None, help='Saltos máximos desde la semilla en modo pipeline (por defecto 2)')
+    parser.add_argument('--max-runs', type=int, default=None, help='Pasos módulo×entidad máximos en modo pipeline (por defecto 100)')
 
     args = parser.parse_args()
     target = args.target
     module_name = args.module
+    cache_mode = MODE_OFF if args.no_cache else MODE_REFRESH if args.refresh else MODE_DEFAULT
 
     print(f"[*] Iniciando investigación de '{module_name}' para el objetivo: '{target}'...")
 
-    # 1️⃣ Verificar si el módulo existe en el diccionario
-    if module_name not in MODULES:
-        print(f"[!] Error: Módulo '{module_name}' no es válido o no está implementado.")
+    # 1️⃣ Verificar que los módulos existen en el diccionario
+    try:
+        module_names = parse_modules(module_name)
+    except ValueError as e:
+        print(f"[!] Error: Módulo '{e}' no es válido o no está implementado.")
         sys.exit(1)
 
+    from corrosive_rage.core.tracing import configure_tracing
+    from corrosive_rage.core.utils import configure_http
+
+    configure_tracing(keep_traces=bool(args.trace_file))
+
+    pipeline = None
+    if args.pipeline:
+        from corrosive_rage.core.pipeline import DEFAULT_MAX_DEPTH, DEFAULT_MAX_RUNS, Pipeline
+        pipeline = Pipeline(
+            max_depth=DEFAULT_MAX_DEPTH if args.max_depth is None else args.max_depth,
+            max_runs=args.max_runs or DEFAULT_MAX_RUNS,
+        )
+
+    sink = None
     try:
         # 2️⃣ Cargar configuración
         config = load_config()
-        
-        # 3️⃣ Instanciar el módulo correspondiente
-        module_class = MODULES[module_name]
-        module_instance = module_class(target=target, config=config)
-        
-        # 4️⃣ Ejecutar
-        module_instance.run()
-        
-        # 5️⃣ Recoger resultados
-        findings = module_instance.results
-
-        output_data = {
-            'target': target,
-            'module': module_name,
-            'timestamp': datetime.now().isoformat(),
-            'findings': findings
-        }
-
-        # 6️⃣ Guardar en archivo SIEMPRE en <PROJECT_ROOT>/results
-        results_dir = PROJECT_ROOT / "results"
-        results_dir.mkdir(exist_ok=True)
+        configure_http(config, cache_mode=cache_mode)
+        sink = build_sink(config, RESULTS_DIR, kind=args.sink, compression=args.compress,
+                          segment_size_mb=args.segment_size, fmt=args.format)
 
-        safe_target = "".join(c for c in target if c.isalnum() or c in ('.', '_')).rstrip()
-        filename = results_dir / f"{safe_target}_{module_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        # 3️⃣ Si el objetivo es un fichero, modo batch (un objetivo por línea)
+        if Path(target).is_file():
+            stats = run_batch(module_names, Path(target), config, args.workers, args.max_in_flight, pipeline,
+                              journal_path=Path(args.journal) if args.journal else None, resume=args.resume,
+                              sink=sink, max_chain=max_delta_chain(config, args.full))
+            if stats.failed:
+                sys.exit(1)
+            return
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, indent=4, ensure_ascii=False)
+        # 4️⃣ Ejecutar y guardar
+        output_data = run_target(module_names, target, config, pipeline)
+        filename = save_results(output_data, sink, max_delta_chain(config, args.full))
 
         print(f"\n[+] ¡Investigación completada con éxito!")
         print(f"[*] Los resultados se han guardado en: {filename}\n")
+        print_breaker_summary()
 
-        # 7️⃣ Imprimir JSON también para GUI (si usa stdout)
-        print(json.dumps(output_data, indent=4, ensure_ascii=False))
+        # 5️⃣ Imprimir JSON también para GUI (si usa stdout), salvo con --quiet
+        if not args.quiet:
+            print(dumps_str(output_data, pretty=True))
 
     except Exception as e:
         print(f"\n[!] Error crítico durante la ejecución del módulo '{module_name}': {type(e).__name__}: {e}")
         sys.exit(1)
+    finally:
+        if sink is not None:
+            sink.close()
+        export_http_traces(args.trace_file, args.metrics_file)
 
 
 if __name__ == "__main__":
@@ -4,8 +4,10 @@ import click
 from pathlib import Path
 
 # Importamos todos los comandos DIRECTAMENTE desde sus archivos
+from .commands.changes import changes
 from .commands.init import init
 from .commands.project import project       
+from .commands.query import query
 from .commands.report import report        
 from .commands.run import run              
 
@@ -27,4 +29,6 @@ def cli(ctx, config_path):
 cli.add_command(init)
 cli.add_command(project)      
 cli.add_command(report)
-cli.add_command(run)
\ No newline at end of file
+cli.add_command(run)
+cli.add_command(changes)
+cli.add_command(query)
\ No newline at end of file
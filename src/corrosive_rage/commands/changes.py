@@ -0,0 +1,56 @@
+# src/corrosive_rage/commands/changes.py
+
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import click
+
+from ..core.catalog import get_catalog
+from ..core.diffs import changes_since
+from ..core.registry import get_registry
+from ..core.serialization import dumps
+
+RESULTS_DIR = Path(__file__).resolve().parents[3] / "results"
+
+_RELATIVE = re.compile(r'^(?P<amount>\d+)(?P<unit>[mhdw])$')
+_UNIT_SECONDS = {'m': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def parse_since(value):
+    """'7d', '24h', '30m', '2w' (hace cuánto) o una fecha ISO 8601 → epoch."""
+    if value is None:
+        return None
+    match = _RELATIVE.match(value.strip().lower())
+    if match:
+        return time.time() - int(match['amount']) * _UNIT_SECONDS[match['unit']]
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise click.BadParameter(f"'{value}' is not a duration (7d, 24h...) or an ISO date")
+
+
+@click.command()
+@click.argument('target')
+@click.option('-m', '--module', 'module_name', help='Only changes from this module (e.g. domain_recon).')
+@click.option('--since', help='Only results saved since then: 7d, 24h, 30m or an ISO date.')
+@click.option('--type', 'finding_type', help='Only this finding type (e.g. subdomain_enumeration).')
+@click.option('--added', 'only_added', is_flag=True, help='Only added findings (skip removed ones).')
+def changes(target, module_name, since, finding_type, only_added):
+    """
+    Muestra qué ha cambiado en los resultados de TARGET: un JSON por línea
+    con cada hallazgo añadido o eliminado entre ejecuciones consecutivas.
+    """
+    if module_name is not None:
+        module_name = get_registry().resolve(module_name) or module_name
+
+    catalog = get_catalog(RESULTS_DIR)
+    out = sys.stdout.buffer
+    for change in changes_since(catalog, target, module=module_name, since=parse_since(since),
+                                finding_type=finding_type):
+        if only_added and change['change'] != 'added':
+            continue
+        out.write(dumps(change) + b'\n')
+    out.flush()
@@ -0,0 +1,81 @@
+# src/corrosive_rage/commands/query.py
+
+import sys
+from pathlib import Path
+
+import click
+
+from ..core.catalog import get_catalog, json_path, parse_predicate, select_field
+from ..core.registry import get_registry
+from ..core.serialization import dumps, dumps_str
+from .changes import parse_since
+
+RESULTS_DIR = Path(__file__).resolve().parents[3] / "results"
+
+FORMAT_NDJSON = 'ndjson'
+FORMAT_TABLE = 'table'
+
+_TABLE_ROW = "{:<28} {:<16} {:<24} {:<19} {}"
+
+
+def _table_value(value, width=80):
+    text = value if isinstance(value, str) else dumps_str(value)
+    return text if len(text) <= width else text[:width - 3] + '...'
+
+
+@click.command()
+@click.option('-t', '--target', help='Target to search (wildcards allowed: *.example.com).')
+@click.option('-m', '--module', 'module_name', help='Only findings from this module (name or alias).')
+@click.option('--type', 'finding_type', help='Only this finding type (e.g. shodan_host_info).')
+@click.option('--since', help='Only results saved since then: 7d, 24h, 30m or an ISO date.')
+@click.option('--until', help='Only results saved before then: 7d, 24h, 30m or an ISO date.')
+@click.option('-w', '--where', 'predicates', multiple=True,
+              help="Field predicate on the finding data, repeatable: 'vulns?', 'country=Spain', "
+                   "'ports~443', 'count>=100'.")
+@click.option('--select', 'select_path', help='Output only this field of the data; lists give one row per item.')
+@click.option('--latest', is_flag=True, help='Only the latest result of each target and module.')
+@click.option('--limit', type=int, help='Maximum number of findings.')
+@click.option('-f', '--format', 'output_format', type=click.Choice([FORMAT_NDJSON, FORMAT_TABLE]),
+              default=FORMAT_NDJSON, show_default=True)
+def query(target, module_name, finding_type, since, until, predicates, select_path, latest, limit, output_format):
+    """
+    Busca en los hallazgos guardados usando el índice del catálogo, sin abrir
+    los ficheros de resultados. Ejemplos:
+
+    \b
+      corrosive-rage query --type shodan_host_info -w 'vulns?' --latest -f table
+      corrosive-rage query -m domain --type subdomain_enumeration --since 30d --select subdomains
+    """
+    try:
+        where = [parse_predicate(expression) for expression in predicates]
+        if select_path is not None:
+            select_path = json_path(select_path)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
+    if module_name is not None:
+        module_name = get_registry().resolve(module_name) or module_name
+
+    records = get_catalog(RESULTS_DIR).query(
+        target=target, module=module_name, finding_type=finding_type,
+        since=parse_since(since), until=parse_since(until), where=where, latest=latest, limit=limit,
+    )
+
+    out = sys.stdout.buffer
+    if output_format == FORMAT_TABLE:
+        click.echo(_TABLE_ROW.format('TARGET', 'MODULE', 'TYPE', 'TIMESTAMP', 'DATA'))
+    for record in records:
+        values = [record.data]
+        if select_path is not None:
+            value = select_field(record.data, select_path)
+            if value is None:
+                continue
+            values = value if isinstance(value, list) else [value]
+        for value in values:
+            if output_format == FORMAT_TABLE:
+                click.echo(_TABLE_ROW.format(record.target[:28], record.module[:16], record.type[:24],
+                                             record.timestamp[:19], _table_value(value)))
+            else:
+                out.write(dumps({'target': record.target, 'module': record.module, 'type': record.type,
+                                 'timestamp': record.timestamp, 'data': value,
+                                 'location': record.location}) + b'\n')
+    out.flush()
@@ -3,28 +3,32 @@ import configparser
 import json
 from pathlib import Path
 
-# Mapa de módulos: tipo -> clase (en string)
-MODULE_MAP = {
-    "domain": "domain_recon.DomainReconModule",
-    "ip": "ip_recon.IpReconModule",
-    "email": "email_recon.EmailReconModule",
-    "username": "username_recon.UsernameReconModule",
-    "breach": "breach_recon.BreachReconModule",
-    "company": "company_recon.CompanyReconModule",
-    "metadata": "metadata_recon.MetadataReconModule",
-    "phone": "phone_recon.PhoneReconModule",
-    "dork": "dork_recon.DorkReconModule"
-}
+from ..core.registry import get_registry
+
+# La pila HTTP y los módulos se importan dentro del comando, para que
+# 'corrosive-rage --help' no cargue requests, shodan, whois, bs4...
 
 @click.command()
-@click.argument('module_type', type=click.Choice(list(MODULE_MAP.keys()), case_sensitive=False))
+@click.argument('module_type')
 @click.argument('target')
+@click.option('--no-cache', is_flag=True, help='Do not read or write the response cache.')
+@click.option('--refresh', is_flag=True, help='Ignore cached responses and store fresh ones.')
+@click.option('--trace-file', type=click.Path(dir_okay=False, path_type=Path),
+              help='Write a per-request HTTP timing trace (JSON) to this file.')
+@click.option('--metrics-file', type=click.Path(dir_okay=False, path_type=Path),
+              help='Write HTTP metrics in Prometheus textfile format to this file.')
 @click.pass_context
-def run(ctx, module_type, target):
+def run(ctx, module_type, target, no_cache, refresh, trace_file, metrics_file):
     """
     Ejecuta un módulo de reconocimiento sobre un objetivo.
+    MODULE_TYPE es el nombre del módulo (domain_recon) o su alias (domain).
     Permite usar un archivo de configuración personalizado.
     """
+    from ..core.cache import MODE_DEFAULT, MODE_OFF, MODE_REFRESH
+    from ..core.resilience import format_breaker_summary, get_breakers
+    from ..core.tracing import configure_tracing, get_collector, module_scope
+    from ..core.utils import configure_http
+
     click.echo(f"[*] Running {module_type} module against target: {target}")
 
     # 1️⃣ Cargar configuración
@@ -42,30 +46,47 @@ def run(ctx, module_type, target):
         click.echo(f"[!] No configuration file found. Using empty config.", err=True)
         config['APIs'] = {}
 
-    # 2️⃣ Resolución dinámica de módulo
-    try:
-        module_path = MODULE_MAP.get(module_type.lower())
-        if not module_path:
-            click.echo(f"[!] Error: Module type '{module_type}' not found.", err=True)
-            return
+    cache_mode = MODE_OFF if no_cache else MODE_REFRESH if refresh else MODE_DEFAULT
+    configure_http(config, cache_mode=cache_mode)
+    configure_tracing(keep_traces=trace_file is not None)
 
-        module_name, class_name = module_path.split(".")
-        click.echo(f"[*] Importing module: corrosive_rage.modules.{module_name}.{class_name}...")
+    # 2️⃣ Resolución dinámica de módulo (registro único, con alias y entry points)
+    registry = get_registry()
+    module_name = registry.resolve(module_type)
+    if module_name is None:
+        click.echo(f"[!] Error: Module type '{module_type}' not found. "
+                   f"Available: {', '.join(sorted(registry.names()))}", err=True)
+        return
 
-        module = __import__(f"corrosive_rage.modules.{module_name}", fromlist=[class_name])
-        module_class = getattr(module, class_name)
+    try:
+        click.echo(f"[*] Importing module: {registry.spec(module_name).path}...")
+        module_class = registry.load(module_name)
 
-    except ImportError as e:
+    except (ImportError, AttributeError) as e:
         click.echo(f"[!] Error: Could not import module '{module_type}'. Details: {e}", err=True)
         return
 
     # 3️⃣ Instanciar y ejecutar el módulo
     try:
         module_instance = module_class(target=target, config=config)
-        results = module_instance.run()
+        with module_scope(module_name):
+            module_instance.run()
+        results = module_instance.results.to_dict()
 
         # 4️⃣ Imprimir los resultados en formato JSON
         click.echo(json.dumps(results, indent=2))
 
+        breakers = get_breakers().summary()
+        if breakers:
+            click.echo("[!] Hosts with failures during this run (circuit breakers):", err=True)
+            click.echo(format_breaker_summary(breakers), err=True)
+
     except Exception as e:
-        click.echo(f"[!] An unexpected error occurred: {type(e).__name__}: {e}", err=True)
\ No newline at end of file
+        click.echo(f"[!] An unexpected error occurred: {type(e).__name__}: {e}", err=True)
+
+    if trace_file:
+        get_collector().export_json(trace_file)
+        click.echo(f"[*] HTTP trace written to {trace_file}", err=True)
+    if metrics_file:
+        get_collector().export_prometheus(metrics_file)
+        click.echo(f"[*] HTTP metrics written to {metrics_file}", err=True)
\ No newline at end of file
@@ -0,0 +1,73 @@
+# src/corrosive_rage/core/aio.py
+import asyncio
+import configparser
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Hilos dedicados a E/S bloqueante (peticiones HTTP, WHOIS, Shodan...)
+DEFAULT_IO_WORKERS = 64
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_workers = DEFAULT_IO_WORKERS
+_executor_lock = threading.Lock()
+
+
+def configure_async(config: configparser.ConfigParser):
+    """Ajusta el tamaño del pool de E/S desde la opción [HTTP] io_workers."""
+    global _executor, _executor_workers
+    with _executor_lock:
+        _executor_workers = config.getint('HTTP', 'io_workers', fallback=DEFAULT_IO_WORKERS)
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Devuelve el pool de hilos de E/S compartido, creándolo si hace falta."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_executor_workers,
+                                           thread_name_prefix='corrosive-io')
+        return _executor
+
+
+async def run_in_io_thread(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Ejecuta una función bloqueante en el pool de E/S sin bloquear el bucle
+    de eventos. Propaga el contexto (contextvars) del llamador al hilo.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    call = functools.partial(ctx.run, func, *args, **kwargs)
+    return await loop.run_in_executor(get_io_executor(), call)
+
+
+async def gather_limited(factories: Iterable[Callable[[], Awaitable[Any]]],
+                         limit: int) -> List[Any]:
+    """
+    Ejecuta las corrutinas creadas por 'factories' con como mucho 'limit'
+    en vuelo a la vez. Devuelve los resultados en el mismo orden; las
+    excepciones se devuelven en su posición en lugar de propagarse.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def _guarded(factory):
+        async with semaphore:
+            return await factory()
+
+    return await asyncio.gather(*(_guarded(f) for f in factories), return_exceptions=True)
+
+
+async def arun_modules(modules: Iterable[Any], limit: int) -> List[Any]:
+    """
+    Ejecuta varios módulos (BaseModule) en el mismo bucle de eventos, con
+    como mucho 'limit' trabajos módulo×objetivo en vuelo.
+    """
+    return await gather_limited([module.arun for module in modules], limit)
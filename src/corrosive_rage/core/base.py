@@ -1,24 +1,119 @@
 # src/corrosive_rage/core/base.py
 import logging
+import sys
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 import configparser
 
+from .aio import run_in_io_thread
+from .steps import Step, run_steps
+
+
+class Finding:
+    """
+    Un hallazgo de un módulo. Registro compacto (sin __dict__) con el nombre
+    del tipo internado: en un batch hay millones de hallazgos y solo unas
+    decenas de tipos distintos. Admite finding['type'] / finding['data']
+    como los diccionarios de antes.
+    """
+    __slots__ = ('type', 'data')
+
+    def __init__(self, finding_type: str, data: Any):
+        self.type = sys.intern(finding_type)
+        self.data = data
+
+    def __getitem__(self, key: str) -> Any:
+        if key == 'type':
+            return self.type
+        if key == 'data':
+            return self.data
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'type': self.type, 'data': self.data}
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, Finding):
+            return self.type == other.type and self.data == other.data
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Finding({self.type!r}, {self.data!r})"
+
+
+class ModuleResults(Mapping):
+    """
+    Resultados de un módulo: objetivo, nombre y la lista de hallazgos
+    (objetos Finding). Se lee como el diccionario de siempre
+    (results['findings'], results.get('target')...), pero el diccionario
+    completo solo se construye al pedir to_dict() y no se guarda. Los
+    hallazgos se añaden desde el hilo del módulo (run_steps() los añade
+    desde el hilo que llama).
+    """
+    __slots__ = ('target', 'module', 'findings')
+
+    _KEYS = ('target', 'module', 'findings')
+
+    def __init__(self, target: str, module: str):
+        self.target = target
+        self.module = module
+        self.findings: List[Finding] = []
+
+    def add(self, finding: Finding):
+        self.findings.append(finding)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+
+    def __len__(self) -> int:
+        return len(self._KEYS)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Vista como diccionario ({'target', 'module', 'findings': [{'type', 'data'}]}),
+        nueva en cada llamada: los 'data' son los mismos objetos, no copias.
+        """
+        return {
+            'target': self.target,
+            'module': self.module,
+            'findings': [finding.to_dict() if isinstance(finding, Finding) else finding
+                         for finding in self.findings],
+        }
+
+    def __repr__(self) -> str:
+        return f"ModuleResults({self.target!r}, {self.module!r}, {len(self.findings)} findings)"
+
+
 class BaseModule(ABC):
     """
     Clase base abstracta para todos los módulos de reconocimiento.
     Garantiza una interfaz común y proporciona utilidades compartidas.
+
+    Para el pipeline (core.pipeline), cada módulo declara qué tipos de
+    entidad acepta como objetivo ('consumes') y cuáles puede descubrir
+    ('produces'), y extract_entities() devuelve las entidades encontradas.
     """
+    consumes: Tuple[str, ...] = ()
+    produces: Tuple[str, ...] = ()
+
     def __init__(self, target: str, config: configparser.ConfigParser):
         self.target = target
         self.config = config
         # Creamos un logger específico para cada módulo (ej: 'DomainReconModule')
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.results = {
-            'target': target,
-            'module': self.__class__.__name__.lower().replace('module', ''),
-            'findings': []
-        }
+        self.results = ModuleResults(target, self.__class__.__name__.lower().replace('module', ''))
         self.logger.info(f"Module initialized for target: {self.target}")
 
     @abstractmethod
@@ -29,12 +124,34 @@ class BaseModule(ABC):
         """
         pass
 
+    async def arun(self) -> Dict[str, Any]:
+        """
+        Versión asíncrona de run(). Por defecto adapta los módulos síncronos
+        ejecutando run() en el pool de hilos de E/S, sin bloquear el bucle de
+        eventos. Los módulos nativamente asíncronos pueden sobrescribirlo.
+        """
+        return await run_in_io_thread(self.run)
+
+    def extract_entities(self) -> Iterable[Tuple[str, str]]:
+        """
+        Entidades (tipo, valor) descubiertas en los hallazgos, para alimentar
+        a otros módulos en el pipeline. Por defecto no produce ninguna.
+        """
+        return ()
+
     def add_finding(self, finding_type: str, data: Dict[str, Any]):
         """
         Añade un resultado a la lista de hallazgos de forma estandarizada.
         """
-        self.results['findings'].append({'type': finding_type, 'data': data})
-        self.logger.info(f"Finding added: {finding_type}")
+        self.results.add(Finding(finding_type, data))
+        self.logger.debug(f"Finding added: {finding_type}")
+
+    def run_steps(self, steps: Iterable[Step]) -> Dict[str, str]:
+        """
+        Ejecuta a la vez consultas independientes del módulo (core.steps),
+        cada una con su plazo, y añade sus hallazgos según terminan.
+        """
+        return run_steps(self, steps)
 
     def get_api_key(self, service_name: str) -> Optional[str]:
         """
@@ -0,0 +1,197 @@
+# src/corrosive_rage/core/batch.py
+import hashlib
+import logging
+import sys
+import threading
+import time
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+DEFAULT_PROGRESS_INTERVAL = 5.0
+
+
+def iter_targets(path: Path) -> Iterator[str]:
+    """
+    Lee un fichero de objetivos línea a línea, sin cargarlo entero en memoria.
+    Ignora líneas vacías y comentarios ('#').
+    """
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            target = line.strip()
+            if target and not target.startswith('#'):
+                yield target
+
+
+class SeenSet:
+    """
+    Conjunto compacto de cadenas ya vistas, para deduplicar millones de
+    objetivos con memoria acotada: guarda solo una huella de 64 bits por
+    elemento en una tabla hash abierta sobre un array (8 bytes por hueco),
+    frente a los ~100 bytes por elemento de un set de str.
+    La probabilidad de colisión con 10^7 elementos es del orden de 10^-6.
+    """
+    _MAX_LOAD = 0.7
+
+    def __init__(self, capacity: int = 1 << 16):
+        size = 1
+        while size < capacity:
+            size <<= 1
+        self._table = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        self._count = 0
+
+    @staticmethod
+    def _fingerprint(value: str) -> int:
+        digest = hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest()
+        # El 0 marca huecos vacíos, así que nunca puede ser una huella
+        return int.from_bytes(digest, 'little') or 1
+
+    def add(self, value: str) -> bool:
+        """Añade el valor. Devuelve True si no se había visto antes."""
+        fingerprint = self._fingerprint(value)
+        table, mask = self._table, self._mask
+        i = fingerprint & mask
+        while True:
+            slot = table[i]
+            if slot == 0:
+                table[i] = fingerprint
+                self._count += 1
+                if self._count > self._MAX_LOAD * (mask + 1):
+                    self._grow()
+                return True
+            if slot == fingerprint:
+                return False
+            i = (i + 1) & mask
+
+    def __contains__(self, value: str) -> bool:
+        fingerprint = self._fingerprint(value)
+        table, mask = self._table, self._mask
+        i = fingerprint & mask
+        while True:
+            slot = table[i]
+            if slot == 0:
+                return False
+            if slot == fingerprint:
+                return True
+            i = (i + 1) & mask
+
+    def _grow(self):
+        old = self._table
+        size = (self._mask + 1) * 2
+        self._table = array('Q', bytes(8 * size))
+        self._mask = size - 1
+        table, mask = self._table, self._mask
+        for fingerprint in old:
+            if fingerprint:
+                i = fingerprint & mask
+                while table[i]:
+                    i = (i + 1) & mask
+                table[i] = fingerprint
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class BatchStats:
+    """Contadores de una ejecución batch (actualizados desde varios hilos)."""
+    def __init__(self):
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.duplicates = 0
+        self.resumed = 0
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def completed(self) -> int:
+        return self.succeeded + self.failed
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def throughput(self) -> float:
+        elapsed = self.elapsed
+        return self.completed / elapsed if elapsed > 0 else 0.0
+
+    def record(self, ok: bool):
+        with self._lock:
+            if ok:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+
+    def format(self) -> str:
+        resumed = f", {self.resumed} ya hechos" if self.resumed else ""
+        return (f"{self.completed}/{self.submitted} trabajos completados "
+                f"({self.succeeded} ok, {self.failed} con error, {self.duplicates} duplicados{resumed}) "
+                f"en {self.elapsed:.1f}s - {self.throughput():.2f} trabajos/s")
+
+
+class BatchRunner:
+    """
+    Ejecuta 'job(target)' para cada objetivo de un iterable en un pool de
+    'workers' hilos. Como mucho 'max_in_flight' trabajos están encolados o en
+    ejecución a la vez, así que la memoria no depende del tamaño de la entrada.
+    Los objetivos repetidos se descartan, igual que aquellos para los que
+    'skip(target)' devuelve True (p. ej. ya completados en una ejecución
+    anterior). 'on_submit(target)' se llama al encolar cada trabajo.
+    """
+    def __init__(self, job: Callable[[str], Any], workers: int = DEFAULT_WORKERS,
+                 max_in_flight: Optional[int] = None,
+                 progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+                 progress_stream: TextIO = sys.stderr,
+                 skip: Optional[Callable[[str], bool]] = None,
+                 on_submit: Optional[Callable[[str], None]] = None):
+        self.job = job
+        self.skip = skip
+        self.on_submit = on_submit
+        self.workers = max(1, workers)
+        self.max_in_flight = max(self.workers, max_in_flight or self.workers * 2)
+        self.progress_interval = progress_interval
+        self.progress_stream = progress_stream
+        self.stats = BatchStats()
+        self._slots = threading.BoundedSemaphore(self.max_in_flight)
+        self._last_report = time.monotonic()
+        self._report_lock = threading.Lock()
+
+    def _on_done(self, future: Future):
+        self._slots.release()
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Batch job failed: {type(error).__name__}: {error}")
+        self.stats.record(error is None and future.result() is not False)
+        self._maybe_report()
+
+    def _maybe_report(self):
+        now = time.monotonic()
+        with self._report_lock:
+            if now - self._last_report < self.progress_interval:
+                return
+            self._last_report = now
+        print(f"[*] Progreso: {self.stats.format()}", file=self.progress_stream, flush=True)
+
+    def run(self, targets: Iterable[str]) -> BatchStats:
+        """Procesa todos los objetivos y devuelve las estadísticas finales."""
+        seen = SeenSet()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='corrosive-batch') as executor:
+            for target in targets:
+                if not seen.add(target):
+                    self.stats.duplicates += 1
+                    continue
+                if self.skip is not None and self.skip(target):
+                    self.stats.resumed += 1
+                    continue
+                self._slots.acquire()
+                self.stats.submitted += 1
+                if self.on_submit is not None:
+                    self.on_submit(target)
+                future = executor.submit(self.job, target)
+                future.add_done_callback(self._on_done)
+        return self.stats
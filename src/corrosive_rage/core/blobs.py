@@ -0,0 +1,285 @@
+# src/corrosive_rage/core/blobs.py
+import functools
+import hashlib
+import logging
+import sqlite3
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+from .serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+BLOBS_FILENAME = 'blobs.sqlite3'
+DEFAULT_MIN_BLOB_BYTES = 256
+
+# Clave de las referencias {'$blob': digest} y marca en el documento
+REF_KEY = '$blob'
+DOCUMENT_KEY = 'blobs'
+
+# Un JSON serializado nunca contiene \x00 sin escapar, así que sirve de
+# marcador inequívoco para el objetivo dentro de un blob
+_TARGET_MARK = '\x00t\x00'
+_QUOTED_MARK = '\x00q\x00'
+_MIN_TEMPLATE_TARGET = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Máximo de parámetros por consulta (SQLITE_MAX_VARIABLE_NUMBER antiguo)
+_CHUNK = 500
+
+
+@functools.lru_cache(maxsize=1024)
+def _escaped(text: str) -> str:
+    """El texto tal y como aparece dentro de una cadena JSON."""
+    return dumps(text).decode('utf-8')[1:-1]
+
+
+@functools.lru_cache(maxsize=1024)
+def _quoted(target: str) -> str:
+    return quote(target)
+
+
+def _template(text: str, target: Optional[str]) -> str:
+    """
+    Sustituye el objetivo (y su versión URL-encoded) por marcadores, para
+    que datos que solo difieren en él (enlaces de búsqueda, mensajes...)
+    tengan el mismo hash en todos los objetivos.
+    """
+    if not target or len(target) < _MIN_TEMPLATE_TARGET:
+        return text
+    quoted = _quoted(target)
+    if quoted != target:
+        text = text.replace(_escaped(quoted), _QUOTED_MARK)
+    return text.replace(_escaped(target), _TARGET_MARK)
+
+
+def _untemplate(text: str, target: str) -> str:
+    return text.replace(_TARGET_MARK, _escaped(target)).replace(_QUOTED_MARK, _escaped(_quoted(target)))
+
+
+def is_finding(node: Dict[str, Any]) -> bool:
+    return 'type' in node and 'data' in node
+
+
+def is_unit(node: Dict[str, Any]) -> bool:
+    # Unidades de core.diffs
+    return 'type' in node and 'field' in node and 'value' in node
+
+
+class BlobStore:
+    """
+    Almacén direccionado por contenido de los datos de los hallazgos
+    (results/blobs.sqlite3). Al guardar un documento, cada dato de al menos
+    'min_bytes' (el 'data' de un hallazgo, cada filtración de HIBP, un host
+    de Shodan...) se guarda una sola vez, comprimido y bajo su hash, y el
+    documento conserva solo la referencia {'$blob': digest}. unpack() la
+    deshace. Es seguro usarlo desde varios hilos.
+    """
+    def __init__(self, path: Path, min_bytes: int = DEFAULT_MIN_BLOB_BYTES, cache_size: int = 4096):
+        self.path = Path(path)
+        self.min_bytes = max(1, min_bytes)
+        self._lock = threading.Lock()
+        self._cache: Dict[str, str] = {}
+        self._cache_size = cache_size
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+
+    # --- Escritura ---
+
+    def pack(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Copia del documento con los datos grandes de sus hallazgos (o de las
+        unidades de una diferencia) sustituidos por referencias.
+        """
+        pending: Dict[str, bytes] = {}
+        packed = self._pack_node(document, document.get('target'), pending)
+        if not pending:
+            return document
+        self._put_many(pending)
+        packed[DOCUMENT_KEY] = BLOBS_FILENAME
+        return packed
+
+    def _pack_node(self, node: Any, target: Optional[str], pending: Dict[str, bytes]) -> Any:
+        if isinstance(node, list):
+            return [self._pack_node(item, target, pending) for item in node]
+        if not isinstance(node, dict):
+            return node
+        # Los runs del pipeline tienen su propio objetivo
+        target = node['target'] if isinstance(node.get('target'), str) else target
+        if is_unit(node):
+            return dict(node, value=self._intern(node['value'], target, pending))
+        if is_finding(node):
+            return dict(node, data=self._intern(node['data'], target, pending))
+        return {key: self._pack_node(value, target, pending) for key, value in node.items()}
+
+    def _intern(self, value: Any, target: Optional[str], pending: Dict[str, bytes]) -> Any:
+        return self._intern_node(value, target, pending, True)[0]
+
+    def _intern_node(self, value: Any, target: Optional[str], pending: Dict[str, bytes],
+                     standalone: bool) -> Tuple[Any, bool]:
+        """
+        (valor o referencia, si contiene alguna referencia). Se guarda como
+        blob el subárbol más grande que no contenga otros: primero se
+        procesan los elementos de las listas (cada filtración, cada host),
+        y un contenedor en el que alguno ya es referencia se queda en línea,
+        porque ya es pequeño y es lo que cambia entre objetivos. Las cadenas
+        sueltas solo se separan si son un elemento de lista o el dato entero
+        ('standalone'), no los campos de un registro.
+        """
+        if isinstance(value, dict):
+            has_ref, interned = False, {}
+            for key, item in value.items():
+                # Los campos escalares de un registro nunca se separan
+                if isinstance(item, (dict, list)):
+                    item, child_ref = self._intern_node(item, target, pending, False)
+                    has_ref = has_ref or child_ref
+                interned[key] = item
+            if has_ref:
+                return interned, True
+            value = interned
+        elif isinstance(value, list):
+            has_ref, interned = False, []
+            for item in value:
+                if isinstance(item, (dict, list)) or (isinstance(item, str) and len(item) >= self.min_bytes - 2):
+                    item, child_ref = self._intern_node(item, target, pending, True)
+                    has_ref = has_ref or child_ref
+                interned.append(item)
+            if has_ref:
+                return interned, True
+            value = interned
+        elif not isinstance(value, str) or not standalone:
+            return value, False
+
+        text = dumps(value, sort_keys=True).decode('utf-8')
+        if len(text) < self.min_bytes:
+            return value, False
+        templated = _template(text, target)
+        data = templated.encode('utf-8')
+        digest = hashlib.blake2b(data, digest_size=20).hexdigest()
+        pending[digest] = data
+        if templated != text:
+            return {REF_KEY: digest, 'target': target}, True
+        return {REF_KEY: digest}, True
+
+    def _put_many(self, blobs: Dict[str, bytes]):
+        digests = list(blobs)
+        with self._lock:
+            known = set()
+            for start in range(0, len(digests), _CHUNK):
+                chunk = digests[start:start + _CHUNK]
+                known.update(row[0] for row in self._conn.execute(
+                    f"SELECT digest FROM blobs WHERE digest IN ({','.join('?' * len(chunk))})", chunk))
+            missing = [(d, zlib.compress(blobs[d])) for d in digests if d not in known]
+            if missing:
+                self._conn.execute('BEGIN')
+                try:
+                    self._conn.executemany('INSERT OR IGNORE INTO blobs (digest, data) VALUES (?, ?)', missing)
+                    self._conn.execute('COMMIT')
+                except Exception:
+                    self._conn.execute('ROLLBACK')
+                    raise
+        logger.debug(f"Stored {len(missing)} new blobs ({len(known)} already present)")
+
+    # --- Lectura ---
+
+    def unpack(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        """Inversa de pack(): resuelve todas las referencias del documento."""
+        document = {k: v for k, v in document.items() if k != DOCUMENT_KEY}
+        # Se leen por niveles (una consulta por nivel de anidamiento)
+        texts: Dict[str, str] = {}
+        refs: List[str] = []
+        self._collect(document, refs)
+        while refs:
+            # Un digest con marcadores (objetivo dentro del hex) se resuelve
+            # después, ya sustituido, en _resolve()
+            fetched = self._get_many(d for d in refs if d not in texts and '\x00' not in d)
+            texts.update(fetched)
+            refs = []
+            for text in fetched.values():
+                # Los marcadores solo aparecen dentro de cadenas: escapados, es JSON válido
+                self._collect(loads(text.replace('\x00', '\\u0000')), refs)
+        return self._resolve(document, texts)
+
+    def _collect(self, node: Any, refs: List[str]):
+        if isinstance(node, list):
+            for item in node:
+                self._collect(item, refs)
+        elif isinstance(node, dict):
+            if REF_KEY in node:
+                refs.append(node[REF_KEY])
+            else:
+                for value in node.values():
+                    self._collect(value, refs)
+
+    def _resolve(self, node: Any, texts: Dict[str, str]) -> Any:
+        if isinstance(node, list):
+            return [self._resolve(item, texts) for item in node]
+        if not isinstance(node, dict):
+            return node
+        if REF_KEY not in node:
+            return {key: self._resolve(value, texts) for key, value in node.items()}
+        digest = node[REF_KEY]
+        text = texts.get(digest)
+        if text is None:
+            text = self._get_many([digest])[digest]
+        if 'target' in node:
+            text = _untemplate(text, node['target'])
+        # Un blob puede contener referencias a otros (hijos deduplicados)
+        return self._resolve(loads(text), texts)
+
+    def _get_many(self, digests: Iterable[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        wanted = []
+        with self._lock:
+            for digest in set(digests):
+                if digest in self._cache:
+                    found[digest] = self._cache[digest]
+                else:
+                    wanted.append(digest)
+            for start in range(0, len(wanted), _CHUNK):
+                chunk = wanted[start:start + _CHUNK]
+                for digest, data in self._conn.execute(
+                        f"SELECT digest, data FROM blobs WHERE digest IN ({','.join('?' * len(chunk))})", chunk):
+                    found[digest] = zlib.decompress(data).decode('utf-8')
+            if len(self._cache) > self._cache_size:
+                self._cache.clear()
+            for digest in wanted:
+                if digest in found:
+                    self._cache[digest] = found[digest]
+        missing = [digest for digest in wanted if digest not in found]
+        if missing:
+            raise KeyError(f"Missing blobs in {self.path}: {', '.join(missing[:3])}")
+        return found
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_stores: Dict[Path, BlobStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_blob_store(results_dir: Path, min_bytes: Optional[int] = None) -> BlobStore:
+    """Devuelve el almacén de blobs de una carpeta de resultados (results/blobs.sqlite3)."""
+    results_dir = Path(results_dir).resolve()
+    with _stores_lock:
+        store = _stores.get(results_dir)
+        if store is None:
+            store = BlobStore(results_dir / BLOBS_FILENAME, min_bytes=min_bytes or DEFAULT_MIN_BLOB_BYTES)
+            _stores[results_dir] = store
+        elif min_bytes is not None:
+            store.min_bytes = max(1, min_bytes)
+        return store
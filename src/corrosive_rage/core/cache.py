@@ -0,0 +1,213 @@
+# src/corrosive_rage/core/cache.py
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional
+
+import configparser
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path.home() / '.cache' / 'corrosive_rage' / 'responses.sqlite3'
+DEFAULT_TTL = 3600
+DEFAULT_NEGATIVE_TTL = 600
+DEFAULT_MAX_SIZE_MB = 512
+
+# Modos de uso de la caché (--no-cache / --refresh)
+MODE_DEFAULT = 'default'   # leer y escribir
+MODE_REFRESH = 'refresh'   # ignorar lo guardado, pero volver a escribir
+MODE_OFF = 'off'           # ni leer ni escribir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    expires REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries(last_access);
+"""
+
+
+class CacheEntry(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+
+class ResponseCache:
+    """
+    Caché persistente en SQLite para respuestas HTTP y resultados de APIs
+    (Shodan, WHOIS). Cada entrada pertenece a una 'fuente' (host o nombre de
+    proveedor) con su propio TTL. Al superar el tamaño máximo se desalojan
+    las entradas usadas hace más tiempo (LRU).
+    """
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH,
+                 default_ttl: int = DEFAULT_TTL,
+                 negative_ttl: int = DEFAULT_NEGATIVE_TTL,
+                 ttls: Optional[Dict[str, int]] = None,
+                 max_size_bytes: int = DEFAULT_MAX_SIZE_MB * 1024 * 1024,
+                 mode: str = MODE_DEFAULT):
+        self.path = Path(path)
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.ttls = dict(ttls or {})
+        self.max_size_bytes = max_size_bytes
+        self.mode = mode
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.executescript(_SCHEMA)
+        self._total_size = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    @classmethod
+    def from_config(cls, config: configparser.ConfigParser, mode: str = MODE_DEFAULT) -> 'ResponseCache':
+        """Construye la caché desde las secciones [cache] y [cache.ttl] de config.ini."""
+        ttls = {}
+        if config.has_section('cache.ttl'):
+            for source, ttl in config.items('cache.ttl'):
+                try:
+                    ttls[source.lower()] = int(ttl)
+                except ValueError:
+                    logger.warning(f"Invalid cache TTL for source {source}: {ttl}")
+
+        path = config.get('cache', 'path', fallback='') or DEFAULT_CACHE_PATH
+        return cls(
+            path=Path(path).expanduser(),
+            default_ttl=config.getint('cache', 'default_ttl', fallback=DEFAULT_TTL),
+            negative_ttl=config.getint('cache', 'negative_ttl', fallback=DEFAULT_NEGATIVE_TTL),
+            ttls=ttls,
+            max_size_bytes=config.getint('cache', 'max_size_mb', fallback=DEFAULT_MAX_SIZE_MB) * 1024 * 1024,
+            mode=mode,
+        )
+
+    def ttl_for(self, source: str, status: int = 200) -> int:
+        """TTL de una fuente; las respuestas 404 usan el TTL negativo."""
+        if status == 404:
+            return self.negative_ttl
+        return self.ttls.get(source.lower(), self.default_ttl)
+
+    def get(self, source: str, key: str) -> Optional[CacheEntry]:
+        """Devuelve la entrada si existe y no ha caducado (None en modo refresh/off)."""
+        if self.mode != MODE_DEFAULT:
+            return None
+        now = time.time()
+        full_key = f'{source}|{key}'
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT status, headers, body, expires FROM entries WHERE key = ?', (full_key,)
+            ).fetchone()
+            if row is None:
+                return None
+            status, headers, body, expires = row
+            if expires < now:
+                return None
+            self._conn.execute('UPDATE entries SET last_access = ? WHERE key = ?', (now, full_key))
+        logger.debug(f"Cache hit for {source}: {key}")
+        return CacheEntry(status, json.loads(headers), bytes(body))
+
+    def set(self, source: str, key: str, status: int, headers: Dict[str, str], body: bytes,
+            ttl: Optional[int] = None):
+        """Guarda (o reemplaza) una entrada y aplica el límite de tamaño."""
+        if self.mode == MODE_OFF:
+            return
+        if ttl is None:
+            ttl = self.ttl_for(source, status)
+        if ttl <= 0:
+            return
+        size = len(body)
+        if size > self.max_size_bytes:
+            logger.debug(f"Not caching {source}: {key} ({size} bytes exceeds cache size).")
+            return
+        now = time.time()
+        full_key = f'{source}|{key}'
+        with self._lock:
+            old = self._conn.execute('SELECT size FROM entries WHERE key = ?', (full_key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries '
+                '(key, source, status, headers, body, size, created, expires, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (full_key, source, status, json.dumps(dict(headers)), sqlite3.Binary(body), size,
+                 now, now + ttl, now)
+            )
+            self._total_size += size - (old[0] if old else 0)
+            if self._total_size > self.max_size_bytes:
+                self._evict()
+
+    def get_value(self, source: str, key: str) -> Optional[Any]:
+        """Atajo para valores JSON (resultados de Shodan, WHOIS...)."""
+        entry = self.get(source, key)
+        if entry is None:
+            return None
+        return json.loads(entry.body)
+
+    def set_value(self, source: str, key: str, value: Any, ttl: Optional[int] = None):
+        """Guarda un valor serializable a JSON bajo la fuente indicada."""
+        body = json.dumps(value, default=str, ensure_ascii=False).encode('utf-8')
+        self.set(source, key, 200, {}, body, ttl=ttl)
+
+    def _evict(self):
+        """Elimina entradas (caducadas primero, luego LRU) hasta volver bajo el límite."""
+        now = time.time()
+        freed = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries WHERE expires < ?',
+                                   (now,)).fetchone()[0]
+        self._conn.execute('DELETE FROM entries WHERE expires < ?', (now,))
+        self._total_size -= freed
+
+        target = int(self.max_size_bytes * 0.9)
+        while self._total_size > target:
+            rows = self._conn.execute(
+                'SELECT key, size FROM entries ORDER BY last_access LIMIT 100'
+            ).fetchall()
+            if not rows:
+                self._total_size = 0
+                break
+            for key, size in rows:
+                self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+                self._total_size -= size
+                if self._total_size <= target:
+                    break
+        logger.debug(f"Cache evicted down to {self._total_size} bytes.")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[ResponseCache] = None
+
+
+def configure_cache(config: configparser.ConfigParser, mode: str = MODE_DEFAULT) -> Optional[ResponseCache]:
+    """
+    Inicializa la caché global. Si está desactivada en config.ini ([cache]
+    enabled = false) o el modo es 'off', no se crea ninguna.
+    """
+    global _cache
+    if _cache is not None:
+        _cache.close()
+        _cache = None
+    if mode == MODE_OFF or not config.getboolean('cache', 'enabled', fallback=True):
+        logger.info("Response cache disabled.")
+        return None
+    try:
+        _cache = ResponseCache.from_config(config, mode=mode)
+    except (sqlite3.Error, OSError) as e:
+        logger.error(f"Could not open response cache: {e}")
+        _cache = None
+    return _cache
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """Devuelve la caché global o None si no está activa."""
+    return _cache
@@ -0,0 +1,759 @@
+# src/corrosive_rage/core/catalog.py
+import hashlib
+import logging
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .diffs import is_delta, rehydrate
+from .serialization import dumps, load_result, loads, read_result, relative_location, resolve_location
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILENAME = 'catalog.sqlite3'
+RESULT_SUFFIXES = ('.json', '.msgpack')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    target TEXT NOT NULL,
+    target_key TEXT NOT NULL,
+    module TEXT NOT NULL,
+    modules TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    location TEXT NOT NULL UNIQUE,
+    finding_count INTEGER NOT NULL,
+    previous TEXT,
+    baseline TEXT,
+    chain INTEGER NOT NULL DEFAULT 0,
+    added INTEGER NOT NULL DEFAULT 0,
+    removed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_results_target ON results(target_key, module, saved_at);
+CREATE INDEX IF NOT EXISTS idx_results_module ON results(module, saved_at);
+CREATE INDEX IF NOT EXISTS idx_results_saved_at ON results(saved_at);
+CREATE TABLE IF NOT EXISTS finding_types (
+    result_id INTEGER NOT NULL REFERENCES results(id) ON DELETE CASCADE,
+    module TEXT NOT NULL,
+    type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (result_id, module, type)
+);
+CREATE INDEX IF NOT EXISTS idx_finding_types_type ON finding_types(type, module);
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY,
+    result_id INTEGER NOT NULL REFERENCES results(id) ON DELETE CASCADE,
+    target TEXT NOT NULL,
+    target_key TEXT NOT NULL,
+    module TEXT NOT NULL,
+    type TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    data_id INTEGER NOT NULL,
+    latest INTEGER NOT NULL DEFAULT 1
+);
+CREATE INDEX IF NOT EXISTS idx_findings_result ON findings(result_id);
+CREATE INDEX IF NOT EXISTS idx_findings_type ON findings(type, saved_at);
+CREATE INDEX IF NOT EXISTS idx_findings_module ON findings(module, saved_at);
+CREATE INDEX IF NOT EXISTS idx_findings_target ON findings(target_key, saved_at);
+CREATE INDEX IF NOT EXISTS idx_findings_saved_at ON findings(saved_at);
+CREATE INDEX IF NOT EXISTS idx_findings_latest ON findings(type, saved_at) WHERE latest = 1;
+CREATE INDEX IF NOT EXISTS idx_findings_data ON findings(data_id);
+CREATE TABLE IF NOT EXISTS finding_data (
+    id INTEGER PRIMARY KEY,
+    digest TEXT NOT NULL UNIQUE,
+    data TEXT NOT NULL,
+    partial INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS finding_fields (
+    path TEXT NOT NULL,
+    item INTEGER NOT NULL,
+    value NOT NULL,
+    data_id INTEGER NOT NULL,
+    PRIMARY KEY (path, item, value, data_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS fingerprints (
+    target_key TEXT NOT NULL,
+    module TEXT NOT NULL,
+    result_id INTEGER NOT NULL REFERENCES results(id) ON DELETE CASCADE,
+    units BLOB NOT NULL,
+    PRIMARY KEY (target_key, module)
+) WITHOUT ROWID;
+"""
+
+
+# Columnas añadidas después de la primera versión del catálogo
+_MIGRATIONS = {
+    ('results', 'previous'): 'ALTER TABLE results ADD COLUMN previous TEXT',
+    ('results', 'baseline'): 'ALTER TABLE results ADD COLUMN baseline TEXT',
+    ('results', 'chain'): 'ALTER TABLE results ADD COLUMN chain INTEGER NOT NULL DEFAULT 0',
+    ('results', 'added'): 'ALTER TABLE results ADD COLUMN added INTEGER NOT NULL DEFAULT 0',
+    ('results', 'removed'): 'ALTER TABLE results ADD COLUMN removed INTEGER NOT NULL DEFAULT 0',
+    ('finding_data', 'partial'): 'ALTER TABLE finding_data ADD COLUMN partial INTEGER NOT NULL DEFAULT 0',
+}
+
+# Los digests de las huellas apenas comprimen: el nivel más rápido ocupa casi lo mismo
+_FINGERPRINT_COMPRESSION = 1
+
+_RECORD_COLUMNS = ('id, target, module, modules, timestamp, saved_at, location, finding_count, '
+                   'previous, baseline, chain, added, removed')
+
+
+class ResultRecord(NamedTuple):
+    id: int
+    target: str
+    module: str
+    modules: List[str]
+    timestamp: str
+    saved_at: float
+    location: str
+    finding_count: int
+    # Resultado anterior del mismo objetivo y módulo
+    previous: Optional[str] = None
+    # Si lo guardado es una diferencia (core.diffs): su base y cuántos
+    # saltos de diferencias hay hasta el último documento completo
+    baseline: Optional[str] = None
+    chain: int = 0
+    added: int = 0
+    removed: int = 0
+
+
+class FindingRecord(NamedTuple):
+    target: str
+    module: str
+    type: str
+    timestamp: str
+    saved_at: float
+    location: str
+    data: Any
+
+
+class FieldPredicate(NamedTuple):
+    """Condición sobre un campo del 'data' de un hallazgo (ver parse_predicate())."""
+    path: str
+    op: str
+    value: Any = None
+
+
+# Filas de finding_fields: un valor escalar, un elemento de una lista de
+# escalares, o un valor que no se indexa (listas largas o de objetos, textos
+# largos) y que las consultas evalúan sobre el JSON
+ITEM_SCALAR = 0
+ITEM_ELEMENT = 1
+ITEM_OPAQUE = 2
+MAX_INDEXED_ITEMS = 256
+MAX_INDEXED_TEXT = 256
+
+_PREDICATE = re.compile(r'^\s*(?P<path>[^\s=!<>~?]+)\s*(?:(?P<exists>\?)|(?P<op>!=|>=|<=|=|>|<|~)\s*(?P<value>.*?))\s*$')
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_INDEX = re.compile(r'^(?P<key>[^\[]*)(?P<index>(?:\[\d+\])*)$')
+
+
+def _literal(text: str) -> Any:
+    """'443' → 443, 'true' → True, 'null' → None, '"x"' → 'x'; si no, el texto tal cual."""
+    try:
+        return loads(text)
+    except ValueError:
+        return text
+
+
+def json_path(path: str) -> str:
+    """'location.country' → '$.location.country'; admite índices (ports[0]) y '$'."""
+    if path == '$' or path.startswith('$.') or path.startswith('$['):
+        return path
+    parts = []
+    for segment in path.split('.'):
+        match = _INDEX.match(segment)
+        if not match or not match['key']:
+            raise ValueError(f"Invalid field path: {path}")
+        key = match['key']
+        parts.append((key if _IDENTIFIER.match(key) else '"' + key.replace('"', '') + '"') + match['index'])
+    return '$.' + '.'.join(parts)
+
+
+def select_field(data: Any, path: str) -> Any:
+    """Valor de 'path' (misma sintaxis que en --select) dentro de data, o None."""
+    if path == '$':
+        return data
+    for segment in path[2:].split('.') if path.startswith('$.') else path.split('.'):
+        match = _INDEX.match(segment)
+        key, indexes = (match['key'], match['index']) if match else (segment, '')
+        if key:
+            data = data.get(key.strip('"')) if isinstance(data, dict) else None
+        for index in re.findall(r'\d+', indexes):
+            data = data[int(index)] if isinstance(data, list) and int(index) < len(data) else None
+    return data
+
+
+def field_rows(data: Any) -> Iterator[Tuple[str, int, Any]]:
+    """
+    Filas (ruta, clase, valor) del índice de campos de un 'data': cada
+    escalar con su ruta con puntos (location.country) y cada elemento de
+    una lista corta de escalares (ports). Los null, textos vacíos y listas
+    vacías no generan filas: cuentan como campo ausente.
+    """
+    def walk(value, path):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                yield from walk(item, f"{path}.{key}" if path else str(key))
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            value = list(value)
+            if not value or not path:
+                return
+            if len(value) <= MAX_INDEXED_ITEMS and not any(isinstance(item, (dict, list)) for item in value):
+                for item in value:
+                    if item is not None and item != '':
+                        yield path, ITEM_ELEMENT, int(item) if isinstance(item, bool) else item
+            else:
+                yield path, ITEM_OPAQUE, ''
+        elif value is None or value == '' or not path:
+            return
+        elif isinstance(value, str) and len(value) > MAX_INDEXED_TEXT:
+            yield path, ITEM_OPAQUE, ''
+        elif isinstance(value, (bool, int, float, str)):
+            yield path, ITEM_SCALAR, int(value) if isinstance(value, bool) else value
+        else:
+            yield path, ITEM_SCALAR, str(value)
+    return walk(data, '')
+
+
+def parse_predicate(expression: str) -> FieldPredicate:
+    """
+    Condiciones sobre el 'data' de los hallazgos:
+
+        vulns?              existe y no está vacío
+        country=Spain       igual (los números, true/false y null se interpretan)
+        org!=Google         distinto (o ausente)
+        ports~443           contiene: elemento de una lista o subcadena de un texto
+        count>=100          comparación numérica (también >, <, <=)
+
+    Los campos anidados se separan con puntos (location.country).
+    """
+    match = _PREDICATE.match(expression)
+    if not match or '[' in match['path'] or match['path'].startswith('$'):
+        raise ValueError(f"Invalid predicate: {expression!r}")
+    json_path(match['path'])
+    if match['exists']:
+        return FieldPredicate(match['path'], '?')
+    op, value = match['op'], match['value']
+    value = value if op == '~' else _literal(value)
+    if isinstance(value, (dict, list)) or (value is None and op not in ('=', '!=')):
+        raise ValueError(f"Invalid value in predicate: {expression!r}")
+    return FieldPredicate(match['path'], op, int(value) if isinstance(value, bool) else value)
+
+
+def _opaque(value: Any, path: str) -> bool:
+    # Misma regla que field_rows(): lo que el índice no desglosa
+    if isinstance(value, (list, tuple, set, frozenset)):
+        value = list(value)
+        return bool(value) and (not path or len(value) > MAX_INDEXED_ITEMS
+                                or any(isinstance(item, (dict, list)) for item in value))
+    return isinstance(value, str) and len(value) > MAX_INDEXED_TEXT
+
+
+def index_view(data: Any) -> Tuple[Any, bool]:
+    """
+    Lo que el catálogo guarda de un 'data': los valores que el índice de
+    campos no desglosa (listas largas o de objetos, textos largos) se
+    quitan, porque cambian en cada re-escaneo y guardarlos haría crecer el
+    catálogo con cada copia completa. Devuelve (data reducido, si se quitó
+    algo); el valor completo se lee del fichero de resultados cuando hace falta.
+    """
+    def reduce(value, path):
+        if isinstance(value, dict):
+            kept, partial = {}, False
+            for key, item in value.items():
+                item_path = f"{path}.{key}" if path else str(key)
+                if _opaque(item, item_path):
+                    partial = True
+                    continue
+                kept[key], item_partial = reduce(item, item_path)
+                partial = partial or item_partial
+            return kept, partial
+        return value, False
+    if _opaque(data, ''):
+        return None, True
+    return reduce(data, '')
+
+
+def match_predicate(data: Any, predicate: FieldPredicate) -> bool:
+    """Evalúa un predicado sobre un 'data' completo (misma semántica que en el índice)."""
+    path, op, value = predicate
+    found = select_field(data, json_path(path))
+    present = found is not None and found != '' and found != [] and found != {}
+    if op == '?':
+        return present
+    if value is None:
+        return present if op == '!=' else not present
+    if op == '~':
+        if isinstance(found, list):
+            return any(item == value or item == _literal(value) or str(item) == value for item in found)
+        return isinstance(found, str) and value in found
+    if op == '=':
+        return present and found == value
+    if op == '!=':
+        return not (present and found == value)
+    if isinstance(value, (int, float)):
+        if isinstance(found, bool) or not isinstance(found, (int, float)):
+            return False
+    elif not isinstance(found, str):
+        return False
+    return {'>': found > value, '>=': found >= value, '<': found < value, '<=': found <= value}[op]
+
+
+def _predicate_sql(predicate: FieldPredicate) -> Tuple[str, List[Any]]:
+    """
+    SQL (sobre f.data_id) de un predicado, resuelto con el índice de campos.
+    Los valores no indexados (ITEM_OPAQUE) no están en el catálogo: esos
+    hallazgos pasan como candidatos y query() comprueba el predicado sobre
+    el valor completo.
+    """
+    path, op, value = predicate
+    if op == '?':
+        return ('f.data_id IN (SELECT data_id FROM finding_fields WHERE path = ? '
+                'UNION ALL SELECT data_id FROM finding_fields WHERE path > ? AND path < ?)',
+                [path, path + '.', path + '/'])
+    if value is None:
+        # =null: ausente; !=null: presente
+        return (f"f.data_id {'NOT IN' if op == '=' else 'IN'} (SELECT data_id FROM finding_fields WHERE path = ?)",
+                [path])
+
+    if op == '~':
+        indexed = '((item = ? AND value IN (?, ?)) OR (item = ? AND instr(value, ?) > 0))'
+        indexed_params = [ITEM_ELEMENT, value, _literal(value), ITEM_SCALAR, value]
+    else:
+        compare = '=' if op in ('=', '!=') else op
+        numeric = " AND typeof(value) IN ('integer', 'real')" if isinstance(value, (int, float)) else ''
+        indexed = f'(item = ? AND value {compare} ?{numeric})'
+        indexed_params = [ITEM_SCALAR, value]
+
+    if op == '!=':
+        return (f'f.data_id NOT IN (SELECT data_id FROM finding_fields WHERE path = ? AND {indexed})',
+                [path, *indexed_params])
+    return (f'f.data_id IN (SELECT data_id FROM finding_fields WHERE path = ? AND {indexed} '
+            f'UNION ALL SELECT data_id FROM finding_fields WHERE path = ? AND item = ?)',
+            [path, *indexed_params, path, ITEM_OPAQUE])
+
+
+def iter_document_records(document: Dict[str, Any]) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Recorre los hallazgos de cualquier documento de resultados (un módulo,
+    varios combinados o un pipeline) como (objetivo, módulo, hallazgo). En
+    un pipeline el objetivo es la entidad de cada paso, no la semilla.
+    """
+    target = str(document.get('target', ''))
+    if isinstance(document.get('results'), dict):
+        for module, results in document['results'].items():
+            for finding in (results.get('findings') or []) if isinstance(results, dict) else []:
+                yield target, module, finding
+    elif isinstance(document.get('runs'), list):
+        for run in document['runs']:
+            results = run.get('findings') or {}
+            for finding in results.get('findings') or []:
+                yield str(run.get('value') or run.get('target', target)), run['module'], finding
+    else:
+        results = document.get('findings') or {}
+        findings = results.get('findings') if isinstance(results, dict) else results
+        for finding in findings or []:
+            yield target, document.get('module', ''), finding
+
+
+def document_modules(document: Dict[str, Any]) -> List[str]:
+    return list(document.get('modules') or [document.get('module', '')])
+
+
+def target_key(target: str) -> str:
+    return target.strip().lower()
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _finding_rows(document: Dict[str, Any]) -> Tuple[List[Tuple[str, ...]], Dict[str, Tuple[str, Any]]]:
+    """
+    Filas del índice de hallazgos de un documento: (objetivo, clave, módulo,
+    tipo, digest) y {digest: (data en JSON, data)}. Los datos idénticos (el
+    mismo hallazgo en cada re-escaneo) se guardan una sola vez.
+    """
+    rows, data_by_digest = [], {}
+    for finding_target, module, finding in iter_document_records(document):
+        data = dumps(finding.get('data'), sort_keys=True)
+        digest = _digest(data)
+        data_by_digest[digest] = (data.decode('utf-8'), finding.get('data'))
+        rows.append((finding_target, target_key(finding_target), module, finding.get('type', ''), digest))
+    return rows, data_by_digest
+
+
+class ResultsCatalog:
+    """
+    Índice SQLite de todos los resultados guardados: objetivo, módulo, fecha,
+    ubicación y número de hallazgos por tipo. Se actualiza al guardar cada
+    resultado, así que buscar "el último resultado de X" es una consulta
+    indexada en lugar de listar y hacer stat() de toda la carpeta results.
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        # Las ubicaciones se guardan relativas a esta carpeta (la de results)
+        self.directory = self.path.parent.resolve()
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.created = not self.path.exists()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('PRAGMA foreign_keys=ON')
+        # Catálogos de antes del índice de hallazgos: hay que rellenarlo (backfill_findings())
+        had_findings = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'findings'").fetchone() is not None
+        self._conn.executescript(_SCHEMA)
+        self.needs_backfill = not self.created and not had_findings
+        columns = {(table, row[1]) for table in ('results', 'finding_data')
+                   for row in self._conn.execute(f'PRAGMA table_info({table})')}
+        for column, statement in _MIGRATIONS.items():
+            if column not in columns:
+                self._conn.execute(statement)
+
+    def add(self, document: Dict[str, Any], location: str, saved_at: Optional[float] = None,
+            previous: Optional[str] = None, baseline: Optional[str] = None, chain: int = 0,
+            added: int = 0, removed: int = 0, fingerprints: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Indexa un documento (completo) guardado en 'location'. Si lo que se
+        guardó es una diferencia, 'baseline' y 'chain' lo indican.
+        'fingerprints' (core.diffs.Fingerprints.to_dict()) es la huella de sus
+        hallazgos: se guarda si es el último resultado de su objetivo y
+        módulo, para comparar con él la siguiente ejecución sin leerlo.
+        Devuelve su id.
+        """
+        finding_rows, finding_data = _finding_rows(document)
+        counts: Dict[Tuple[str, str], int] = {}
+        for _, _, module, ftype, _ in finding_rows:
+            counts[(module, ftype)] = counts.get((module, ftype), 0) + 1
+
+        target = str(document.get('target', ''))
+        saved_at = saved_at if saved_at is not None else time.time()
+        with self._lock:
+            self._conn.execute('BEGIN')
+            try:
+                self._conn.execute('DELETE FROM results WHERE location = ?', (self._stored(location),))
+                cursor = self._conn.execute(
+                    'INSERT INTO results (target, target_key, module, modules, timestamp, saved_at, location, '
+                    'finding_count, previous, baseline, chain, added, removed) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (target, target_key(target), document.get('module', ''),
+                     ','.join(document_modules(document)), document.get('timestamp', ''),
+                     saved_at, self._stored(location), sum(counts.values()),
+                     self._stored(previous), self._stored(baseline), chain, added, removed),
+                )
+                result_id = cursor.lastrowid
+                self._conn.executemany(
+                    'INSERT INTO finding_types (result_id, module, type, count) VALUES (?, ?, ?, ?)',
+                    [(result_id, module, ftype, count) for (module, ftype), count in counts.items()],
+                )
+                self._insert_findings(result_id, saved_at, finding_rows, finding_data)
+                if fingerprints is not None:
+                    self._store_fingerprints(result_id, target_key(target), document.get('module', ''),
+                                             saved_at, fingerprints)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return result_id
+
+    def _store_fingerprints(self, result_id: int, key: str, module: str, saved_at: float,
+                            fingerprints: Dict[str, Any]):
+        newer = self._conn.execute(
+            'SELECT 1 FROM results WHERE target_key = ? AND module = ? AND id != ? '
+            'AND (saved_at > ? OR (saved_at = ? AND id > ?)) LIMIT 1',
+            (key, module, result_id, saved_at, saved_at, result_id)).fetchone()
+        if newer is None:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO fingerprints (target_key, module, result_id, units) VALUES (?, ?, ?, ?)',
+                (key, module, result_id, zlib.compress(dumps(fingerprints), _FINGERPRINT_COMPRESSION)))
+
+    def fingerprints(self, target: str, module: str) -> Optional[Tuple[int, Dict[str, Any]]]:
+        """(id del resultado, huella) del último resultado guardado con huella de un objetivo y módulo."""
+        with self._lock:
+            row = self._conn.execute('SELECT result_id, units FROM fingerprints WHERE target_key = ? AND module = ?',
+                                     (target_key(target), module)).fetchone()
+        return (row[0], loads(zlib.decompress(row[1]))) if row else None
+
+    def _insert_findings(self, result_id: int, saved_at: float, finding_rows: List[Tuple[str, ...]],
+                         finding_data: Dict[str, Tuple[str, Any]]):
+        # 'latest' marca los hallazgos del último resultado de cada objetivo y
+        # módulo (por fecha de guardado: reindex() puede añadir otros más
+        # antiguos). Cuenta el objetivo y el módulo de cada hallazgo, no los del
+        # documento: un resultado combinado o un pipeline cubren varios
+        key, modules = self._conn.execute('SELECT target_key, modules FROM results WHERE id = ?',
+                                          (result_id,)).fetchone()
+        pairs = {(row[1], row[2]) for row in finding_rows}
+        pairs.update((key, module) for module in modules.split(',') if module)
+        latest: Dict[Tuple[str, str], bool] = {}
+        for pair_key, module in pairs:
+            newer = self._conn.execute(
+                'SELECT 1 FROM findings WHERE target_key = ? AND module = ? AND result_id != ? '
+                'AND (saved_at > ? OR (saved_at = ? AND result_id > ?)) '
+                'UNION ALL SELECT 1 FROM results WHERE target_key = ? AND id != ? '
+                "AND instr(',' || modules || ',', ',' || ? || ',') > 0 "
+                'AND (saved_at > ? OR (saved_at = ? AND id > ?)) LIMIT 1',
+                (pair_key, module, result_id, saved_at, saved_at, result_id,
+                 pair_key, result_id, module, saved_at, saved_at, result_id)).fetchone()
+            latest[(pair_key, module)] = newer is None
+            if newer is None:
+                self._conn.execute(
+                    'UPDATE findings SET latest = 0 WHERE latest = 1 AND target_key = ? AND module = ? '
+                    'AND result_id != ?', (pair_key, module, result_id))
+        # Solo los datos nuevos: los de un hallazgo repetido ya están indexados
+        digests = list(finding_data)
+        data_ids: Dict[str, int] = {}
+        for start in range(0, len(digests), 500):
+            chunk = digests[start:start + 500]
+            data_ids.update((digest, data_id) for data_id, digest in self._conn.execute(
+                f"SELECT id, digest FROM finding_data WHERE digest IN ({','.join('?' * len(chunk))})", chunk))
+        for digest in digests:
+            if digest in data_ids:
+                continue
+            text, data = finding_data[digest]
+            stored, partial = index_view(data)
+            if partial:
+                text = dumps(stored, sort_keys=True).decode('utf-8')
+            data_id = self._conn.execute('INSERT INTO finding_data (digest, data, partial) VALUES (?, ?, ?)',
+                                         (digest, text, int(partial))).lastrowid
+            data_ids[digest] = data_id
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO finding_fields (path, item, value, data_id) VALUES (?, ?, ?, ?)',
+                [(*row, data_id) for row in field_rows(data)])
+        self._conn.executemany(
+            'INSERT INTO findings (result_id, target, target_key, module, type, saved_at, data_id, latest) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [(result_id, *row[:4], saved_at, data_ids[row[4]], int(latest[(row[1], row[2])]))
+             for row in finding_rows],
+        )
+
+    def backfill_findings(self) -> int:
+        """
+        Rellena el índice de hallazgos con los resultados catalogados antes de
+        que existiera (leyendo cada uno una vez). Devuelve cuántos ha indexado.
+        """
+        with self._lock:
+            pending = self._conn.execute(
+                'SELECT id, location, saved_at FROM results '
+                'WHERE id NOT IN (SELECT DISTINCT result_id FROM findings) AND finding_count > 0').fetchall()
+        indexed = 0
+        for result_id, location, saved_at in pending:
+            location = self._resolved(location)
+            try:
+                finding_rows, finding_data = _finding_rows(load_result(location))
+            except Exception as e:
+                logger.warning(f"Could not index findings of {location}: {e}")
+                continue
+            with self._lock:
+                self._conn.execute('BEGIN')
+                try:
+                    self._insert_findings(result_id, saved_at, finding_rows, finding_data)
+                    self._conn.execute('COMMIT')
+                except Exception:
+                    self._conn.execute('ROLLBACK')
+                    raise
+            indexed += 1
+        self.needs_backfill = False
+        return indexed
+
+    def find(self, target: Optional[str] = None, module: Optional[str] = None,
+             finding_type: Optional[str] = None, since: Optional[float] = None,
+             limit: Optional[int] = 100, oldest_first: bool = False) -> List[ResultRecord]:
+        """Resultados que cumplen los filtros, del más reciente al más antiguo."""
+        clauses, params = [], []
+        if target is not None:
+            clauses.append('target_key = ?')
+            params.append(target_key(target))
+        if module is not None:
+            clauses.append('module = ?')
+            params.append(module)
+        if finding_type is not None:
+            clauses.append('id IN (SELECT result_id FROM finding_types WHERE type = ?)')
+            params.append(finding_type)
+        if since is not None:
+            clauses.append('saved_at >= ?')
+            params.append(since)
+        order = 'ASC' if oldest_first else 'DESC'
+        sql = (f'SELECT {_RECORD_COLUMNS} FROM results'
+               + (' WHERE ' + ' AND '.join(clauses) if clauses else '')
+               + f' ORDER BY saved_at {order}, id {order}')
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [ResultRecord(r[0], r[1], r[2], r[3].split(',') if r[3] else [], r[4], r[5], self._resolved(r[6]),
+                             r[7], self._resolved(r[8]), self._resolved(r[9]), *r[10:]) for r in rows]
+
+    def latest(self, target: Optional[str] = None, module: Optional[str] = None,
+               since: Optional[float] = None) -> Optional[ResultRecord]:
+        """El resultado más reciente (opcionalmente de un objetivo y módulo, guardado desde 'since')."""
+        records = self.find(target=target, module=module, since=since, limit=1)
+        return records[0] if records else None
+
+    def query(self, target: Optional[str] = None, module: Optional[str] = None,
+              finding_type: Optional[str] = None, since: Optional[float] = None,
+              until: Optional[float] = None, where: Iterable[FieldPredicate] = (),
+              latest: bool = False, limit: Optional[int] = None) -> Iterator[FindingRecord]:
+        """
+        Hallazgos guardados que cumplen los filtros, del más reciente al más
+        antiguo, desde el índice; solo se abre el fichero de resultados de los
+        hallazgos con valores no indexados (listas largas, textos largos). 'target' admite
+        comodines (*.example.com); con 'latest' solo cuenta el último
+        resultado de cada objetivo y módulo.
+        """
+        clauses, params = [], []
+        if target is not None:
+            clauses.append('f.target_key GLOB ?' if any(c in target for c in '*?[') else 'f.target_key = ?')
+            params.append(target_key(target))
+        if module is not None:
+            clauses.append('f.module = ?')
+            params.append(module)
+        if finding_type is not None:
+            clauses.append('f.type = ?')
+            params.append(finding_type)
+        if since is not None:
+            clauses.append('f.saved_at >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('f.saved_at < ?')
+            params.append(until)
+        if latest:
+            clauses.append('f.latest = 1')
+        for predicate in where:
+            sql, predicate_params = _predicate_sql(predicate)
+            clauses.append(sql)
+            params.extend(predicate_params)
+        sql = ('SELECT f.target, f.module, f.type, r.timestamp, f.saved_at, r.location, d.data, '
+               'd.partial, d.digest '
+               'FROM findings f JOIN finding_data d ON d.id = f.data_id JOIN results r ON r.id = f.result_id'
+               + (' WHERE ' + ' AND '.join(clauses) if clauses else '')
+               + ' ORDER BY f.saved_at DESC, f.id DESC')
+        where = list(where)
+        # Con predicados, los valores no indexados se comprueban aquí y el
+        # límite se aplica después
+        if limit is not None and not where:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+        documents: Dict[str, Dict[str, Any]] = {}
+        yielded = 0
+        while True:
+            with self._lock:
+                rows = cursor.fetchmany(1000)
+            if not rows:
+                return
+            for row in rows:
+                location = self._resolved(row[5])
+                data = loads(row[6])
+                if row[7]:
+                    data = self._full_data(documents, *row[:3], location, row[8])
+                    if data is None:
+                        continue
+                if any(_opaque(select_field(data, json_path(predicate.path)), predicate.path)
+                       and not match_predicate(data, predicate) for predicate in where):
+                    continue
+                yield FindingRecord(*row[:5], location, data)
+                yielded += 1
+                if limit is not None and yielded >= limit:
+                    return
+
+    @staticmethod
+    def _full_data(documents: Dict[str, Dict[str, Any]], target: str, module: str, finding_type: str,
+                   location: str, digest: str) -> Any:
+        """'data' completo de un hallazgo guardado de forma parcial, leído de su resultado."""
+        document = documents.get(location)
+        if document is None:
+            try:
+                document = load_result(location)
+            except Exception as e:
+                logger.warning(f"Could not read {location}: {e}")
+                return None
+            if len(documents) >= 16:
+                documents.clear()
+            documents[location] = document
+        for finding_target, finding_module, finding in iter_document_records(document):
+            if (finding_target == target and finding_module == module and finding.get('type') == finding_type
+                    and _digest(dumps(finding.get('data'), sort_keys=True)) == digest):
+                return finding.get('data')
+        logger.warning(f"Finding {finding_type} of {target} not found in {location}")
+        return None
+
+    def finding_types(self, result_id: int) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT type, SUM(count) FROM finding_types WHERE result_id = ? GROUP BY type', (result_id,)
+            ).fetchall()
+        return dict(rows)
+
+    def reindex(self, results_dir: Path) -> int:
+        """
+        Indexa los ficheros de resultados de una carpeta que aún no estén en
+        el catálogo (p. ej. los guardados antes de que existiera). Devuelve
+        cuántos se han añadido.
+        """
+        with self._lock:
+            known = {self._resolved(row[0]) for row in self._conn.execute('SELECT location FROM results')}
+        added = 0
+        for path in Path(results_dir).iterdir():
+            if path.suffix not in RESULT_SUFFIXES or str(path) in known or not path.is_file():
+                continue
+            try:
+                document = read_result(path)
+                extra = {}
+                if is_delta(document):
+                    # La longitud real de la cadena no se conoce sin recorrerla
+                    baseline = resolve_location(document['baseline'], path.parent)
+                    extra = {'previous': baseline, 'baseline': baseline, 'chain': 1,
+                             'added': len(document['changes']['added']),
+                             'removed': len(document['changes']['removed'])}
+                    document = rehydrate(document, path.parent)
+                self.add(document, str(path), saved_at=path.stat().st_mtime, **extra)
+                added += 1
+            except Exception as e:
+                logger.warning(f"Could not index {path}: {e}")
+        return added
+
+    def _stored(self, location: Optional[str]) -> Optional[str]:
+        return relative_location(location, self.directory) if location else location
+
+    def _resolved(self, location: Optional[str]) -> Optional[str]:
+        return resolve_location(location, self.directory) if location else location
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_catalogs: Dict[Path, ResultsCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def get_catalog(results_dir: Path) -> ResultsCatalog:
+    """
+    Devuelve el catálogo de una carpeta de resultados (results/catalog.sqlite3).
+    La primera vez que se crea indexa los resultados que ya hubiera.
+    """
+    results_dir = Path(results_dir).resolve()
+    with _catalogs_lock:
+        catalog = _catalogs.get(results_dir)
+        if catalog is None:
+            catalog = ResultsCatalog(results_dir / CATALOG_FILENAME)
+            if catalog.created:
+                added = catalog.reindex(results_dir)
+                if added:
+                    logger.info(f"Indexed {added} existing results in {catalog.path}")
+            elif catalog.needs_backfill:
+                indexed = catalog.backfill_findings()
+                logger.info(f"Indexed the findings of {indexed} results in {catalog.path}")
+            _catalogs[results_dir] = catalog
+        return catalog
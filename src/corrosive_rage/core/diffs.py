@@ -0,0 +1,535 @@
+# src/corrosive_rage/core/diffs.py
+import hashlib
+import logging
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+from .serialization import dumps, load_result, read_result, relative_location, resolve_location
+
+logger = logging.getLogger(__name__)
+
+# Campo 'field' de cada unidad de hallazgo:
+WHOLE = '*'       # el hallazgo entero (tipos repetidos o datos que no son dict/lista)
+SCALARS = ''      # los campos no-lista de 'data' (registrar, count...)
+ITEMS = '[]'      # un elemento cuando 'data' es directamente una lista
+# cualquier otro valor: nombre de un campo lista de 'data' (subdomains, breaches...)
+
+# Una diferencia solo compensa si cambia menos de esta fracción de unidades
+MAX_DELTA_RATIO = 0.5
+# Diferencias encadenadas antes de volver a guardar un documento completo
+DEFAULT_MAX_DELTA_CHAIN = 10
+# Campos sueltos que se derivan de las listas (cuántos subdominios,
+# cuántos vivos...): cambian con ellas y no son un cambio por sí mismos
+DERIVED_FIELDS = frozenset({'count', 'live', 'breach_count'})
+# Ejecuciones fallidas seguidas que se saltan al buscar la base de una diferencia
+_MAX_ERROR_RUNS = 10
+# Las unidades que ocupan (serializadas) hasta este tamaño guardan su valor
+# en la huella, para escribir las bajas de una diferencia sin abrir la base
+_INLINE_UNIT_BYTES = 512
+
+
+_DIGEST_SIZE = 12
+_DIGEST_CHARS = 2 * _DIGEST_SIZE
+
+
+def _digest(encoded: bytes) -> str:
+    return hashlib.blake2b(encoded, digest_size=_DIGEST_SIZE).hexdigest()
+
+
+def unit_digest(unit: Dict[str, Any]) -> str:
+    if 'index' in unit:
+        unit = {k: v for k, v in unit.items() if k != 'index'}
+    return _digest(dumps(unit, sort_keys=True))
+
+
+def _group(unit: Dict[str, Any]) -> Tuple[str, str]:
+    return unit['type'], unit['field']
+
+
+class Fingerprints(NamedTuple):
+    """
+    Huella compacta de una lista de unidades, por columnas: el grupo (tipo,
+    campo) y el digest de cada unidad, su valor si es pequeño y las claves de
+    las de campos sueltos. Es lo necesario para comparar con la siguiente
+    ejecución sin leer el resultado.
+    """
+    groups: List[Tuple[str, str]]
+    group_ids: List[int]
+    digests: List[str]
+    # Valor de cada unidad; None en las posiciones de 'large', que no lo guardan
+    values: List[Any]
+    large: List[int]
+    # Posición -> claves de la unidad de campos sueltos ('scalars' y, si hace falta, 'keys')
+    scalars: Dict[int, Dict[str, Any]]
+
+    def unit(self, position: int) -> Dict[str, Any]:
+        ftype, field = self.groups[self.group_ids[position]]
+        unit = {'type': ftype, 'field': field, 'value': self.values[position]}
+        if 'keys' in self.scalars.get(position, ()):
+            unit['keys'] = self.scalars[position]['keys']
+        return unit
+
+    def skeleton(self, position: int) -> Dict[str, Any]:
+        """
+        La unidad con el digest en lugar del valor: rebuild() la coloca igual
+        que colocaría la original.
+        """
+        ftype, field = self.groups[self.group_ids[position]]
+        digest = self.digests[position]
+        if field != SCALARS:
+            return {'type': ftype, 'field': field, 'value': digest}
+        keys = self.scalars[position]
+        unit = {'type': ftype, 'field': field, 'value': dict.fromkeys(keys['scalars'], digest)}
+        if 'keys' in keys:
+            unit['keys'] = keys['keys']
+        return unit
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'groups': self.groups, 'group_ids': self.group_ids, 'digests': ''.join(self.digests),
+                'values': self.values, 'large': self.large,
+                'scalars': {str(position): keys for position, keys in self.scalars.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Fingerprints':
+        joined = data['digests']
+        return cls([tuple(group) for group in data['groups']], data['group_ids'],
+                   [joined[i:i + _DIGEST_CHARS] for i in range(0, len(joined), _DIGEST_CHARS)],
+                   data['values'], data['large'],
+                   {int(position): keys for position, keys in data['scalars'].items()})
+
+
+def fingerprints(units: Iterable[Dict[str, Any]]) -> Fingerprints:
+    groups: Dict[Tuple[str, str], int] = {}
+    group_ids, digests, values, large = [], [], [], []
+    scalars: Dict[int, Dict[str, Any]] = {}
+    for position, unit in enumerate(units):
+        group_ids.append(groups.setdefault(_group(unit), len(groups)))
+        encoded = dumps(unit, sort_keys=True)
+        digests.append(_digest(encoded))
+        if len(encoded) <= _INLINE_UNIT_BYTES:
+            values.append(unit['value'])
+        else:
+            values.append(None)
+            large.append(position)
+        if unit['field'] == SCALARS:
+            scalars[position] = {'scalars': list(unit['value'])}
+            if 'keys' in unit:
+                scalars[position]['keys'] = unit['keys']
+    return Fingerprints(list(groups), group_ids, digests, values, large, scalars)
+
+
+def explode(findings: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Descompone los hallazgos en unidades pequeñas y comparables: cada
+    elemento de una lista de 'data' (un subdominio, una filtración, un
+    perfil...) es una unidad, y el resto de campos de 'data' otra. Así una
+    ejecución que añade un subdominio cambia una unidad, no el hallazgo
+    entero. Devuelve las unidades en orden, con las repetidas tantas veces
+    como aparecen; la unidad de campos sueltos lleva en 'keys' el orden de
+    los campos de 'data' si rebuild() no lo reproduciría.
+    """
+    findings = list(findings)
+    type_counts: Dict[str, int] = {}
+    for finding in findings:
+        type_counts[finding.get('type')] = type_counts.get(finding.get('type'), 0) + 1
+
+    units: List[Dict[str, Any]] = []
+    for finding in findings:
+        ftype, data = finding.get('type'), finding.get('data')
+        if type_counts[ftype] > 1 or not isinstance(data, (dict, list)):
+            units.append({'type': ftype, 'field': WHOLE, 'value': data})
+        elif isinstance(data, list):
+            if not data:
+                units.append({'type': ftype, 'field': WHOLE, 'value': data})
+            units.extend({'type': ftype, 'field': ITEMS, 'value': item} for item in data)
+        else:
+            scalars = {k: v for k, v in data.items() if not isinstance(v, list) or not v}
+            lists = [k for k, v in data.items() if isinstance(v, list) and v]
+            unit = {'type': ftype, 'field': SCALARS, 'value': scalars}
+            if list(data) != list(scalars) + lists:
+                unit['keys'] = list(data)
+            units.append(unit)
+            for key in lists:
+                units.extend({'type': ftype, 'field': key, 'value': item} for item in data[key])
+    return units
+
+
+def _apply(findings: List[Dict[str, Any]], units: Iterable[Dict[str, Any]], keys: Dict[str, List[str]]):
+    """
+    Añade unidades a una lista de hallazgos. Las que llevan 'index' (las
+    añadidas de una diferencia) se insertan en esa posición de su lista.
+    """
+    by_type = {finding['type']: finding for finding in findings}
+    for unit in units:
+        ftype, field, value = unit['type'], unit['field'], unit['value']
+        index = unit.get('index')
+        if field == WHOLE:
+            finding = {'type': ftype, 'data': value}
+            if index is None:
+                findings.append(finding)
+                continue
+            positions = [i for i, f in enumerate(findings) if f['type'] == ftype]
+            findings.insert(positions[index] if index < len(positions) else
+                            (positions[-1] + 1 if positions else len(findings)), finding)
+            continue
+        finding = by_type.get(ftype)
+        if finding is None:
+            finding = {'type': ftype, 'data': [] if field == ITEMS else {}}
+            by_type[ftype] = finding
+            findings.append(finding)
+        data = finding['data']
+        if field == SCALARS:
+            data.update(value)
+            if 'keys' in unit:
+                keys[ftype] = unit['keys']
+            continue
+        target = data if field == ITEMS else data.setdefault(field, [])
+        if index is None:
+            target.append(value)
+        else:
+            target.insert(index, value)
+
+
+def rebuild(units: Iterable[Dict[str, Any]], added: Iterable[Dict[str, Any]] = ()) -> List[Dict[str, Any]]:
+    """
+    Inversa de explode(): vuelve a agrupar las unidades en hallazgos y,
+    después, inserta las 'added' de una diferencia en su posición.
+    """
+    findings: List[Dict[str, Any]] = []
+    keys: Dict[str, List[str]] = {}
+    _apply(findings, units, keys)
+    _apply(findings, added, keys)
+    for finding in findings:
+        order = keys.get(finding['type'])
+        if order and isinstance(finding['data'], dict):
+            data = finding['data']
+            finding['data'] = {**{k: data[k] for k in order if k in data}, **data}
+    return findings
+
+
+def _without(units: List[Dict[str, Any]], removed: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Las unidades menos las eliminadas (cada eliminada quita una aparición, la primera)."""
+    pending = Counter(unit_digest(unit) for unit in removed)
+    kept = []
+    for unit in units:
+        digest = unit_digest(unit)
+        if pending[digest]:
+            pending[digest] -= 1
+        else:
+            kept.append(unit)
+    return kept
+
+
+def document_findings(document: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Lista de hallazgos de un documento de un solo módulo."""
+    results = document.get('findings') or {}
+    return list(results.get('findings') or []) if isinstance(results, dict) else list(results)
+
+
+def is_single_module(document: Dict[str, Any]) -> bool:
+    return 'modules' not in document and isinstance(document.get('findings'), dict)
+
+
+def has_error(document: Dict[str, Any]) -> bool:
+    """Si el documento es de una ejecución fallida ({'findings': {'error': ...}})."""
+    findings = document.get('findings')
+    return 'error' in document or (isinstance(findings, dict) and 'error' in findings)
+
+
+def is_delta(document: Any) -> bool:
+    return isinstance(document, dict) and 'baseline' in document and 'changes' in document
+
+
+class UnitDiff(NamedTuple):
+    # Unidades nuevas que no estaban, cada una con su posición ('index') en su
+    # lista, y sus posiciones en la lista de unidades nuevas
+    added: List[Dict[str, Any]]
+    added_at: List[int]
+    # Posiciones en la base de las unidades eliminadas y de las que se conservan
+    removed: List[int]
+    kept: List[int]
+
+
+def diff_units(old_digests: List[str], new_units: List[Dict[str, Any]], new_digests: List[str]) -> UnitDiff:
+    """Compara unidades por su digest, una por aparición (las repetidas cuentan)."""
+    remaining = Counter(old_digests)
+    added, added_at = [], []
+    positions: Counter = Counter()
+    for position, (unit, digest) in enumerate(zip(new_units, new_digests)):
+        group = _group(unit)
+        index = positions[group]
+        positions[group] += 1
+        if remaining[digest]:
+            remaining[digest] -= 1
+        else:
+            added.append(dict(unit, index=index))
+            added_at.append(position)
+    removed, kept = [], []
+    for position, digest in enumerate(old_digests):
+        if remaining[digest]:
+            remaining[digest] -= 1
+            removed.append(position)
+        else:
+            kept.append(position)
+    return UnitDiff(added, added_at, removed, kept)
+
+
+def diff_documents(old: Dict[str, Any], new: Dict[str, Any]) -> Tuple[List[Dict], List[Dict], int]:
+    """
+    Unidades añadidas y eliminadas (una por aparición) y número de unidades
+    de 'new'. Cada añadida lleva en 'index' su posición dentro de su lista.
+    """
+    old_units = explode(document_findings(old))
+    new_units = explode(document_findings(new))
+    diff = diff_units([unit_digest(unit) for unit in old_units], new_units,
+                      [unit_digest(unit) for unit in new_units])
+    return diff.added, [old_units[position] for position in diff.removed], len(new_units)
+
+
+def _round_trips(document: Dict[str, Any], new_fps: Fingerprints, baseline_fps: Fingerprints,
+                 diff: UnitDiff) -> bool:
+    """
+    Si base + diferencia reconstruyen exactamente el documento (orden
+    incluido). La base no hace falta: rebuild() coloca las unidades según su
+    tipo, campo y claves, así que basta con reconstruir sus huellas.
+    """
+    # rebuild() solo devuelve hallazgos {'type', 'data'}
+    if any(not isinstance(finding, dict) or list(finding) != ['type', 'data']
+           for finding in document_findings(document)):
+        return False
+    kept = [baseline_fps.skeleton(position) for position in diff.kept]
+    added = [dict(new_fps.skeleton(position), index=unit['index'])
+             for position, unit in zip(diff.added_at, diff.added)]
+    try:
+        rebuilt = rebuild(kept, added)
+    except (AttributeError, TypeError, IndexError):
+        # p. ej. un tipo que pasa de repetido a único: otra forma de hallazgo
+        return False
+    # Se comparan serializados: el orden de las claves también cuenta
+    expected = rebuild(new_fps.skeleton(position) for position in range(len(new_fps.digests)))
+    return dumps(rebuilt) == dumps(expected)
+
+
+def _removed_units(baseline_fps: Fingerprints, removed: List[int],
+                   load_baseline: Optional[Callable[[], Dict[str, Any]]]) -> Optional[List[Dict[str, Any]]]:
+    # Unidades eliminadas con su valor: de la huella o, si no cabía en ella, de la base
+    large = set(baseline_fps.large)
+    units: List[Optional[Dict[str, Any]]] = []
+    missing: Dict[str, List[int]] = {}
+    for position in removed:
+        if position in large:
+            missing.setdefault(baseline_fps.digests[position], []).append(len(units))
+            units.append(None)
+        else:
+            units.append(baseline_fps.unit(position))
+    if missing:
+        if load_baseline is None:
+            return None
+        try:
+            baseline = load_baseline()
+        except Exception as e:
+            logger.warning(f"Could not load baseline: {e}")
+            return None
+        for unit in explode(document_findings(baseline)):
+            slots = missing.get(unit_digest(unit))
+            if slots:
+                units[slots.pop()] = unit
+        if any(missing.values()):
+            return None
+    return units
+
+
+def make_delta(document: Dict[str, Any], baseline_location: str, baseline_fps: Fingerprints,
+               load_baseline: Optional[Callable[[], Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+    """
+    Documento con solo las unidades añadidas y eliminadas respecto a la base,
+    de la que basta su huella (fingerprints()), o None si cambia demasiado
+    para compensar. Las unidades eliminadas salen de la huella; solo si
+    alguna no cabía en ella se llama a 'load_baseline' (el documento base
+    rehidratado).
+    """
+    new_units = explode(document_findings(document))
+    new_fps = fingerprints(new_units)
+    diff = diff_units(baseline_fps.digests, new_units, new_fps.digests)
+    return _delta(document, baseline_location, new_fps, baseline_fps, diff, load_baseline)
+
+
+def _delta(document: Dict[str, Any], baseline_location: str, new_fps: Fingerprints,
+           baseline_fps: Fingerprints, diff: UnitDiff,
+           load_baseline: Optional[Callable[[], Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+    total = len(new_fps.digests)
+    # Sin unidades nuevas (ejecución vacía) una diferencia solo serían bajas
+    if not total or len(diff.added) + len(diff.removed) > MAX_DELTA_RATIO * total:
+        return None
+    if not _round_trips(document, new_fps, baseline_fps, diff):
+        logger.debug(f"Delta for {document['target']} does not round-trip; storing the full result")
+        return None
+    removed = _removed_units(baseline_fps, diff.removed, load_baseline)
+    if removed is None:
+        logger.debug(f"Removed units of {document['target']} not found in its baseline; storing the full result")
+        return None
+
+    findings_meta = {k: v for k, v in document['findings'].items() if k != 'findings'}
+    return {
+        'target': document['target'],
+        'module': document['module'],
+        'timestamp': document['timestamp'],
+        'baseline': baseline_location,
+        'findings_meta': findings_meta,
+        'changes': {
+            'added': diff.added,
+            'removed': removed,
+            'unchanged': total - len(diff.added),
+        },
+    }
+
+
+def rehydrate(delta: Dict[str, Any], directory: Union[str, Path, None] = None) -> Dict[str, Any]:
+    """
+    Reconstruye el documento completo: carga su base (rehidratándola a su vez
+    si también es una diferencia) y le aplica los cambios. 'baseline' es
+    relativa a la carpeta de la diferencia ('directory').
+    """
+    baseline = load_result(resolve_location(delta['baseline'], directory or '.'))
+    units = _without(explode(document_findings(baseline)), delta['changes']['removed'])
+
+    findings = dict(delta.get('findings_meta') or {})
+    findings['findings'] = rebuild(units, delta['changes']['added'])
+    return {
+        'target': delta['target'],
+        'module': delta['module'],
+        'timestamp': delta['timestamp'],
+        'findings': findings,
+        'changes': {
+            'baseline': delta['baseline'],
+            'added': len(delta['changes']['added']),
+            'removed': len(delta['changes']['removed']),
+        },
+    }
+
+
+def iter_changes(delta: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Pares ('added' | 'removed', unidad) de un documento de diferencias."""
+    for unit in delta['changes']['added']:
+        yield 'added', unit
+    for unit in delta['changes']['removed']:
+        yield 'removed', unit
+
+
+def _previous_fingerprints(catalog, document: Dict[str, Any]):
+    """
+    Último resultado correcto del mismo objetivo y módulo y su huella. La
+    huella sale del catálogo; solo los resultados guardados
+    sin ella (anteriores a las huellas o indexados con reindex()) se leen y
+    rehidratan para calcularla. Devuelve (registro, huella, base cargada o
+    None), con huella None si el resultado no se pudo leer, o (None, None,
+    None) si no hay ninguno.
+    """
+    stored = catalog.fingerprints(document['target'], document['module'])
+    for record in catalog.find(target=document['target'], module=document['module'], limit=_MAX_ERROR_RUNS):
+        if stored is not None and record.id == stored[0]:
+            return record, Fingerprints.from_dict(stored[1]), None
+        # Sin huella: o es una ejecución fallida (que se salta) o un resultado antiguo
+        try:
+            loaded = load_result(record.location)
+        except Exception as e:
+            logger.warning(f"Could not load baseline {record.location}: {e}")
+            return record, None, None
+        if not has_error(loaded):
+            return record, fingerprints(explode(document_findings(loaded))), loaded
+    return None, None, None
+
+
+def plan_save(catalog, document: Dict[str, Any], max_chain: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Decide qué guardar de un documento nuevo: la diferencia con el último
+    resultado del mismo objetivo y módulo si existe y compensa, o el
+    documento completo si no (primera ejecución, cadena de diferencias de
+    'max_chain' saltos, demasiados cambios). Las ejecuciones fallidas se
+    guardan completas y no se comparan con nada, ni sirven de base: la
+    siguiente se compara con el último resultado correcto. Se compara con la
+    huella del último resultado que guarda el catálogo, no con el resultado
+    en sí, así que el coste depende de lo que cambia y no de lo que se
+    guardó. Devuelve (documento a escribir, argumentos para catalog.add(),
+    huella del documento incluida).
+    """
+    if not is_single_module(document) or has_error(document):
+        return document, {}
+    new_units = explode(document_findings(document))
+    new_fps = fingerprints(new_units)
+    previous, baseline_fps, loaded = _previous_fingerprints(catalog, document)
+    if previous is None:
+        return document, {'fingerprints': new_fps.to_dict()}
+    if baseline_fps is None:
+        return document, {'previous': previous.location, 'fingerprints': new_fps.to_dict()}
+
+    diff = diff_units(baseline_fps.digests, new_units, new_fps.digests)
+    meta = {'previous': previous.location, 'added': len(diff.added), 'removed': len(diff.removed),
+            'fingerprints': new_fps.to_dict()}
+    if max_chain <= 0 or previous.chain >= max_chain:
+        return document, meta
+    # La base solo se abre si una unidad eliminada no cabía en su huella
+    load_baseline = (lambda: loaded) if loaded is not None else (lambda: load_result(previous.location))
+    # La base se guarda relativa a la carpeta de resultados (la del catálogo)
+    delta = _delta(document, relative_location(previous.location, catalog.directory), new_fps,
+                   baseline_fps, diff, load_baseline)
+    if delta is None:
+        return document, meta
+    return delta, dict(meta, baseline=previous.location, chain=previous.chain + 1)
+
+
+def _without_derived(changes: Iterable[Tuple[str, Dict[str, Any]]]) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Quita de las unidades de campos sueltos los derivados (DERIVED_FIELDS);
+    si lo que queda no cambia entre la baja y el alta, no se informa.
+    """
+    changes = [(change, dict(unit, value={k: v for k, v in unit['value'].items() if k not in DERIVED_FIELDS})
+                if unit['field'] == SCALARS and isinstance(unit['value'], dict) else unit)
+               for change, unit in changes]
+    scalars = Counter((change, unit['type'], dumps(unit['value'], sort_keys=True))
+                      for change, unit in changes if unit['field'] == SCALARS)
+    result = []
+    for change, unit in changes:
+        if unit['field'] == SCALARS:
+            other = ('removed' if change == 'added' else 'added', unit['type'], dumps(unit['value'], sort_keys=True))
+            if scalars[other]:
+                continue
+        result.append((change, unit))
+    return result
+
+
+def changes_since(catalog, target: str, module: Optional[str] = None, since: Optional[float] = None,
+                  finding_type: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Cambios (hallazgos añadidos o eliminados) de un objetivo desde 'since'
+    (epoch), del más antiguo al más reciente. Solo se leen las diferencias
+    guardadas, no los documentos completos; si un resultado se guardó entero
+    se compara con el anterior.
+    """
+    for record in catalog.find(target=target, module=module, since=since, limit=None, oldest_first=True):
+        if not record.previous or not (record.added or record.removed):
+            continue
+        try:
+            if record.baseline:
+                delta = read_result(record.location)
+                changes = iter_changes(delta)
+            else:
+                added, removed, _ = diff_documents(load_result(record.previous), load_result(record.location))
+                changes = [('added', unit) for unit in added] + [('removed', unit) for unit in removed]
+        except Exception as e:
+            logger.warning(f"Could not read changes from {record.location}: {e}")
+            continue
+        for change, unit in _without_derived(changes):
+            if finding_type is not None and unit['type'] != finding_type:
+                continue
+            yield {
+                'target': record.target,
+                'module': record.module,
+                'timestamp': record.timestamp,
+                'change': change,
+                'type': unit['type'],
+                'field': unit['field'],
+                'value': unit['value'],
+                'location': record.location,
+            }
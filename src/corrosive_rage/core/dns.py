@@ -0,0 +1,512 @@
+# src/corrosive_rage/core/dns.py
+import asyncio
+import configparser
+import ipaddress
+import logging
+import random
+import socket
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from .subdomains import normalize_hostname
+
+logger = logging.getLogger(__name__)
+
+# Tipos de registro soportados (código de tipo DNS)
+QTYPES = {'A': 1, 'NS': 2, 'CNAME': 5, 'SOA': 6, 'PTR': 12, 'MX': 15, 'TXT': 16, 'AAAA': 28}
+_OPT = 41
+_CLASS_IN = 1
+
+# Códigos de respuesta; TIMEOUT es nuestro (ningún servidor respondió)
+RCODES = {0: 'NOERROR', 1: 'FORMERR', 2: 'SERVFAIL', 3: 'NXDOMAIN', 4: 'NOTIMP', 5: 'REFUSED'}
+NOERROR = 'NOERROR'
+NXDOMAIN = 'NXDOMAIN'
+TIMEOUT = 'TIMEOUT'
+
+DEFAULT_RECORD_TYPES = ('A', 'AAAA', 'MX')
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_RETRIES = 2
+DEFAULT_CONCURRENCY = 200
+DEFAULT_CACHE_SIZE = 100_000
+DEFAULT_NEGATIVE_TTL = 300
+MAX_TTL = 86400
+# Si no hay /etc/resolv.conf (Windows) ni nameservers en config.ini
+FALLBACK_NAMESERVERS = ('1.1.1.1', '8.8.8.8')
+# Búfer de recepción del socket: las respuestas de cientos de consultas en
+# vuelo llegan a ráfagas y con el búfer por defecto se pierden
+_RECV_BUFFER = 1 << 20
+# Tamaño UDP anunciado con EDNS0 (el recomendado para evitar fragmentación)
+_EDNS_PAYLOAD = 1232
+
+
+class DNSAnswer(NamedTuple):
+    """
+    Respuesta a una consulta (nombre, tipo). 'records' son los datos del tipo
+    pedido en forma de texto ('192.0.2.1', '10 mx.example.com'...) y 'cname'
+    la cadena de alias que se siguió hasta ellos.
+    """
+    name: str
+    rtype: str
+    rcode: str
+    records: Tuple[str, ...] = ()
+    cname: Tuple[str, ...] = ()
+    ttl: int = 0
+
+
+class DNSError(Exception):
+    pass
+
+
+# --- Formato de los mensajes (RFC 1035) ---
+
+def encode_name(name: str) -> bytes:
+    out = bytearray()
+    for label in name.rstrip('.').split('.'):
+        if not label:
+            raise DNSError(f"Empty label in {name!r}")
+        data = label.encode('ascii') if label.isascii() else label.encode('idna')
+        if len(data) > 63:
+            raise DNSError(f"Label too long in {name!r}")
+        out.append(len(data))
+        out += data
+    out.append(0)
+    return bytes(out)
+
+
+def build_query(qid: int, name: str, rtype: str) -> bytes:
+    """Consulta recursiva (RD) con un registro OPT de EDNS0."""
+    header = struct.pack('!HHHHHH', qid, 0x0100, 1, 0, 0, 1)
+    question = encode_name(name) + struct.pack('!HH', QTYPES[rtype], _CLASS_IN)
+    opt = b'\x00' + struct.pack('!HHIH', _OPT, _EDNS_PAYLOAD, 0, 0)
+    return header + question + opt
+
+
+def _read_name(message: bytes, offset: int) -> Tuple[str, int]:
+    """Nombre (con punteros de compresión) y posición tras él."""
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        length = message[offset]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | message[offset + 1]
+            jumps += 1
+            if jumps > 64:
+                raise DNSError("Compression loop")
+            continue
+        offset += 1
+        if length == 0:
+            break
+        labels.append(message[offset:offset + length].decode('ascii', 'replace'))
+        offset += length
+    return '.'.join(labels).lower(), end if end is not None else offset
+
+
+def _rdata_text(message: bytes, rtype: int, start: int, length: int) -> Optional[str]:
+    if rtype == 1 and length == 4:
+        return str(ipaddress.IPv4Address(message[start:start + 4]))
+    if rtype == 28 and length == 16:
+        return str(ipaddress.IPv6Address(message[start:start + 16]))
+    if rtype in (2, 5, 12):
+        return _read_name(message, start)[0]
+    if rtype == 15:
+        preference = struct.unpack_from('!H', message, start)[0]
+        return f"{preference} {_read_name(message, start + 2)[0]}"
+    if rtype == 16:
+        parts, offset = [], start
+        while offset < start + length:
+            size = message[offset]
+            parts.append(message[offset + 1:offset + 1 + size].decode('utf-8', 'replace'))
+            offset += 1 + size
+        return ''.join(parts)
+    return None
+
+
+class _Message(NamedTuple):
+    qid: int
+    truncated: bool
+    rcode: str
+    question: Tuple[str, int]
+    answers: List[Tuple[str, int, int, Optional[str]]]
+    negative_ttl: Optional[int]
+
+
+def parse_response(message: bytes) -> _Message:
+    qid, flags, qdcount, ancount, nscount, _ = struct.unpack_from('!HHHHHH', message)
+    if not flags & 0x8000:
+        raise DNSError("Not a response")
+    offset = 12
+    question = ('', 0)
+    for _ in range(qdcount):
+        qname, offset = _read_name(message, offset)
+        qtype, _ = struct.unpack_from('!HH', message, offset)
+        offset += 4
+        question = (qname, qtype)
+
+    answers = []
+    negative_ttl = None
+    for index in range(ancount + nscount):
+        name, offset = _read_name(message, offset)
+        rtype, _, ttl, length = struct.unpack_from('!HHIH', message, offset)
+        offset += 10
+        if index < ancount:
+            answers.append((name, rtype, ttl, _rdata_text(message, rtype, offset, length)))
+        elif rtype == 6:
+            # TTL negativo (RFC 2308): el menor entre el del SOA y su 'minimum'
+            _, end = _read_name(message, offset)
+            _, end = _read_name(message, end)
+            minimum = struct.unpack_from('!I', message, end + 16)[0]
+            negative_ttl = min(ttl, minimum)
+        offset += length
+    return _Message(qid, bool(flags & 0x0200), RCODES.get(flags & 0x000F, str(flags & 0x000F)),
+                    question, answers, negative_ttl)
+
+
+def reverse_name(ip: str) -> str:
+    """Nombre PTR de una IP (1.2.0.192.in-addr.arpa, ...ip6.arpa)."""
+    return ipaddress.ip_address(ip).reverse_pointer
+
+
+def parse_nameserver(value: str) -> Tuple[str, int]:
+    """'1.1.1.1', '127.0.0.1:5353', '[::1]:53' -> (host, puerto)."""
+    value = value.strip()
+    if value.startswith('['):
+        host, _, port = value[1:].partition(']')
+        return host, int(port.lstrip(':') or 53)
+    if value.count(':') == 1:
+        host, port = value.split(':')
+        return host, int(port)
+    return value, 53
+
+
+def system_nameservers(path: str = '/etc/resolv.conf') -> List[str]:
+    try:
+        lines = Path(path).read_text().splitlines()
+    except OSError:
+        return []
+    return [line.split()[1] for line in lines
+            if line.strip().startswith('nameserver') and len(line.split()) > 1]
+
+
+# --- Caché ---
+
+class DNSCache:
+    """
+    Caché en memoria de respuestas DNS con el TTL de cada una (las negativas,
+    NXDOMAIN o sin registros, con el del SOA). La comparten todos los hilos.
+    """
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: Dict[Tuple[str, str], Tuple[float, DNSAnswer]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name: str, rtype: str) -> Optional[DNSAnswer]:
+        with self._lock:
+            entry = self._entries.get((name, rtype))
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def set(self, answer: DNSAnswer, ttl: int):
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._evict()
+            self._entries[(answer.name, answer.rtype)] = (time.monotonic() + ttl, answer)
+
+    def _evict(self):
+        now = time.monotonic()
+        expired = [key for key, (expires, _) in self._entries.items() if expires <= now]
+        for key in expired:
+            del self._entries[key]
+        if len(self._entries) >= self.max_entries:
+            # Las más antiguas primero (orden de inserción)
+            for key in list(self._entries)[:max(1, self.max_entries // 4)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# --- Transporte ---
+
+class _UDPClient(asyncio.DatagramProtocol):
+    """
+    Un socket UDP por familia de direcciones para todas las consultas en
+    vuelo; las respuestas se reparten por id de mensaje.
+    """
+    def __init__(self):
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self.pending: Dict[int, Tuple[Tuple[str, int], asyncio.Future]] = {}
+
+    def connection_made(self, transport):
+        self.transport = transport
+        sock = transport.get_extra_info('socket')
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _RECV_BUFFER)
+            except OSError:
+                pass
+
+    def datagram_received(self, data: bytes, addr):
+        if len(data) < 12:
+            return
+        qid = struct.unpack_from('!H', data)[0]
+        entry = self.pending.get(qid)
+        # Solo se acepta del servidor al que se preguntó
+        if entry is None or (addr[0], addr[1]) != entry[0] or entry[1].done():
+            return
+        entry[1].set_result(data)
+
+    def error_received(self, exc):
+        logger.debug(f"DNS socket error: {exc}")
+
+    def new_id(self) -> int:
+        while True:
+            qid = random.getrandbits(16)
+            if qid not in self.pending:
+                return qid
+
+
+class DNSResolver:
+    """
+    Resolutor DNS propio y asíncrono para consultas en bloque: miles de
+    nombres por segundo sobre UDP (TCP si la respuesta llega truncada), con
+    como mucho 'concurrency' consultas en vuelo, reintentos rotando los
+    servidores y caché por TTL. resolve_many() / reverse_many() son las
+    versiones síncronas para los módulos.
+    """
+    def __init__(self, nameservers: Optional[Sequence[str]] = None, timeout: float = DEFAULT_TIMEOUT,
+                 retries: int = DEFAULT_RETRIES, concurrency: int = DEFAULT_CONCURRENCY,
+                 cache: Optional[DNSCache] = None, negative_ttl: int = DEFAULT_NEGATIVE_TTL,
+                 record_types: Sequence[str] = DEFAULT_RECORD_TYPES):
+        servers = list(nameservers or system_nameservers() or FALLBACK_NAMESERVERS)
+        self.nameservers = [parse_nameserver(server) for server in servers]
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.concurrency = max(1, concurrency)
+        self.cache = cache if cache is not None else DNSCache()
+        self.negative_ttl = negative_ttl
+        # Tipos que consultan los módulos para cada nombre
+        self.record_types = tuple(rtype.upper() for rtype in record_types)
+
+    @classmethod
+    def from_config(cls, config: configparser.ConfigParser) -> 'DNSResolver':
+        servers = config.get('dns', 'nameservers', fallback='')
+        record_types = config.get('dns', 'record_types', fallback=','.join(DEFAULT_RECORD_TYPES))
+        return cls(
+            nameservers=[s for s in servers.replace(',', ' ').split() if s],
+            timeout=config.getfloat('dns', 'timeout', fallback=DEFAULT_TIMEOUT),
+            retries=config.getint('dns', 'retries', fallback=DEFAULT_RETRIES),
+            concurrency=config.getint('dns', 'concurrency', fallback=DEFAULT_CONCURRENCY),
+            cache=DNSCache(config.getint('dns', 'cache_size', fallback=DEFAULT_CACHE_SIZE)),
+            negative_ttl=config.getint('dns', 'negative_ttl', fallback=DEFAULT_NEGATIVE_TTL),
+            record_types=[t for t in record_types.replace(',', ' ').split() if t in QTYPES] or DEFAULT_RECORD_TYPES,
+        )
+
+    # --- API síncrona ---
+
+    def resolve_many(self, names: Iterable[str], rtypes: Optional[Sequence[str]] = None
+                     ) -> Dict[str, Dict[str, DNSAnswer]]:
+        """{nombre: {tipo: DNSAnswer}} para cada nombre y tipo (por defecto, 'record_types')."""
+        return asyncio.run(self.aresolve_many(names, rtypes))
+
+    def reverse_many(self, ips: Iterable[str]) -> Dict[str, DNSAnswer]:
+        """{ip: respuesta PTR}."""
+        return asyncio.run(self.areverse_many(ips))
+
+    # --- API asíncrona ---
+
+    async def aresolve_many(self, names: Iterable[str], rtypes: Optional[Sequence[str]] = None
+                            ) -> Dict[str, Dict[str, DNSAnswer]]:
+        rtypes = self.record_types if rtypes is None else rtypes
+        names = list(dict.fromkeys(normalize_hostname(name) or name for name in names))
+        queries = [(name, rtype.upper()) for name in names for rtype in rtypes]
+        answers = await self._run_queries(queries)
+        results: Dict[str, Dict[str, DNSAnswer]] = {name: {} for name in names}
+        for answer in answers:
+            results[answer.name][answer.rtype] = answer
+        return results
+
+    async def areverse_many(self, ips: Iterable[str]) -> Dict[str, DNSAnswer]:
+        pointers = {}
+        for ip in dict.fromkeys(ips):
+            try:
+                pointers[ip] = reverse_name(ip)
+            except ValueError:
+                logger.warning(f"Not an IP address, skipping PTR lookup: {ip}")
+        answers = await self._run_queries([(name, 'PTR') for name in pointers.values()])
+        by_name = {answer.name: answer for answer in answers}
+        return {ip: by_name[name] for ip, name in pointers.items()}
+
+    async def _run_queries(self, queries: List[Tuple[str, str]]) -> List[DNSAnswer]:
+        results: List[Optional[DNSAnswer]] = [None] * len(queries)
+        missing = []
+        for index, (name, rtype) in enumerate(queries):
+            cached = self.cache.get(name, rtype)
+            if cached is not None:
+                results[index] = cached
+            else:
+                missing.append(index)
+        if missing:
+            loop = asyncio.get_running_loop()
+            clients: Dict[int, 'asyncio.Future[Tuple[asyncio.DatagramTransport, _UDPClient]]'] = {}
+            semaphore = asyncio.Semaphore(self.concurrency)
+
+            async def one(index):
+                async with semaphore:
+                    results[index] = await self._query(loop, clients, *queries[index])
+
+            try:
+                await asyncio.gather(*(one(index) for index in missing))
+            finally:
+                for opening in clients.values():
+                    if opening.done() and not opening.exception():
+                        opening.result()[0].close()
+            logger.debug(f"Resolved {len(missing)} DNS queries ({len(queries) - len(missing)} cached)")
+        return results
+
+    async def _client(self, loop, clients, host: str) -> _UDPClient:
+        family = 6 if ':' in host else 4
+        if family not in clients:
+            # Se guarda la tarea, no el cliente: las consultas que lleguen
+            # mientras se abre el socket esperan a la misma
+            clients[family] = loop.create_task(loop.create_datagram_endpoint(
+                _UDPClient, local_addr=('::' if family == 6 else '0.0.0.0', 0)))
+        transport, client = await clients[family]
+        return client
+
+    async def _query(self, loop, clients: Dict[int, _UDPClient], name: str, rtype: str) -> DNSAnswer:
+        try:
+            encode_name(name)
+        except DNSError as e:
+            logger.debug(f"Invalid DNS name {name!r}: {e}")
+            return DNSAnswer(name, rtype, 'FORMERR')
+
+        last_rcode = TIMEOUT
+        for attempt in range(self.retries + 1):
+            server = self.nameservers[attempt % len(self.nameservers)]
+            try:
+                message = await self._exchange_udp(loop, clients, server, name, rtype)
+                if message.truncated:
+                    message = parse_response(await self._exchange_tcp(server, name, rtype))
+            except asyncio.TimeoutError:
+                continue
+            except (OSError, DNSError, struct.error, IndexError, ValueError) as e:
+                logger.debug(f"DNS query {name} {rtype} to {server[0]} failed: {e}")
+                last_rcode = 'ERROR'
+                continue
+            if message.rcode in (NOERROR, NXDOMAIN):
+                return self._answer(name, rtype, message)
+            # SERVFAIL, REFUSED...: se prueba con el siguiente servidor
+            last_rcode = message.rcode
+        return DNSAnswer(name, rtype, last_rcode)
+
+    async def _exchange_udp(self, loop, clients, server: Tuple[str, int], name: str, rtype: str) -> _Message:
+        client = await self._client(loop, clients, server[0])
+        qid = client.new_id()
+        future = loop.create_future()
+        client.pending[qid] = (server, future)
+        try:
+            client.transport.sendto(build_query(qid, name, rtype), server)
+            while True:
+                message = parse_response(await asyncio.wait_for(future, self.timeout))
+                # Una respuesta con nuestro id pero a otra pregunta se ignora
+                if message.question == (name, QTYPES[rtype]):
+                    return message
+                future = loop.create_future()
+                client.pending[qid] = (server, future)
+        finally:
+            client.pending.pop(qid, None)
+
+    async def _exchange_tcp(self, server: Tuple[str, int], name: str, rtype: str) -> bytes:
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(*server), self.timeout)
+        try:
+            query = build_query(random.getrandbits(16), name, rtype)
+            writer.write(struct.pack('!H', len(query)) + query)
+            await writer.drain()
+            size = struct.unpack('!H', await asyncio.wait_for(reader.readexactly(2), self.timeout))[0]
+            return await asyncio.wait_for(reader.readexactly(size), self.timeout)
+        finally:
+            writer.close()
+
+    def _answer(self, name: str, rtype: str, message: _Message) -> DNSAnswer:
+        code = QTYPES[rtype]
+        records, cname, ttls = [], [], []
+        for _, answer_type, ttl, text in message.answers:
+            if text is None:
+                continue
+            if answer_type == code:
+                records.append(text)
+                ttls.append(ttl)
+            elif answer_type == 5:
+                cname.append(text)
+                ttls.append(ttl)
+        if rtype == 'MX':
+            records.sort(key=lambda mx: int(mx.split()[0]))
+        if records or cname:
+            ttl = min(ttls)
+        else:
+            ttl = message.negative_ttl if message.negative_ttl is not None else self.negative_ttl
+        answer = DNSAnswer(name, rtype, message.rcode, tuple(records), tuple(cname), min(ttl, MAX_TTL))
+        self.cache.set(answer, answer.ttl)
+        return answer
+
+
+def host_records(name: str, answers: Dict[str, DNSAnswer]) -> Dict[str, object]:
+    """
+    Resumen de las respuestas de un nombre para los hallazgos: una lista por
+    tipo en minúsculas ('a', 'aaaa', 'mx'...), la cadena 'cname' y 'status'
+    (NOERROR, NXDOMAIN, TIMEOUT...).
+    """
+    record: Dict[str, object] = {'name': name}
+    cname: List[str] = []
+    status = NOERROR
+    for rtype, answer in answers.items():
+        record[rtype.lower()] = list(answer.records)
+        for alias in answer.cname:
+            if alias not in cname:
+                cname.append(alias)
+        if answer.rcode != NOERROR and status == NOERROR:
+            status = answer.rcode
+    if 'cname' not in record:
+        record['cname'] = cname
+    record['status'] = status
+    return record
+
+
+def is_live(record: Dict[str, object]) -> bool:
+    """Si el nombre resuelve a alguna dirección (A o AAAA)."""
+    return bool(record.get('a') or record.get('aaaa'))
+
+
+_resolver: Optional[DNSResolver] = None
+_resolver_lock = threading.Lock()
+
+
+def configure_dns(config: configparser.ConfigParser) -> DNSResolver:
+    """Crea el resolutor global a partir de la sección [dns] de config.ini."""
+    global _resolver
+    with _resolver_lock:
+        _resolver = DNSResolver.from_config(config)
+        return _resolver
+
+
+def get_resolver() -> DNSResolver:
+    """Devuelve el resolutor global (con la configuración por defecto si no se configuró)."""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = DNSResolver()
+        return _resolver
@@ -0,0 +1,168 @@
+# src/corrosive_rage/core/geoip.py
+import ipaddress
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from .cache import get_cache
+from .utils import make_request
+
+logger = logging.getLogger(__name__)
+
+SINGLE_URL = 'http://ip-api.com/json/{}'
+BATCH_URL = 'http://ip-api.com/batch'
+# Campos que usa ip_recon (el resto no se pide)
+FIELDS = 'status,message,country,regionName,city,isp,org,query'
+# El endpoint /batch admite hasta 100 IPs por petición y tiene su propio
+# cupo (15 por minuto), regla 'batch.ip-api.com' de core.ratelimit
+MAX_BATCH = 100
+BATCH_RATE_HOST = 'batch.ip-api.com'
+# Tiempo que se espera a juntar más IPs antes de enviar un lote incompleto
+DEFAULT_LINGER = 0.2
+# Objetivos que se leen por delante en modo batch para llenar los lotes
+DEFAULT_LOOKAHEAD = 500
+# Segundos sin trabajo tras los que el hilo de envío termina
+_IDLE_EXIT = 5.0
+# Respuestas adelantadas que nadie ha pedido todavía (las más antiguas se descartan)
+_MAX_UNCLAIMED = 10_000
+
+
+def is_ip(value: str) -> bool:
+    try:
+        ipaddress.ip_address(value)
+    except ValueError:
+        return False
+    return True
+
+
+class GeoBatcher:
+    """
+    Geolocalización con ip-api.com agrupando IPs. Las consultas que
+    coinciden en el tiempo (módulos ip_recon de un batch o del pipeline) y
+    las adelantadas con prefetch() se juntan, sin duplicados, en peticiones
+    al endpoint /batch de hasta 100 IPs, al ritmo de su cupo; cada IP recibe
+    su propia respuesta. Una IP sola va al endpoint normal. Las respuestas
+    correctas se guardan en la caché (fuente 'ip-api.com').
+    """
+    def __init__(self, linger: float = DEFAULT_LINGER, max_batch: int = MAX_BATCH):
+        self.linger = linger
+        self.max_batch = max(1, min(max_batch, MAX_BATCH))
+        # IPs por enviar, y todas las que tienen respuesta en curso o adelantada
+        self._pending: Dict[str, Future] = {}
+        self._futures: Dict[str, Future] = {}
+        self._cond = threading.Condition()
+        self._worker: Optional[threading.Thread] = None
+
+    def lookup(self, ip: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Respuesta de ip-api para 'ip' (status, country...), o None si la petición falló."""
+        with self._cond:
+            future = self._futures.get(ip)
+        if future is None:
+            cached = self._cached(ip)
+            if cached is not None:
+                return cached
+            future = self._enqueue(ip)
+        result = future.result(timeout)
+        with self._cond:
+            if self._futures.get(ip) is future:
+                del self._futures[ip]
+        return result
+
+    def prefetch(self, ips: Iterable[str]):
+        """Encola IPs para los próximos lotes sin esperar a la respuesta."""
+        for ip in ips:
+            if self._cached(ip) is None:
+                self._enqueue(ip)
+
+    def _cached(self, ip: str) -> Optional[Dict[str, Any]]:
+        cache = get_cache()
+        return cache.get_value('ip-api.com', f'geo:{ip}') if cache is not None else None
+
+    def _enqueue(self, ip: str) -> Future:
+        with self._cond:
+            future = self._futures.get(ip)
+            if future is None:
+                future = self._pending[ip] = self._futures[ip] = Future()
+                if len(self._futures) > _MAX_UNCLAIMED:
+                    self._discard_unclaimed()
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name='corrosive-geoip', daemon=True)
+                    self._worker.start()
+                self._cond.notify()
+            return future
+
+    def _discard_unclaimed(self):
+        for ip in [ip for ip, future in self._futures.items() if future.done()][:_MAX_UNCLAIMED // 10]:
+            del self._futures[ip]
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._pending and not self._cond.wait_for(lambda: self._pending, _IDLE_EXIT):
+                    self._worker = None
+                    return
+                if len(self._pending) < self.max_batch:
+                    # Da un momento a que lleguen más IPs para llenar el lote
+                    self._cond.wait_for(lambda: len(self._pending) >= self.max_batch, self.linger)
+                batch = {}
+                for ip in list(self._pending)[:self.max_batch]:
+                    batch[ip] = self._pending.pop(ip)
+            try:
+                results = self._fetch(list(batch))
+            except Exception as e:
+                logger.error(f"Geolocation batch of {len(batch)} IPs failed: {type(e).__name__}: {e}")
+                results = {}
+            for ip, future in batch.items():
+                future.set_result(results.get(ip))
+
+    def _fetch(self, ips: List[str]) -> Dict[str, Dict[str, Any]]:
+        if len(ips) == 1:
+            response = make_request(SINGLE_URL.format(ips[0]), params={'fields': FIELDS})
+            answers = [response.json()] if response else []
+        else:
+            # Solo cuenta el cupo del endpoint batch, no el de las consultas sueltas
+            response = make_request(BATCH_URL, method='POST', params={'fields': FIELDS}, json=ips,
+                                    rate_host=BATCH_RATE_HOST)
+            answers = response.json() if response else []
+            logger.debug(f"Geolocation batch: {len(ips)} IPs in one request")
+
+        # Las respuestas vienen en el mismo orden; 'query' es la IP consultada
+        results = {}
+        cache = get_cache()
+        for ip, answer in zip(ips, answers):
+            results[ip] = answer
+            if cache is not None and answer.get('status') == 'success':
+                cache.set_value('ip-api.com', f'geo:{ip}', answer)
+        return results
+
+
+def prefetch_ahead(targets: Iterable[str], batcher: 'GeoBatcher', lookahead: int = DEFAULT_LOOKAHEAD,
+                   skip: Optional[Callable[[str], bool]] = None) -> Iterator[str]:
+    """
+    Devuelve los mismos objetivos, pero leyendo 'lookahead' por delante y
+    encolando sus IPs en 'batcher', para que cuando ip_recon pida cada una
+    ya vaya en un lote lleno. 'skip' descarta las que no se van a ejecutar.
+    """
+    buffer: deque = deque()
+    for target in targets:
+        buffer.append(target)
+        if is_ip(target) and (skip is None or not skip(target)):
+            batcher.prefetch([target])
+        if len(buffer) > lookahead:
+            yield buffer.popleft()
+    yield from buffer
+
+
+_batcher: Optional[GeoBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def get_geo_batcher() -> GeoBatcher:
+    """Devuelve el agrupador de geolocalización compartido."""
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = GeoBatcher()
+        return _batcher
@@ -0,0 +1,93 @@
+# src/corrosive_rage/core/journal.py
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .batch import SeenSet
+from .serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+STATE_QUEUED = 'queued'
+STATE_RUNNING = 'running'
+STATE_DONE = 'done'
+STATE_FAILED = 'failed'
+
+
+def job_key(target: str, module: str) -> str:
+    return f"{module}\t{target}"
+
+
+class JobJournal:
+    """
+    Diario de trabajos de un batch, solo de añadir: una línea JSON por cada
+    cambio de estado de un trabajo (objetivo, módulo) - queued, running,
+    done o failed - con la ubicación del resultado o el error.
+
+    Cada línea se escribe con una sola llamada write() en un fichero abierto
+    en modo append y con buffer de línea: no hay fsync ni reescrituras, así
+    que el coste por trabajo es de microsegundos. Si el proceso muere, como
+    mucho se pierde la última línea (a medio escribir), y ese trabajo
+    simplemente se repite al reanudar.
+    """
+    def __init__(self, path: Path, resume: bool = False):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Solo guardamos qué trabajos terminaron bien, como huellas compactas
+        self._done = SeenSet()
+        self.previous: Dict[str, int] = {}
+        if resume and self.path.exists():
+            self._replay()
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a' if resume else 'w', encoding='utf-8', buffering=1)
+
+    def _replay(self):
+        """Reconstruye el último estado de cada trabajo a partir del diario."""
+        last_state: Dict[str, str] = {}
+        with open(self.path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                try:
+                    entry = loads(line)
+                    key = job_key(entry['target'], entry['module'])
+                    state = entry['state']
+                except (ValueError, KeyError, TypeError):
+                    # Línea truncada por una caída: se ignora
+                    continue
+                if state == STATE_DONE:
+                    self._done.add(key)
+                    last_state.pop(key, None)
+                else:
+                    last_state[key] = state
+        # Lo que no terminó bien (fallido o interrumpido) se vuelve a intentar
+        for state in last_state.values():
+            self.previous[state] = self.previous.get(state, 0) + 1
+        self.previous[STATE_DONE] = len(self._done)
+        logger.info(f"Journal {self.path} replayed: {self.previous}")
+
+    def is_done(self, target: str, module: str) -> bool:
+        return job_key(target, module) in self._done
+
+    def record(self, target: str, module: str, state: str,
+               result: Optional[str] = None, error: Optional[str] = None):
+        entry = {'ts': round(time.time(), 3), 'target': target, 'module': module, 'state': state}
+        if result is not None:
+            entry['result'] = result
+        if error is not None:
+            entry['error'] = error
+        line = dumps(entry).decode('utf-8') + '\n'
+        with self._lock:
+            if not self._file.closed:
+                self._file.write(line)
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __enter__(self) -> 'JobJournal':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,207 @@
+# src/corrosive_rage/core/pipeline.py
+import asyncio
+import configparser
+import ipaddress
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .registry import ModuleRegistry, get_registry
+from .subdomains import normalize_hostname
+from .tracing import module_scope
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_DEPTH = 2
+DEFAULT_MAX_RUNS = 100
+DEFAULT_CONCURRENCY = 8
+
+# Nombre de "módulo" de los documentos generados por el pipeline
+PIPELINE_MODULE = 'pipeline'
+
+
+class Entity(NamedTuple):
+    type: str
+    value: str
+
+
+def normalize_entity(entity_type: str, value: Any) -> Optional[str]:
+    """
+    Forma canónica de una entidad, para deduplicar entre ramas
+    (mayúsculas, puntos finales, IDN, IPs con ceros...). None si no es válida.
+    """
+    if not isinstance(value, str):
+        return None
+    value = value.strip()
+    if not value:
+        return None
+    if entity_type in ('domain', 'hostname'):
+        return normalize_hostname(value)
+    if entity_type == 'email':
+        local, at, host = value.rpartition('@')
+        host = normalize_hostname(host) if at else None
+        return f"{local.lower()}@{host}" if local and host else None
+    if entity_type == 'ip':
+        try:
+            return str(ipaddress.ip_address(value))
+        except ValueError:
+            return None
+    return value
+
+
+class _PipelineRun:
+    """Estado de una ejecución del pipeline para una semilla concreta."""
+    def __init__(self, pipeline: 'Pipeline', config: configparser.ConfigParser):
+        self.pipeline = pipeline
+        self.config = config
+        self.semaphore = asyncio.Semaphore(pipeline.concurrency)
+        self.pending: Set[asyncio.Task] = set()
+        # entidad -> profundidad y quién la descubrió
+        self.entities: Dict[Entity, Dict[str, Any]] = {}
+        self.scheduled: Set[Tuple[str, Entity]] = set()
+        self.runs: List[Dict[str, Any]] = []
+        self.skipped = 0
+
+    def discover(self, entity_type: str, raw_value: Any, depth: int,
+                 source: Optional[Tuple[str, Entity]] = None) -> Optional[Entity]:
+        """Registra una entidad y, si es nueva y cabe en la profundidad, la expande."""
+        value = normalize_entity(entity_type, raw_value)
+        if value is None:
+            return None
+        entity = Entity(entity_type, value)
+        found_by = {'module': source[0], 'type': source[1].type, 'value': source[1].value} if source else None
+
+        known = self.entities.get(entity)
+        if known is not None:
+            if found_by and found_by not in known['found_by']:
+                known['found_by'].append(found_by)
+            return entity
+
+        self.entities[entity] = {'depth': depth, 'found_by': [found_by] if found_by else []}
+        if depth <= self.pipeline.max_depth:
+            for module_name in self.pipeline.consumers().get(entity_type, ()):
+                self.schedule(module_name, entity, depth)
+        return entity
+
+    def schedule(self, module_name: str, entity: Entity, depth: int):
+        key = (module_name, entity)
+        if key in self.scheduled:
+            return
+        if len(self.scheduled) >= self.pipeline.max_runs:
+            self.skipped += 1
+            return
+        self.scheduled.add(key)
+        task = asyncio.ensure_future(self._run_module(module_name, entity, depth))
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+
+    async def _run_module(self, module_name: str, entity: Entity, depth: int):
+        record = {'module': module_name, 'type': entity.type, 'value': entity.value, 'depth': depth}
+        self.runs.append(record)
+        async with self.semaphore:
+            try:
+                instance = self.pipeline.registry.load(module_name)(target=entity.value, config=self.config)
+                with module_scope(module_name):
+                    await instance.arun()
+            except Exception as e:
+                logger.error(f"Pipeline step {module_name}({entity.value}) failed: {type(e).__name__}: {e}")
+                record['error'] = f"{type(e).__name__}: {e}"
+                return
+
+        record['findings'] = instance.results.to_dict()
+        try:
+            produced = list(instance.extract_entities())
+        except Exception as e:
+            logger.error(f"Could not extract entities from {module_name}({entity.value}): {e}")
+            return
+        for entity_type, value in produced:
+            self.discover(entity_type, value, depth + 1, (module_name, entity))
+
+    async def wait(self):
+        # Cada paso terminado puede programar otros nuevos: esperamos hasta
+        # que no quede ninguno pendiente
+        while self.pending:
+            await asyncio.wait(set(self.pending))
+
+
+class Pipeline:
+    """
+    Motor de reconocimiento encadenado. A partir de una entidad semilla
+    (p. ej. un dominio) ejecuta los módulos que la consumen; las entidades
+    que descubren (emails, IPs, hosts...) alimentan a su vez a los módulos
+    que declaran consumir ese tipo, formando un grafo dirigido sin ciclos:
+    cada par módulo×entidad se ejecuta una sola vez y cada entidad se
+    deduplica entre ramas. Las ramas independientes corren en paralelo con
+    como mucho 'concurrency' pasos en vuelo, hasta 'max_depth' saltos desde
+    la semilla y 'max_runs' pasos en total.
+    """
+    def __init__(self, registry: Optional[ModuleRegistry] = None,
+                 max_depth: int = DEFAULT_MAX_DEPTH,
+                 max_runs: int = DEFAULT_MAX_RUNS,
+                 concurrency: int = DEFAULT_CONCURRENCY):
+        self.registry = registry or get_registry()
+        self.max_depth = max(0, max_depth)
+        self.max_runs = max(1, max_runs)
+        self.concurrency = max(1, concurrency)
+        self._consumers: Optional[Dict[str, List[str]]] = None
+
+    def consumers(self) -> Dict[str, List[str]]:
+        """Tipo de entidad -> módulos que la consumen (se calcula una vez)."""
+        if self._consumers is None:
+            consumers: Dict[str, List[str]] = {}
+            for name in self.registry.names():
+                try:
+                    module_class = self.registry.load(name)
+                except Exception as e:
+                    # Un módulo sin sus dependencias simplemente no participa
+                    logger.warning(f"Module {name} left out of the pipeline: {e}")
+                    continue
+                for entity_type in getattr(module_class, 'consumes', ()):
+                    consumers.setdefault(entity_type, []).append(name)
+            self._consumers = consumers
+        return self._consumers
+
+    def seed_type(self, module_names: Iterable[str]) -> str:
+        """Tipo de la entidad semilla: lo que consume el primer módulo que declare algo."""
+        for name in module_names:
+            consumes = getattr(self.registry.load(name), 'consumes', ())
+            if consumes:
+                return consumes[0]
+        raise ValueError(f"None of the modules {', '.join(module_names)} declares what it consumes")
+
+    async def arun(self, target: str, config: configparser.ConfigParser,
+                   seed_modules: Iterable[str], seed_type: Optional[str] = None) -> Dict[str, Any]:
+        seed_modules = list(seed_modules)
+        seed_type = seed_type or self.seed_type(seed_modules)
+        state = _PipelineRun(self, config)
+
+        # La semilla solo la procesan los módulos pedidos; a partir de ahí
+        # entran en juego todos los consumidores de cada tipo
+        seed_value = normalize_entity(seed_type, target) or target
+        seed = Entity(seed_type, seed_value)
+        state.entities[seed] = {'depth': 0, 'found_by': []}
+        for module_name in seed_modules:
+            state.schedule(module_name, seed, 0)
+        await state.wait()
+
+        if state.skipped:
+            logger.warning(f"Pipeline reached max_runs={self.max_runs}: {state.skipped} steps not run.")
+
+        return {
+            'target': target,
+            'module': PIPELINE_MODULE,
+            'modules': seed_modules,
+            'timestamp': datetime.now().isoformat(),
+            'max_depth': self.max_depth,
+            'entities': [
+                {'type': entity.type, 'value': entity.value, **info}
+                for entity, info in state.entities.items()
+            ],
+            'runs': state.runs,
+            'skipped_runs': state.skipped,
+        }
+
+    def run(self, target: str, config: configparser.ConfigParser,
+            seed_modules: Iterable[str], seed_type: Optional[str] = None) -> Dict[str, Any]:
+        """Versión síncrona de arun(), con su propio bucle de eventos."""
+        return asyncio.run(self.arun(target, config, seed_modules, seed_type))
@@ -0,0 +1,191 @@
+# src/corrosive_rage/core/ratelimit.py
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+import configparser
+
+logger = logging.getLogger(__name__)
+
+# Cabeceras de las que se extrae la clave de API para los límites por clave
+API_KEY_HEADERS = ('hibp-api-key', 'x-api-key', 'authorization')
+
+
+class RateLimitRule(NamedTuple):
+    """
+    Límite de un proveedor: 'rate' peticiones cada 'period' segundos, con
+    ráfagas de hasta 'burst' y como mucho 'max_in_flight' peticiones a la vez.
+    Si 'per_key' es True, cada clave de API tiene su propio cupo.
+    """
+    rate: float
+    period: float
+    burst: int = 1
+    max_in_flight: Optional[int] = None
+    per_key: bool = False
+
+
+# Límites conocidos de los proveedores. Con burst + rate <= cuota publicada
+# ninguna ventana de 'period' segundos llega a superar el límite real.
+DEFAULT_RULES: Dict[str, RateLimitRule] = {
+    'ip-api.com': RateLimitRule(rate=40, period=60, burst=5, max_in_flight=4),
+    # Endpoint /batch de ip-api (hasta 100 IPs por petición): cupo propio de 15/min
+    'batch.ip-api.com': RateLimitRule(rate=12, period=60, burst=2, max_in_flight=1),
+    'haveibeenpwned.com': RateLimitRule(rate=9, period=60, burst=1, max_in_flight=1, per_key=True),
+    'crt.sh': RateLimitRule(rate=30, period=60, burst=2, max_in_flight=2),
+    'api.shodan.io': RateLimitRule(rate=1, period=1, burst=1, max_in_flight=1, per_key=True),
+}
+
+
+def parse_rule(value: str) -> RateLimitRule:
+    """
+    Interpreta una regla de config.ini con el formato:
+        <peticiones>/<segundos>[, burst=<n>][, max_in_flight=<n>][, per_key]
+    """
+    parts = [p.strip() for p in value.split(',') if p.strip()]
+    if not parts:
+        raise ValueError("empty rate limit rule")
+    rate, period = parts[0].split('/')
+    options = {}
+    per_key = False
+    for part in parts[1:]:
+        if part == 'per_key':
+            per_key = True
+            continue
+        name, _, raw = part.partition('=')
+        if name.strip() not in ('burst', 'max_in_flight'):
+            raise ValueError(f"unknown option '{name.strip()}'")
+        options[name.strip()] = int(raw)
+    return RateLimitRule(rate=float(rate), period=float(period), per_key=per_key, **options)
+
+
+class TokenBucket:
+    """Cubo de tokens thread-safe: acquire() espera hasta que haya un token libre."""
+    def __init__(self, rate: float, period: float, capacity: int = 1):
+        self.fill_rate = rate / period
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Consume un token, durmiendo lo necesario. Devuelve el tiempo esperado."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.fill_rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.fill_rate
+            time.sleep(delay)
+            waited += delay
+
+
+class RateLimiter:
+    """
+    Registro declarativo de límites por host (y opcionalmente por clave de API).
+    Cada petición saliente pasa por limit(), que aplica el cubo de tokens y el
+    máximo de peticiones simultáneas del proveedor.
+    """
+    def __init__(self, rules: Optional[Dict[str, RateLimitRule]] = None):
+        self.rules = dict(DEFAULT_RULES)
+        self.rules.update(rules or {})
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        self._semaphores: Dict[Tuple[str, str], threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: configparser.ConfigParser) -> 'RateLimiter':
+        """Construye el registro con las reglas de la sección [ratelimit] de config.ini."""
+        rules = {}
+        if config.has_section('ratelimit'):
+            for host, value in config.items('ratelimit'):
+                try:
+                    rules[host.lower()] = parse_rule(value)
+                except ValueError as e:
+                    logger.warning(f"Invalid rate limit rule for {host} ('{value}'): {e}")
+        return cls(rules)
+
+    def rule_for(self, host: str) -> Optional[Tuple[str, RateLimitRule]]:
+        """
+        Devuelve (host de la regla, regla). Si el host no tiene regla propia se
+        prueba con el dominio padre (api.x.com -> x.com), que comparte su cupo.
+        """
+        host = host.lower()
+        while host:
+            if host in self.rules:
+                return host, self.rules[host]
+            _, _, host = host.partition('.')
+        return None
+
+    def _slot(self, host: str, rule: RateLimitRule, api_key: Optional[str]):
+        key_id = ''
+        if rule.per_key and api_key:
+            key_id = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        slot = (host, key_id)
+        with self._lock:
+            if slot not in self._buckets:
+                self._buckets[slot] = TokenBucket(rule.rate, rule.period, rule.burst)
+                if rule.max_in_flight:
+                    self._semaphores[slot] = threading.BoundedSemaphore(rule.max_in_flight)
+            return self._buckets[slot], self._semaphores.get(slot)
+
+    @contextmanager
+    def limit(self, host: str, api_key: Optional[str] = None) -> Iterator[None]:
+        """
+        Bloquea hasta que la petición a 'host' respete el cupo y el máximo de
+        peticiones en vuelo. Los hosts sin regla pasan sin espera.
+        """
+        match = self.rule_for(host)
+        if match is None:
+            yield
+            return
+        rule_host, rule = match
+        bucket, semaphore = self._slot(rule_host, rule, api_key)
+        if semaphore is not None:
+            semaphore.acquire()
+        try:
+            waited = bucket.acquire()
+            if waited:
+                logger.debug(f"Rate limit for {host}: waited {waited:.2f}s.")
+            yield
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+
+def api_key_from_headers(headers: Optional[Dict[str, str]]) -> Optional[str]:
+    """Extrae la clave de API de las cabeceras conocidas, si la hay."""
+    if not headers:
+        return None
+    lowered = {k.lower(): v for k, v in headers.items()}
+    for name in API_KEY_HEADERS:
+        if lowered.get(name):
+            return lowered[name]
+    return None
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def configure_rate_limits(config: configparser.ConfigParser) -> RateLimiter:
+    """Sustituye el registro global por uno construido desde la configuración."""
+    global _limiter
+    with _limiter_lock:
+        _limiter = RateLimiter.from_config(config)
+        return _limiter
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Devuelve el registro global, con los límites por defecto si no se configuró."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
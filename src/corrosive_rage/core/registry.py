@@ -0,0 +1,135 @@
+# src/corrosive_rage/core/registry.py
+import importlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Type
+
+logger = logging.getLogger(__name__)
+
+# Grupo de entry points en el que los paquetes de terceros registran módulos:
+#
+#   [project.entry-points."corrosive_rage.modules"]
+#   social_recon = "mi_paquete.social:SocialReconModule"
+ENTRY_POINT_GROUP = 'corrosive_rage.modules'
+
+# Módulos incluidos: nombre -> (ruta 'paquete.modulo:Clase', alias cortos)
+BUILTIN_MODULES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    'domain_recon': ('corrosive_rage.modules.domain_recon:DomainReconModule', ('domain',)),
+    'ip_recon': ('corrosive_rage.modules.ip_recon:IpReconModule', ('ip',)),
+    'email_recon': ('corrosive_rage.modules.email_recon:EmailReconModule', ('email',)),
+    'username_recon': ('corrosive_rage.modules.username_recon:UsernameReconModule', ('username',)),
+    'dork_recon': ('corrosive_rage.modules.dork_recon:DorkReconModule', ('dork',)),
+    'breach_recon': ('corrosive_rage.modules.breach_recon:BreachReconModule', ('breach',)),
+    'company_recon': ('corrosive_rage.modules.company_recon:CompanyReconModule', ('company',)),
+    'metadata_recon': ('corrosive_rage.modules.metadata_recon:MetadataReconModule', ('metadata',)),
+    'phone_recon': ('corrosive_rage.modules.phone_recon:PhoneReconModule', ('phone',)),
+}
+
+
+@dataclass
+class ModuleSpec:
+    """Descripción de un módulo registrado. La clase solo se importa al cargarlo."""
+    name: str
+    path: str
+    aliases: Tuple[str, ...] = ()
+    source: str = 'builtin'
+    _class: Optional[Type] = field(default=None, repr=False)
+
+
+class ModuleRegistry:
+    """
+    Registro único de módulos de reconocimiento. Conoce los módulos por su
+    nombre y su ruta, sin importarlos: cada módulo (y con él shodan, whois,
+    bs4...) solo se importa la primera vez que se carga para ejecutarlo.
+    Los módulos de terceros se descubren en el grupo de entry points
+    'corrosive_rage.modules' la primera vez que se consulta el registro.
+    """
+    def __init__(self, builtins: Optional[Dict[str, Tuple[str, Tuple[str, ...]]]] = None,
+                 entry_point_group: Optional[str] = ENTRY_POINT_GROUP):
+        self._specs: Dict[str, ModuleSpec] = {}
+        self._aliases: Dict[str, str] = {}
+        self._entry_point_group = entry_point_group
+        self._discovered = entry_point_group is None
+        self._lock = threading.Lock()
+        for name, (path, aliases) in (BUILTIN_MODULES if builtins is None else builtins).items():
+            self.register(name, path, aliases)
+
+    def register(self, name: str, path: str, aliases: Tuple[str, ...] = (), source: str = 'builtin'):
+        """Registra (o sustituye) un módulo a partir de su ruta 'paquete.modulo:Clase'."""
+        name = name.lower()
+        self._specs[name] = ModuleSpec(name=name, path=path, aliases=tuple(aliases), source=source)
+        for alias in aliases:
+            self._aliases[alias.lower()] = name
+
+    def _discover(self):
+        with self._lock:
+            if self._discovered:
+                return
+            self._discovered = True
+            try:
+                from importlib.metadata import entry_points
+                eps = entry_points()
+                group = eps.select(group=self._entry_point_group) if hasattr(eps, 'select') \
+                    else eps.get(self._entry_point_group, ())
+            except Exception as e:
+                logger.warning(f"Could not read entry points for {self._entry_point_group}: {e}")
+                return
+            for ep in group:
+                if ep.name.lower() in self._specs and self._specs[ep.name.lower()].source == 'builtin':
+                    logger.warning(f"Entry point {ep.name} ignored: it shadows a built-in module.")
+                    continue
+                self.register(ep.name, ep.value, source=getattr(ep.dist, 'name', None) or 'entry_point')
+                logger.debug(f"Discovered module {ep.name} -> {ep.value}")
+
+    def names(self) -> List[str]:
+        """Nombres de todos los módulos disponibles (incluidos los de terceros)."""
+        self._discover()
+        return list(self._specs)
+
+    def aliases(self) -> Dict[str, str]:
+        """Alias cortos -> nombre del módulo."""
+        self._discover()
+        return dict(self._aliases)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Devuelve el nombre canónico de un módulo o alias, o None si no existe."""
+        self._discover()
+        name = name.strip().lower()
+        if name in self._specs:
+            return name
+        return self._aliases.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return self.resolve(name) is not None
+
+    def spec(self, name: str) -> ModuleSpec:
+        canonical = self.resolve(name)
+        if canonical is None:
+            raise KeyError(name)
+        return self._specs[canonical]
+
+    def load(self, name: str) -> Type:
+        """
+        Importa y devuelve la clase del módulo. Lanza KeyError si no está
+        registrado e ImportError si faltan sus dependencias.
+        """
+        spec = self.spec(name)
+        if spec._class is None:
+            module_path, _, class_name = spec.path.partition(':')
+            module = importlib.import_module(module_path)
+            spec._class = getattr(module, class_name)
+        return spec._class
+
+
+_registry: Optional[ModuleRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_registry() -> ModuleRegistry:
+    """Devuelve el registro global de módulos."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModuleRegistry()
+        return _registry
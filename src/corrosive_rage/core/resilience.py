@@ -0,0 +1,186 @@
+# src/corrosive_rage/core/resilience.py
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, NamedTuple, Optional, Tuple
+
+import configparser
+
+logger = logging.getLogger(__name__)
+
+# Estados del circuit breaker
+STATE_CLOSED = 'closed'        # funcionando con normalidad
+STATE_OPEN = 'open'            # host caído: se falla rápido sin tocar la red
+STATE_HALF_OPEN = 'half_open'  # se deja pasar una petición de prueba
+
+
+class RetryPolicy(NamedTuple):
+    """Reintentos con backoff exponencial y jitter completo."""
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_max: float = 30.0
+    retry_statuses: Tuple[int, ...] = (429, 500, 502, 503, 504)
+
+    @classmethod
+    def from_config(cls, config: configparser.ConfigParser) -> 'RetryPolicy':
+        return cls(
+            max_retries=config.getint('HTTP', 'max_retries', fallback=3),
+            backoff_base=config.getfloat('HTTP', 'backoff_base', fallback=0.5),
+            backoff_max=config.getfloat('HTTP', 'backoff_max', fallback=30.0),
+        )
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Segundos a esperar antes del reintento número 'attempt' (desde 0).
+        Si el servidor envió Retry-After, se respeta (hasta backoff_max).
+        """
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Interpreta la cabecera Retry-After (segundos o fecha HTTP)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker de un host. Tras 'failure_threshold' fallos seguidos se
+    abre y rechaza peticiones durante 'reset_timeout' segundos; después deja
+    pasar una de prueba (half_open) que lo cierra o lo vuelve a abrir.
+    """
+    def __init__(self, host: str, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.total_failures = 0
+        self.rejected = 0
+        self.opened_at: Optional[float] = None
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Indica si se puede enviar una petición al host ahora mismo."""
+        with self._lock:
+            if self.state == STATE_OPEN:
+                if time.monotonic() - self.opened_at >= self.reset_timeout:
+                    self.state = STATE_HALF_OPEN
+                    self._probe_in_flight = False
+                else:
+                    self.rejected += 1
+                    return False
+            if self.state == STATE_HALF_OPEN:
+                if self._probe_in_flight:
+                    self.rejected += 1
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            if self.state != STATE_CLOSED:
+                logger.info(f"Circuit breaker for {self.host} closed again.")
+            self.state = STATE_CLOSED
+            self.failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.total_failures += 1
+            self._probe_in_flight = False
+            if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != STATE_OPEN:
+                    logger.warning(f"Circuit breaker for {self.host} opened after {self.failures} failures.")
+                self.state = STATE_OPEN
+                self.opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'total_failures': self.total_failures,
+                'rejected': self.rejected,
+            }
+
+
+class BreakerRegistry:
+    """Circuit breakers por host, compartidos por todos los trabajos del proceso."""
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: configparser.ConfigParser) -> 'BreakerRegistry':
+        return cls(
+            failure_threshold=config.getint('HTTP', 'breaker_threshold', fallback=5),
+            reset_timeout=config.getfloat('HTTP', 'breaker_reset', fallback=60.0),
+        )
+
+    def get(self, host: str) -> CircuitBreaker:
+        host = host.lower()
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(host, self.failure_threshold, self.reset_timeout)
+            return self._breakers[host]
+
+    def summary(self) -> Dict[str, Dict[str, object]]:
+        """Estado de cada breaker que haya registrado algún fallo o rechazo."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        result = {}
+        for breaker in breakers:
+            snap = breaker.snapshot()
+            if snap['total_failures'] or snap['rejected'] or snap['state'] != STATE_CLOSED:
+                result[breaker.host] = snap
+        return result
+
+
+_retry_policy = RetryPolicy()
+_breakers = BreakerRegistry()
+
+
+def configure_resilience(config: configparser.ConfigParser):
+    """Carga la política de reintentos y los umbrales de los breakers de [HTTP]."""
+    global _retry_policy, _breakers
+    _retry_policy = RetryPolicy.from_config(config)
+    _breakers = BreakerRegistry.from_config(config)
+
+
+def get_retry_policy() -> RetryPolicy:
+    return _retry_policy
+
+
+def get_breakers() -> BreakerRegistry:
+    return _breakers
+
+
+def format_breaker_summary(summary: Dict[str, Dict[str, object]]) -> str:
+    """Texto legible del estado de los breakers para el resumen de ejecución."""
+    lines = []
+    for host, snap in sorted(summary.items()):
+        lines.append(
+            f"    - {host}: {snap['state']} "
+            f"({snap['total_failures']} fallos, {snap['rejected']} peticiones rechazadas)"
+        )
+    return "\n".join(lines)
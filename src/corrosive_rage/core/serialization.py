@@ -0,0 +1,216 @@
+# src/corrosive_rage/core/serialization.py
+import dataclasses
+import datetime
+import enum
+import gzip
+import io
+import json
+import logging
+import math
+import os
+import re
+from pathlib import Path
+from typing import Any, Union
+
+logger = logging.getLogger(__name__)
+
+# orjson (opcional) serializa varias veces más rápido que json; si no está
+# instalado usamos la librería estándar con la misma salida, byte a byte
+# (los digests de blobs y diferencias no dependen de qué esté instalado)
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependencia opcional
+    orjson = None
+
+# MessagePack (opcional): formato binario compacto para los resultados
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - dependencia opcional
+    msgpack = None
+
+FORMAT_JSON = 'json'
+FORMAT_MSGPACK = 'msgpack'
+
+EXTENSIONS = {FORMAT_JSON: '.json', FORMAT_MSGPACK: '.msgpack'}
+
+
+def _default(obj: Any) -> Any:
+    # Lo que orjson ya serializa por su cuenta se convierte igual que él:
+    # fechas en RFC 3339 (isoformat), enums por su valor, dataclasses como dict
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+    # Sets, etc.: listas; el resto (otras fechas de WHOIS...) como str()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    # Resultados y hallazgos de core.base (ModuleResults, Finding)
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    return str(obj)
+
+
+# Sin orjson, los float se sustituyen por un marcador y luego por su texto
+# con el formato de orjson (json.dumps no permite cambiar el de los float)
+_FLOAT_MARK = '\x00\x01f'
+_FLOAT_MARKED = re.compile(r'"\\u0000\\u0001f([^"]*)"')
+
+
+def _float_text(value: float) -> str:
+    """
+    Un float como lo escribe orjson: los mismos dígitos que repr(), pero
+    en notación fija desde 1e-5 y el exponente sin '+' ni ceros (1e20, 1e-7);
+    NaN e infinito como null.
+    """
+    if math.isnan(value) or math.isinf(value):
+        return 'null'
+    text = repr(value)
+    if 'e' not in text:
+        return text
+    mantissa, exponent = text.split('e')
+    exponent = int(exponent)
+    if exponent == -5:
+        sign, digits = ('-', mantissa[1:]) if mantissa.startswith('-') else ('', mantissa)
+        return f"{sign}0.0000{digits.replace('.', '')}"
+    return f"{mantissa}e{exponent}"
+
+
+def _mark_floats(obj: Any) -> Any:
+    if isinstance(obj, float):
+        return _FLOAT_MARK + _float_text(obj)
+    if isinstance(obj, dict):
+        return {key: _mark_floats(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_mark_floats(item) for item in obj]
+    return obj
+
+
+def _json_default(obj: Any) -> Any:
+    return _mark_floats(_default(obj))
+
+
+def dumps(obj: Any, pretty: bool = False, sort_keys: bool = False) -> bytes:
+    """
+    Serializa a JSON en UTF-8. Con 'pretty' se indenta para lectura humana
+    (2 espacios). Con 'sort_keys' la salida es canónica (misma entrada,
+    mismos bytes), con orjson o sin él.
+    """
+    # Los results/*.json se escribían antes con indent=4. orjson solo sabe
+    # indentar a 2, así que se usan 2 espacios también sin él: así el mismo
+    # resultado da los mismos bytes con o sin orjson (blobs, diferencias)
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0) \
+            | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        return orjson.dumps(obj, default=_default, option=option)
+    text = json.dumps(_mark_floats(obj), ensure_ascii=False, default=_json_default, sort_keys=sort_keys,
+                      **({'indent': 2} if pretty else {'separators': (',', ':')}))
+    return _FLOAT_MARKED.sub(r'\1', text).encode('utf-8')
+
+
+def dumps_str(obj: Any, pretty: bool = False) -> str:
+    """Como dumps(), pero devuelve texto (para stdout o la GUI)."""
+    return dumps(obj, pretty=pretty).decode('utf-8')
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def packb(obj: Any) -> bytes:
+    """Serializa a MessagePack. Lanza RuntimeError si msgpack no está instalado."""
+    if msgpack is None:
+        raise RuntimeError("MessagePack format requires the 'msgpack' package")
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+def unpackb(data: bytes) -> Any:
+    if msgpack is None:
+        raise RuntimeError("MessagePack format requires the 'msgpack' package")
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def encode(obj: Any, fmt: str = FORMAT_JSON, pretty: bool = False) -> bytes:
+    """Serializa en el formato de resultados indicado ('json' o 'msgpack')."""
+    if fmt == FORMAT_MSGPACK:
+        return packb(obj)
+    if fmt == FORMAT_JSON:
+        return dumps(obj, pretty=pretty)
+    raise ValueError(f"Unknown result format: {fmt}")
+
+
+_SEGMENT_LOCATION = re.compile(r'^(?P<path>.+\.ndjson(?:\.gz|\.zst)?):(?P<line>\d+)$')
+
+
+def _read_segment_line(path: Path, line_no: int) -> bytes:
+    """Línea 'line_no' (desde 1) de un segmento NDJSON, comprimido o no."""
+    if path.suffix == '.gz':
+        stream = gzip.open(path, 'rb')
+    elif path.suffix == '.zst':
+        import zstandard
+        stream = io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True))
+    else:
+        stream = open(path, 'rb')
+    with stream:
+        for number, line in enumerate(stream, start=1):
+            if number == line_no:
+                return line
+    raise ValueError(f"{path} has no line {line_no}")
+
+
+def result_directory(location: Union[str, Path]) -> Path:
+    """Carpeta de un resultado (la del fichero o la del segmento NDJSON)."""
+    match = _SEGMENT_LOCATION.match(str(location))
+    return Path(match['path']).parent if match else Path(location).parent
+
+
+def relative_location(location: Union[str, Path], directory: Union[str, Path]) -> str:
+    """
+    Ubicación de un resultado relativa a 'directory' (la carpeta results),
+    para que los enlaces entre resultados sigan valiendo si se mueve o copia.
+    """
+    try:
+        return os.path.relpath(str(location), str(directory))
+    except ValueError:
+        # Otra unidad (Windows): se queda absoluta
+        return str(location)
+
+
+def resolve_location(location: str, directory: Union[str, Path]) -> str:
+    """Inversa de relative_location(); las rutas absolutas (de antes) se devuelven tal cual."""
+    return os.path.normpath(os.path.join(str(directory), location))
+
+
+def read_result(path: Union[str, Path]) -> Any:
+    """
+    Lee un documento tal y como está guardado: un fichero JSON o MessagePack
+    (según su extensión) o una línea de un segmento NDJSON ('<segmento>:<línea>').
+    Las referencias al almacén de blobs (core.blobs) se resuelven.
+    """
+    match = _SEGMENT_LOCATION.match(str(path))
+    directory = result_directory(path)
+    if match:
+        document = loads(_read_segment_line(Path(match['path']), int(match['line'])))
+    else:
+        path = Path(path)
+        data = path.read_bytes()
+        document = unpackb(data) if path.suffix == EXTENSIONS[FORMAT_MSGPACK] else loads(data)
+    if isinstance(document, dict) and 'blobs' in document:
+        from .blobs import get_blob_store
+        document = get_blob_store(directory).unpack(document)
+    return document
+
+
+def load_result(path: Union[str, Path]) -> Any:
+    """
+    Lee un resultado completo. Si lo guardado es solo la diferencia con una
+    ejecución anterior (core.diffs), se reconstruye a partir de su base.
+    """
+    document = read_result(path)
+    from .diffs import is_delta, rehydrate
+    if is_delta(document):
+        return rehydrate(document, result_directory(path))
+    return document
@@ -0,0 +1,133 @@
+# src/corrosive_rage/core/session.py
+import logging
+import threading
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import configparser
+import requests
+
+from .tracing import TimedHTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Valores por defecto del pool si config.ini no dice nada
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 10
+
+# Tamaños de pool por host para los proveedores que más usamos en batch
+DEFAULT_HOST_POOL_SIZES = {
+    'ip-api.com': 4,
+    'crt.sh': 4,
+    'haveibeenpwned.com': 2,
+    'www.gravatar.com': 8,
+}
+
+
+class SessionManager:
+    """
+    Gestiona una única requests.Session compartida entre hilos, con
+    adaptadores (pools de conexiones keep-alive) configurables por host.
+    """
+    def __init__(self,
+                 pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 pool_block: bool = False,
+                 keep_alive: bool = True,
+                 host_pool_sizes: Optional[Dict[str, int]] = None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.host_pool_sizes = dict(DEFAULT_HOST_POOL_SIZES)
+        self.host_pool_sizes.update(host_pool_sizes or {})
+        self._session: Optional[requests.Session] = None
+        self._mounted_hosts = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: configparser.ConfigParser) -> 'SessionManager':
+        """
+        Construye el gestor a partir de las secciones [HTTP] y [HTTP.pools]
+        de config.ini. Las opciones ausentes usan los valores por defecto.
+        """
+        host_pool_sizes = {}
+        if config.has_section('HTTP.pools'):
+            for host, size in config.items('HTTP.pools'):
+                try:
+                    host_pool_sizes[host.lower()] = int(size)
+                except ValueError:
+                    logger.warning(f"Invalid pool size for host {host}: {size}")
+
+        return cls(
+            pool_connections=config.getint('HTTP', 'pool_connections', fallback=DEFAULT_POOL_CONNECTIONS),
+            pool_maxsize=config.getint('HTTP', 'pool_maxsize', fallback=DEFAULT_POOL_MAXSIZE),
+            pool_block=config.getboolean('HTTP', 'pool_block', fallback=False),
+            keep_alive=config.getboolean('HTTP', 'keep_alive', fallback=True),
+            host_pool_sizes=host_pool_sizes,
+        )
+
+    def _build_adapter(self, pool_maxsize: int) -> TimedHTTPAdapter:
+        # El adaptador anota los tiempos de DNS/conexión/TLS en la traza activa
+        return TimedHTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=self.pool_block,
+        )
+
+    def _build_session(self) -> requests.Session:
+        session = requests.Session()
+        adapter = self._build_adapter(self.pool_maxsize)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def get_session(self, url: str) -> requests.Session:
+        """
+        Devuelve la sesión compartida, montando antes (una sola vez) el
+        adaptador específico del host de la URL si tiene tamaño de pool propio.
+        """
+        host = (urlsplit(url).hostname or '').lower()
+        with self._lock:
+            if self._session is None:
+                self._session = self._build_session()
+            if host in self.host_pool_sizes and host not in self._mounted_hosts:
+                adapter = self._build_adapter(self.host_pool_sizes[host])
+                self._session.mount(f'http://{host}/', adapter)
+                self._session.mount(f'https://{host}/', adapter)
+                self._mounted_hosts.add(host)
+                logger.debug(f"Mounted pool of size {self.host_pool_sizes[host]} for host {host}.")
+            return self._session
+
+    def close(self):
+        """Cierra todas las conexiones abiertas del pool."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+                self._mounted_hosts.clear()
+
+
+_manager: Optional[SessionManager] = None
+_manager_lock = threading.Lock()
+
+
+def configure_sessions(config: configparser.ConfigParser) -> SessionManager:
+    """Sustituye el gestor global por uno construido desde la configuración."""
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.close()
+        _manager = SessionManager.from_config(config)
+        return _manager
+
+
+def get_session_manager() -> SessionManager:
+    """Devuelve el gestor global, creándolo con valores por defecto si hace falta."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = SessionManager()
+        return _manager
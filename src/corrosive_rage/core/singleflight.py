@@ -0,0 +1,105 @@
+# src/corrosive_rage/core/singleflight.py
+import asyncio
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normaliza una URL para compararla con otras: esquema y host en
+    minúsculas, sin puerto por defecto, parámetros ordenados y sin fragmento.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{parts.port}'
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or '/', query, ''))
+
+
+def request_key(method: str, url: str, api_key: Optional[str] = None) -> Tuple[str, ...]:
+    """Clave single-flight de una petición HTTP (la clave de API va resumida)."""
+    key_id = hashlib.sha256(api_key.encode()).hexdigest()[:16] if api_key else ''
+    return ('http', method.upper(), normalize_url(url), key_id)
+
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Agrupa llamadas idénticas concurrentes: la primera ('líder') ejecuta la
+    función y el resto espera y recibe el mismo resultado (o la misma
+    excepción). Funciona entre hilos (do) y entre corrutinas (ado).
+    """
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._async_calls: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[..., Any], *args, **kwargs) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    async def ado(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        future = self._async_calls.get(slot)
+        if future is not None:
+            return await asyncio.shield(future)
+
+        future = loop.create_future()
+        self._async_calls[slot] = future
+        try:
+            result = await func(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Evita el aviso "exception was never retrieved" si nadie más esperaba
+            future.exception()
+            raise
+        finally:
+            self._async_calls.pop(slot, None)
+
+
+_group = SingleFlight()
+
+
+def get_singleflight() -> SingleFlight:
+    """Grupo single-flight compartido por todo el proceso."""
+    return _group
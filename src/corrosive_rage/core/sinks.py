@@ -0,0 +1,200 @@
+# src/corrosive_rage/core/sinks.py
+import gzip
+import logging
+import os
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Optional
+
+import configparser
+
+from .blobs import DEFAULT_MIN_BLOB_BYTES, BlobStore, get_blob_store
+from .serialization import EXTENSIONS, FORMAT_JSON, dumps, encode
+
+logger = logging.getLogger(__name__)
+
+SINK_FILE = 'file'
+SINK_NDJSON = 'ndjson'
+
+COMPRESSION_NONE = 'none'
+COMPRESSION_GZIP = 'gzip'
+COMPRESSION_ZSTD = 'zstd'
+
+DEFAULT_SEGMENT_SIZE_MB = 256
+
+_EXTENSIONS = {COMPRESSION_NONE: '', COMPRESSION_GZIP: '.gz', COMPRESSION_ZSTD: '.zst'}
+
+
+def safe_target_name(target: str) -> str:
+    return "".join(c for c in target if c.isalnum() or c in ('.', '_')).rstrip()
+
+
+class ResultSink(ABC):
+    """
+    Destino de los documentos de resultados. write() devuelve dónde quedó
+    guardado. Con un almacén de blobs, los datos grandes de los hallazgos se
+    guardan en él y el documento solo lleva sus referencias.
+    """
+    blobs: Optional[BlobStore] = None
+
+    @abstractmethod
+    def write(self, document: Dict[str, Any]) -> str:
+        pass
+
+    def prepare(self, document: Dict[str, Any]) -> Dict[str, Any]:
+        return self.blobs.pack(document) if self.blobs is not None else document
+
+    def close(self):
+        pass
+
+    def __enter__(self) -> 'ResultSink':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FileSink(ResultSink):
+    """
+    Un fichero por documento: JSON legible (el formato de siempre) o, con
+    fmt='msgpack', MessagePack binario y compacto (.msgpack).
+    """
+    def __init__(self, directory: Path, fmt: str = FORMAT_JSON, blobs: Optional[BlobStore] = None):
+        if fmt not in EXTENSIONS:
+            raise ValueError(f"Unknown result format: {fmt}")
+        self.directory = Path(directory)
+        self.fmt = fmt
+        self.blobs = blobs
+
+    def write(self, document: Dict[str, Any]) -> str:
+        data = encode(self.prepare(document), self.fmt, pretty=True)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stem = (f"{safe_target_name(document['target'])}_{document['module']}_"
+                f"{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+        # Dos ejecuciones en el mismo segundo no deben pisarse: la segunda
+        # puede ser una diferencia que apunta a la primera (core.diffs)
+        filename = self.directory / f"{stem}{EXTENSIONS[self.fmt]}"
+        suffix = 1
+        while True:
+            try:
+                with open(filename, 'xb') as f:
+                    f.write(data)
+                return str(filename)
+            except FileExistsError:
+                filename = self.directory / f"{stem}_{suffix}{EXTENSIONS[self.fmt]}"
+                suffix += 1
+
+
+class NDJSONSink(ResultSink):
+    """
+    Todos los documentos en segmentos NDJSON (un JSON compacto por línea),
+    opcionalmente comprimidos con gzip o zstd. Cuando un segmento supera
+    'max_segment_bytes' en disco se cierra y se abre el siguiente, así que
+    un batch de millones de objetivos produce unos pocos ficheros grandes.
+    Es seguro usarlo desde varios hilos. La ubicación devuelta es
+    '<segmento>:<línea>', y cuando write() vuelve la línea ya está en disco
+    (también con compresión), así que el diario puede darla por hecha.
+    """
+    def __init__(self, directory: Path, prefix: str = 'results',
+                 max_segment_bytes: int = DEFAULT_SEGMENT_SIZE_MB * 1024 * 1024,
+                 compression: str = COMPRESSION_NONE, blobs: Optional[BlobStore] = None):
+        if compression not in _EXTENSIONS:
+            raise ValueError(f"Unknown compression: {compression}")
+        if compression == COMPRESSION_ZSTD:
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                raise ValueError("zstd compression requires the 'zstandard' package")
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.max_segment_bytes = max(1, max_segment_bytes)
+        self.compression = compression
+        self.blobs = blobs
+        # El pid evita pisar segmentos de otro proceso lanzado en el mismo segundo
+        self._run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+        self._segment = 0
+        self._raw: Optional[BinaryIO] = None
+        self._stream: Optional[BinaryIO] = None
+        self._path: Optional[Path] = None
+        self._lines = 0
+        self._lock = threading.Lock()
+
+    def _open_segment(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._segment += 1
+        self._path = self.directory / (
+            f"{self.prefix}_{self._run_id}_{self._segment:04d}.ndjson{_EXTENSIONS[self.compression]}"
+        )
+        self._raw = open(self._path, 'wb')
+        if self.compression == COMPRESSION_GZIP:
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode='wb')
+        elif self.compression == COMPRESSION_ZSTD:
+            import zstandard
+            self._stream = zstandard.ZstdCompressor().stream_writer(self._raw, closefd=False)
+        else:
+            self._stream = self._raw
+        self._lines = 0
+        logger.debug(f"Opened result segment {self._path}")
+
+    def _close_segment(self):
+        if self._stream is not None and self._stream is not self._raw:
+            self._stream.close()
+        if self._raw is not None:
+            self._raw.close()
+        self._stream = self._raw = None
+
+    def write(self, document: Dict[str, Any]) -> str:
+        line = dumps(self.prepare(document)) + b'\n'
+        with self._lock:
+            # Con compresión, tell() del fichero cuenta los bytes ya comprimidos
+            # en disco (el compresor retiene un poco en memoria)
+            if self._raw is None or self._raw.tell() >= self.max_segment_bytes:
+                self._close_segment()
+                self._open_segment()
+            self._stream.write(line)
+            self._flush()
+            self._lines += 1
+            return f"{self._path}:{self._lines}"
+
+    def _flush(self):
+        # Vacía el compresor sin cerrar el flujo (un bloque completo que se
+        # puede descomprimir) y luego el búfer del fichero
+        if self.compression == COMPRESSION_GZIP:
+            self._stream.flush(zlib.Z_SYNC_FLUSH)
+        elif self.compression == COMPRESSION_ZSTD:
+            import zstandard
+            self._stream.flush(zstandard.FLUSH_BLOCK)
+        self._raw.flush()
+
+    def close(self):
+        with self._lock:
+            self._close_segment()
+
+
+def build_sink(config: configparser.ConfigParser, directory: Path,
+               kind: Optional[str] = None, compression: Optional[str] = None,
+               segment_size_mb: Optional[int] = None, fmt: Optional[str] = None) -> ResultSink:
+    """
+    Crea el destino de resultados según la sección [results] de config.ini;
+    los argumentos (de la línea de comandos) tienen prioridad.
+    """
+    kind = (kind or config.get('results', 'sink', fallback=SINK_FILE)).lower()
+    blobs = None
+    if config.getboolean('results', 'blobs', fallback=True):
+        blobs = get_blob_store(directory, config.getint('results', 'blob_min_bytes', fallback=DEFAULT_MIN_BLOB_BYTES))
+    if kind == SINK_FILE:
+        return FileSink(directory, fmt=(fmt or config.get('results', 'format', fallback=FORMAT_JSON)).lower(),
+                        blobs=blobs)
+    if kind == SINK_NDJSON:
+        return NDJSONSink(
+            directory,
+            max_segment_bytes=(segment_size_mb or config.getint(
+                'results', 'segment_size_mb', fallback=DEFAULT_SEGMENT_SIZE_MB)) * 1024 * 1024,
+            compression=(compression or config.get(
+                'results', 'compression', fallback=COMPRESSION_NONE)).lower(),
+            blobs=blobs,
+        )
+    raise ValueError(f"Unknown result sink: {kind}")
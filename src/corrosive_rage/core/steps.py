@@ -0,0 +1,143 @@
+# src/corrosive_rage/core/steps.py
+import configparser
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Pasos de un módulo (WHOIS, crt.sh, Shodan...) en vuelo a la vez en todo el proceso
+DEFAULT_STEP_WORKERS = 64
+# Segundos que se espera a cada paso antes de darlo por perdido
+DEFAULT_STEP_TIMEOUT = 120.0
+
+# Estado de cada paso en el resumen de run_steps()
+STATUS_OK = 'ok'
+STATUS_ERROR = 'error'
+STATUS_TIMEOUT = 'timeout'
+
+# Cada cuánto se revisan los plazos mientras ningún paso termina
+_POLL_INTERVAL = 0.5
+
+StepFindings = Optional[Iterable[Tuple[str, Any]]]
+
+
+class Step(NamedTuple):
+    """
+    Consulta independiente dentro de un módulo. 'func' devuelve (o produce
+    con yield) los hallazgos como pares (tipo, datos). Sin 'timeout' se usa
+    el de [steps] en config.ini. Los nombres no se repiten dentro de un
+    mismo run_steps().
+    """
+    name: str
+    func: Callable[[], StepFindings]
+    timeout: Optional[float] = None
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_workers = DEFAULT_STEP_WORKERS
+_default_timeout = DEFAULT_STEP_TIMEOUT
+_timeouts: Dict[str, float] = {}
+_lock = threading.Lock()
+
+
+def configure_steps(config: configparser.ConfigParser):
+    """
+    Lee la sección [steps]: 'workers', 'timeout' (por defecto para todos los
+    pasos) y, opcionalmente, un plazo por nombre de paso (whois = 60).
+    """
+    global _executor, _workers, _default_timeout
+    with _lock:
+        _timeouts.clear()
+        _workers = DEFAULT_STEP_WORKERS
+        _default_timeout = DEFAULT_STEP_TIMEOUT
+        if config.has_section('steps'):
+            for name, value in config.items('steps'):
+                if name == 'workers':
+                    _workers = max(1, int(value))
+                elif name == 'timeout':
+                    _default_timeout = float(value)
+                else:
+                    _timeouts[name] = float(value)
+        if _executor is not None:
+            _executor.shutdown(wait=False)
+            _executor = None
+
+
+def get_step_executor() -> ThreadPoolExecutor:
+    """
+    Pool de hilos de los pasos. Es distinto del de E/S (core.aio) porque
+    run() ya se ejecuta en ese pool: si los pasos esperasen hueco en él,
+    un batch que lo llenara con módulos se bloquearía a sí mismo.
+    """
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_workers, thread_name_prefix='corrosive-step')
+        return _executor
+
+
+def step_timeout(step: Step) -> float:
+    if step.timeout is not None:
+        return step.timeout
+    return _timeouts.get(step.name, _default_timeout)
+
+
+def run_steps(module, steps: Iterable[Step]) -> Dict[str, str]:
+    """
+    Ejecuta los pasos de un módulo (BaseModule) a la vez y añade los
+    hallazgos de cada uno en cuanto termina, desde el hilo que llama (así
+    el orden de los hallazgos es el de llegada y nada se añade después de
+    volver). Un paso que falla o supera su plazo no afecta a los demás; si
+    vence el plazo, lo que devuelva más tarde se descarta. El tiempo total
+    es el del paso más lento. Devuelve {paso: 'ok' | 'error' | 'timeout'}.
+    """
+    steps = list(steps)
+    executor = get_step_executor()
+    # El plazo de cada paso cuenta desde que empieza, no desde que espera hueco
+    started: Dict[str, float] = {}
+    pending: Dict[Future, Step] = {}
+    for step in steps:
+        # Cada paso con su copia del contexto (módulo en curso para las trazas)
+        ctx = contextvars.copy_context()
+        pending[executor.submit(ctx.run, _call_step, step, started)] = step
+
+    status: Dict[str, str] = {}
+    while pending:
+        now = time.monotonic()
+        deadlines = [started[step.name] + step_timeout(step)
+                     for step in pending.values() if step.name in started]
+        wait_for = min([d - now for d in deadlines] + [_POLL_INTERVAL])
+        done, _ = wait(list(pending), timeout=max(0.0, wait_for), return_when=FIRST_COMPLETED)
+
+        for future in done:
+            step = pending.pop(future)
+            try:
+                findings = future.result()
+            except Exception as e:
+                module.logger.error(f"[!] Error en el paso '{step.name}': {type(e).__name__}: {e}")
+                status[step.name] = STATUS_ERROR
+                continue
+            for finding_type, data in findings:
+                module.add_finding(finding_type, data)
+            status[step.name] = STATUS_OK
+
+        now = time.monotonic()
+        for future, step in list(pending.items()):
+            if step.name in started and now - started[step.name] >= step_timeout(step):
+                del pending[future]
+                future.cancel()
+                module.logger.warning(f"Step '{step.name}' timed out after {step_timeout(step):g}s")
+                status[step.name] = STATUS_TIMEOUT
+    return status
+
+
+def _call_step(step: Step, started: Dict[str, float]) -> List[Tuple[str, Any]]:
+    start = started[step.name] = time.monotonic()
+    # Se materializa aquí: un generador haría su trabajo en el hilo que espera
+    findings = list(step.func() or ())
+    logger.debug(f"Step {step.name} finished in {time.monotonic() - start:.2f}s ({len(findings)} findings)")
+    return findings
@@ -0,0 +1,104 @@
+# src/corrosive_rage/core/streaming.py
+import codecs
+import json
+import re
+from typing import Any, Iterable, Iterator, Union
+
+import requests
+
+# Tamaño de los bloques leídos de la red al procesar respuestas en streaming
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\r\n'
+# Lo que puede seguir a un elemento completo
+_DELIMITERS = _WHITESPACE + ',]'
+# Un número cortado al final de un bloque ('1.', '2e', '3e-') puede seguir en el siguiente
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*\Z')
+# Margen al final del búfer en el que un error de decodificación puede deberse
+# a un literal o escape cortado ('tru', '-', '\\u00')
+_TRUNCATION_SLACK = 6
+
+
+def _incomplete(error: json.JSONDecodeError, buffer: str) -> bool:
+    """Si el error se debe a que el elemento sigue en el siguiente bloque."""
+    return error.msg.startswith('Unterminated string') or error.pos >= len(buffer) - _TRUNCATION_SLACK
+
+
+def iter_json_array(chunks: Iterable[Union[bytes, str]], encoding: str = 'utf-8') -> Iterator[Any]:
+    """
+    Recorre un array JSON ('[{...}, {...}]') que llega por bloques y va
+    devolviendo cada elemento en cuanto está completo. En memoria solo se
+    mantiene el elemento en curso, no el documento entero: un elemento mal
+    formado se rechaza al llegar al error, sin esperar al resto del cuerpo.
+    """
+    text_decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    buffer = ''
+    pos = 0
+    started = False
+    # Tras un elemento hace falta ',' o ']'; tras '[' o ',' hace falta un elemento
+    expect_separator = False
+    after_comma = False
+
+    for chunk in chunks:
+        if isinstance(chunk, bytes):
+            chunk = text_decoder.decode(chunk)
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buffer):
+                break
+            char = buffer[pos]
+            if not started:
+                if char != '[':
+                    raise ValueError("Expected a JSON array")
+                started = True
+                pos += 1
+                continue
+            if expect_separator:
+                if char == ']':
+                    return
+                if char != ',':
+                    raise ValueError(f"Expected ',' or ']' in JSON array, got {char!r}")
+                expect_separator = False
+                after_comma = True
+                pos += 1
+                continue
+            if char == ']':
+                if after_comma:
+                    raise ValueError("Trailing comma in JSON array")
+                return
+            try:
+                item, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if _incomplete(e, buffer):
+                    # Elemento incompleto: hace falta el siguiente bloque
+                    break
+                raise ValueError(f"Invalid JSON array element: {e}") from None
+            if end >= len(buffer):
+                # Un número o literal al final del bloque puede continuar en el siguiente
+                break
+            if buffer[end] not in _DELIMITERS:
+                if isinstance(item, (int, float)) and not isinstance(item, bool) \
+                        and _NUMBER_TAIL.match(buffer, end):
+                    break
+                raise ValueError(f"Invalid JSON array element at {buffer[pos:end + 1]!r}")
+            pos = end
+            expect_separator = True
+            after_comma = False
+            yield item
+
+    if not started and not buffer[pos:].strip():
+        # Cuerpo vacío: lo tratamos como un array vacío
+        return
+    raise ValueError("Truncated JSON array")
+
+
+def iter_response_json_array(response: requests.Response,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """Aplica iter_json_array a una respuesta pedida con stream=True."""
+    encoding = response.encoding or 'utf-8'
+    return iter_json_array(response.iter_content(chunk_size=chunk_size), encoding=encoding)
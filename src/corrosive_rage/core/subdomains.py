@@ -0,0 +1,196 @@
+# src/corrosive_rage/core/subdomains.py
+import functools
+import logging
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Sufijos de varias etiquetas más habituales, por si no está disponible la
+# lista completa de python-whois (Public Suffix List)
+_BUILTIN_SUFFIXES = (
+    'co.uk', 'org.uk', 'ac.uk', 'gov.uk', 'me.uk', 'net.uk', 'ltd.uk', 'plc.uk',
+    'com.au', 'net.au', 'org.au', 'edu.au', 'gov.au', 'co.nz', 'org.nz', 'net.nz',
+    'com.br', 'net.br', 'org.br', 'gov.br', 'com.mx', 'org.mx', 'gob.mx', 'com.ar', 'gob.ar',
+    'com.co', 'gov.co', 'com.pe', 'gob.pe', 'com.es', 'org.es', 'nom.es', 'gob.es', 'edu.es',
+    'co.jp', 'ne.jp', 'or.jp', 'ac.jp', 'go.jp', 'com.cn', 'net.cn', 'org.cn', 'gov.cn',
+    'com.hk', 'com.tw', 'com.sg', 'co.kr', 'co.in', 'net.in', 'org.in', 'gov.in',
+    'co.za', 'org.za', 'gov.za', 'com.tr', 'gov.tr', 'com.ru', 'com.ua', 'co.il', 'org.il',
+)
+
+_PSL_PRIVATE_MARKER = '===BEGIN PRIVATE DOMAINS==='
+
+
+def normalize_hostname(name: str) -> Optional[str]:
+    """
+    Normaliza un nombre de host: minúsculas, sin espacios ni punto final y
+    con las etiquetas internacionalizadas (IDN) en su forma punycode (xn--).
+    Devuelve None si el nombre no es válido.
+    """
+    name = name.strip().rstrip('.').lower()
+    if not name or ' ' in name:
+        return None
+    if not name.isascii():
+        try:
+            name = name.encode('idna').decode('ascii')
+        except UnicodeError:
+            return None
+    if len(name) > 253 or '..' in name:
+        return None
+    return name
+
+
+def hierarchy_key(name: str) -> Tuple[str, ...]:
+    """Clave de ordenación por jerarquía de etiquetas (com.example.www)."""
+    return tuple(reversed(name.split('.')))
+
+
+class SubdomainSet:
+    """
+    Conjunto de subdominios de un dominio raíz ('apex'), basado en hash.
+    Normaliza cada nombre, pliega los comodines ('*.dev.example.com' cuenta
+    como 'dev.example.com', marcado como wildcard), descarta el apex y todo
+    lo que quede fuera de su ámbito. Añadir es O(1), así que el coste total
+    crece de forma lineal con el número de nombres.
+    """
+    __slots__ = ('apex', '_suffix', '_names', 'rejected')
+
+    def __init__(self, apex: str):
+        self.apex = normalize_hostname(apex) or apex.lower()
+        self._suffix = '.' + self.apex
+        # nombre -> True si solo lo hemos visto como comodín
+        self._names: Dict[str, bool] = {}
+        self.rejected = 0
+
+    def add(self, raw_name: str) -> bool:
+        """Añade un nombre. Devuelve True si es un subdominio nuevo."""
+        name = normalize_hostname(raw_name)
+        if name is None:
+            self.rejected += 1
+            return False
+
+        wildcard = False
+        while name.startswith('*.'):
+            name = name[2:]
+            wildcard = True
+        if '*' in name:
+            self.rejected += 1
+            return False
+
+        if name == self.apex or not name.endswith(self._suffix):
+            # El apex no es un subdominio y lo demás está fuera de ámbito
+            if name != self.apex:
+                self.rejected += 1
+            return False
+
+        previous = self._names.get(name)
+        if previous is None:
+            self._names[name] = wildcard
+            return True
+        if previous and not wildcard:
+            # Visto primero como comodín y ahora como nombre concreto
+            self._names[name] = False
+        return False
+
+    def update(self, names: Iterable[str]) -> int:
+        """Añade varios nombres y devuelve cuántos eran nuevos."""
+        added = 0
+        for name in names:
+            if self.add(name):
+                added += 1
+        return added
+
+    def __contains__(self, name: str) -> bool:
+        normalized = normalize_hostname(name)
+        return normalized is not None and normalized in self._names
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.sorted())
+
+    def sorted(self) -> List[str]:
+        """Nombres ordenados por jerarquía (los hijos justo debajo de su padre)."""
+        return sorted(self._names, key=hierarchy_key)
+
+    def wildcards(self) -> List[str]:
+        """Nombres que solo aparecieron como comodín ('*.nombre')."""
+        return sorted((name for name, wildcard in self._names.items() if wildcard), key=hierarchy_key)
+
+
+class PublicSuffixList:
+    """
+    Reglas de la Public Suffix List (sección ICANN: los sufijos de registro,
+    no los privados como github.io) para calcular el dominio registrable.
+    """
+    def __init__(self, rules: Iterable[str]):
+        self.suffixes: Set[str] = set()
+        self.wildcards: Set[str] = set()
+        self.exceptions: Set[str] = set()
+        for rule in rules:
+            rule = rule.strip().lower()
+            if not rule:
+                continue
+            if rule.startswith('!'):
+                self.exceptions.add(normalize_hostname(rule[1:]) or rule[1:])
+            elif rule.startswith('*.'):
+                self.wildcards.add(normalize_hostname(rule[2:]) or rule[2:])
+            else:
+                self.suffixes.add(normalize_hostname(rule) or rule)
+
+    @classmethod
+    def from_file(cls, path: Path) -> 'PublicSuffixList':
+        rules = []
+        with open(path, encoding='utf-8') as handle:
+            for line in handle:
+                if _PSL_PRIVATE_MARKER in line:
+                    break
+                line = line.split('//')[0].split()
+                if line:
+                    rules.append(line[0])
+        return cls(rules)
+
+    def public_suffix(self, name: str) -> str:
+        labels = name.split('.')
+        for index in range(len(labels)):
+            candidate = '.'.join(labels[index:])
+            if candidate in self.exceptions:
+                return '.'.join(labels[index + 1:])
+            if candidate in self.suffixes:
+                return candidate
+            if index + 1 < len(labels) and '.'.join(labels[index + 1:]) in self.wildcards:
+                return candidate
+        # Regla por defecto ('*'): la última etiqueta
+        return labels[-1]
+
+    def registrable_domain(self, name: str) -> Optional[str]:
+        """'a.b.example.co.uk' -> 'example.co.uk'. None si 'name' es un sufijo."""
+        suffix = self.public_suffix(name)
+        if name == suffix:
+            return None
+        labels = name[:-len(suffix) - 1].split('.')
+        return f"{labels[-1]}.{suffix}"
+
+
+@functools.lru_cache(maxsize=1)
+def get_public_suffixes() -> PublicSuffixList:
+    """La lista completa que trae python-whois o, si no está, la reducida."""
+    try:
+        import whois
+        path = Path(whois.__file__).parent / 'data' / 'public_suffix_list.dat'
+        return PublicSuffixList.from_file(path)
+    except (ImportError, OSError) as e:
+        logger.debug(f"Public suffix list not available, using the built-in subset: {e}")
+        return PublicSuffixList(_BUILTIN_SUFFIXES)
+
+
+def registrable_domain(name: str) -> Optional[str]:
+    """
+    Dominio registrable (el que tiene WHOIS) de un nombre de host:
+    'www.shop.example.co.uk' -> 'example.co.uk'.
+    """
+    name = normalize_hostname(name)
+    if name is None or '.' not in name:
+        return None
+    return get_public_suffixes().registrable_domain(name)
@@ -0,0 +1,321 @@
+# src/corrosive_rage/core/tracing.py
+import contextvars
+import json
+import logging
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NewConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Módulo en ejecución, para agregar las peticiones por módulo
+current_module: contextvars.ContextVar[str] = contextvars.ContextVar('corrosive_module', default='-')
+
+# Límites (segundos) del histograma de duración exportado a Prometheus
+DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Máximo de trazas individuales que se guardan para el fichero JSON
+DEFAULT_MAX_TRACES = 100_000
+
+
+@dataclass
+class RequestTrace:
+    """Tiempos (ms) y metadatos de una petición HTTP hecha por make_request."""
+    method: str
+    url: str
+    host: str
+    module: str
+    started: float = field(default_factory=time.time)
+    status: Optional[int] = None
+    dns_ms: float = 0.0
+    connect_ms: float = 0.0
+    tls_ms: float = 0.0
+    ttfb_ms: Optional[float] = None
+    total_ms: float = 0.0
+    bytes_out: int = 0
+    bytes_in: int = 0
+    retries: int = 0
+    cache: str = 'bypass'   # hit / miss / bypass / shared (single-flight)
+    error: Optional[str] = None
+
+    def setup_ms(self) -> float:
+        return self.dns_ms + self.connect_ms + self.tls_ms
+
+
+class _HostStats:
+    __slots__ = ('requests', 'errors', 'retries', 'cache_hits', 'cache_misses', 'bytes_in',
+                 'bytes_out', 'dns_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'total_ms',
+                 'max_ms', 'statuses', 'buckets')
+
+    def __init__(self):
+        self.requests = self.errors = self.retries = 0
+        self.cache_hits = self.cache_misses = 0
+        self.bytes_in = self.bytes_out = 0
+        self.dns_ms = self.connect_ms = self.tls_ms = self.ttfb_ms = 0.0
+        self.total_ms = self.max_ms = 0.0
+        self.statuses: Dict[str, int] = {}
+        self.buckets = [0] * len(DURATION_BUCKETS)
+
+    def add(self, trace: RequestTrace):
+        self.requests += 1
+        self.errors += 1 if trace.error else 0
+        self.retries += trace.retries
+        self.cache_hits += 1 if trace.cache == 'hit' else 0
+        self.cache_misses += 1 if trace.cache == 'miss' else 0
+        self.bytes_in += trace.bytes_in
+        self.bytes_out += trace.bytes_out
+        self.dns_ms += trace.dns_ms
+        self.connect_ms += trace.connect_ms
+        self.tls_ms += trace.tls_ms
+        self.ttfb_ms += trace.ttfb_ms or 0.0
+        self.total_ms += trace.total_ms
+        self.max_ms = max(self.max_ms, trace.total_ms)
+        status = str(trace.status) if trace.status is not None else 'error'
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        seconds = trace.total_ms / 1000
+        for i, limit in enumerate(DURATION_BUCKETS):
+            if seconds <= limit:
+                self.buckets[i] += 1
+
+    def to_dict(self) -> Dict[str, object]:
+        data = {name: getattr(self, name) for name in self.__slots__ if name != 'buckets'}
+        for name in ('dns_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'total_ms', 'max_ms'):
+            data[name] = round(data[name], 3)
+        data['avg_ms'] = round(self.total_ms / self.requests, 2) if self.requests else 0.0
+        return data
+
+
+class TraceCollector:
+    """
+    Recoge las trazas de todas las peticiones del proceso y las agrega por
+    (host, módulo). Las trazas individuales solo se guardan si se va a
+    exportar el fichero JSON, y como mucho 'max_traces'.
+    """
+    def __init__(self, keep_traces: bool = False, max_traces: int = DEFAULT_MAX_TRACES):
+        self.keep_traces = keep_traces
+        self.max_traces = max_traces
+        self.traces: List[RequestTrace] = []
+        self.dropped = 0
+        self._stats: Dict[Tuple[str, str], _HostStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, trace: RequestTrace):
+        with self._lock:
+            key = (trace.host, trace.module)
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = _HostStats()
+            stats.add(trace)
+            if self.keep_traces:
+                if len(self.traces) < self.max_traces:
+                    self.traces.append(trace)
+                else:
+                    self.dropped += 1
+
+    def summary(self) -> Dict[str, Dict[str, object]]:
+        """Agregados por host y por módulo."""
+        by_host: Dict[str, _HostStats] = {}
+        by_module: Dict[str, _HostStats] = {}
+        with self._lock:
+            items = list(self._stats.items())
+        for (host, module), stats in items:
+            for group, name in ((by_host, host), (by_module, module)):
+                target = group.setdefault(name, _HostStats())
+                for attr in _HostStats.__slots__:
+                    if attr == 'statuses':
+                        for status, count in stats.statuses.items():
+                            target.statuses[status] = target.statuses.get(status, 0) + count
+                    elif attr == 'buckets':
+                        target.buckets = [a + b for a, b in zip(target.buckets, stats.buckets)]
+                    elif attr == 'max_ms':
+                        target.max_ms = max(target.max_ms, stats.max_ms)
+                    else:
+                        setattr(target, attr, getattr(target, attr) + getattr(stats, attr))
+        return {
+            'by_host': {host: s.to_dict() for host, s in sorted(by_host.items())},
+            'by_module': {module: s.to_dict() for module, s in sorted(by_module.items())},
+        }
+
+    def export_json(self, path: Path):
+        """Escribe las trazas individuales y los agregados en un fichero JSON."""
+        with self._lock:
+            traces = [asdict(t) for t in self.traces]
+        data = {'summary': self.summary(), 'dropped_traces': self.dropped, 'requests': traces}
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding='utf-8')
+
+    def export_prometheus(self, path: Path):
+        """Escribe las métricas en formato textfile de Prometheus (node_exporter)."""
+        with self._lock:
+            items = sorted(self._stats.items())
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+
+        metric('corrosive_http_requests_total', 'counter', 'HTTP requests by host, module and status.')
+        for (host, module), stats in items:
+            for status, count in sorted(stats.statuses.items()):
+                lines.append(f'corrosive_http_requests_total{{host="{host}",module="{module}",status="{status}"}} {count}')
+
+        counters = (
+            ('corrosive_http_retries_total', 'retries', 'Retries performed.'),
+            ('corrosive_http_cache_hits_total', 'cache_hits', 'Responses served from the cache.'),
+            ('corrosive_http_cache_misses_total', 'cache_misses', 'Cacheable requests sent to the network.'),
+            ('corrosive_http_received_bytes_total', 'bytes_in', 'Bytes received (approximate).'),
+            ('corrosive_http_sent_bytes_total', 'bytes_out', 'Bytes sent (approximate).'),
+        )
+        for name, attr, help_text in counters:
+            metric(name, 'counter', help_text)
+            for (host, module), stats in items:
+                lines.append(f'{name}{{host="{host}",module="{module}"}} {getattr(stats, attr)}')
+
+        metric('corrosive_http_phase_seconds_total', 'counter', 'Time spent per request phase.')
+        for (host, module), stats in items:
+            for phase in ('dns', 'connect', 'tls', 'ttfb'):
+                value = getattr(stats, f'{phase}_ms') / 1000
+                lines.append(f'corrosive_http_phase_seconds_total{{host="{host}",module="{module}",phase="{phase}"}} {value:.6f}')
+
+        metric('corrosive_http_request_duration_seconds', 'histogram', 'Total request duration.')
+        for (host, module), stats in items:
+            labels = f'host="{host}",module="{module}"'
+            for limit, count in zip(DURATION_BUCKETS, stats.buckets):
+                lines.append(f'corrosive_http_request_duration_seconds_bucket{{{labels},le="{limit}"}} {count}')
+            lines.append(f'corrosive_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.requests}')
+            lines.append(f'corrosive_http_request_duration_seconds_sum{{{labels}}} {stats.total_ms / 1000:.6f}')
+            lines.append(f'corrosive_http_request_duration_seconds_count{{{labels}}} {stats.requests}')
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Escritura atómica: node_exporter nunca ve un fichero a medias
+        tmp_path = path.with_suffix(path.suffix + '.tmp')
+        tmp_path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        tmp_path.replace(path)
+
+
+_collector = TraceCollector()
+_active = threading.local()
+
+
+def configure_tracing(keep_traces: bool = False, max_traces: int = DEFAULT_MAX_TRACES) -> TraceCollector:
+    """Reinicia el recolector; 'keep_traces' guarda cada petición para --trace-file."""
+    global _collector
+    _collector = TraceCollector(keep_traces=keep_traces, max_traces=max_traces)
+    return _collector
+
+
+def get_collector() -> TraceCollector:
+    return _collector
+
+
+def get_active_trace() -> Optional[RequestTrace]:
+    """Traza de la petición que está haciendo este hilo, si la hay."""
+    return getattr(_active, 'trace', None)
+
+
+@contextmanager
+def trace_request(method: str, url: str, host: str) -> Iterator[RequestTrace]:
+    """Abre una traza para la petición en curso y la registra al terminar."""
+    trace = RequestTrace(method=method.upper(), url=url, host=host, module=current_module.get())
+    previous = get_active_trace()
+    _active.trace = trace
+    start = time.perf_counter()
+    try:
+        yield trace
+    except Exception as e:
+        trace.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        trace.total_ms = round((time.perf_counter() - start) * 1000, 3)
+        _active.trace = previous
+        _collector.record(trace)
+
+
+@contextmanager
+def module_scope(module_name: str) -> Iterator[None]:
+    """Marca las peticiones hechas dentro del bloque como del módulo indicado."""
+    token = current_module.set(module_name)
+    try:
+        yield
+    finally:
+        current_module.reset(token)
+
+
+# --- Medición de DNS / conexión / TLS dentro de urllib3 ---
+
+class _TimedConnectionMixin:
+    def _new_conn(self):
+        trace = get_active_trace()
+        if trace is None:
+            return super()._new_conn()
+
+        host = self._dns_host
+        start = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(host, self.port, 0, socket.SOCK_STREAM)
+        except OSError:
+            infos = []
+        resolved = time.perf_counter()
+        trace.dns_ms += (resolved - start) * 1000
+
+        try:
+            if infos:
+                # Conectamos a la IP ya resuelta para no medir dos veces el DNS
+                self._dns_host = infos[0][4][0]
+            try:
+                sock = super()._new_conn()
+            except NewConnectionError:
+                if not infos:
+                    raise
+                # Primera dirección inalcanzable: dejamos que urllib3 pruebe todas
+                self._dns_host = host
+                sock = super()._new_conn()
+        finally:
+            self._dns_host = host
+        trace.connect_ms += (time.perf_counter() - resolved) * 1000
+        return sock
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    def connect(self):
+        trace = get_active_trace()
+        if trace is None:
+            return super().connect()
+        before = trace.dns_ms + trace.connect_ms
+        start = time.perf_counter()
+        super().connect()
+        elapsed = (time.perf_counter() - start) * 1000
+        trace.tls_ms += max(0.0, elapsed - (trace.dns_ms + trace.connect_ms - before))
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter cuyas conexiones anotan los tiempos en la traza activa."""
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
@@ -1,13 +1,34 @@
 # src/corrosive_rage/core/utils.py
-import shodan
 import requests
 import logging
-from typing import Optional, Dict, Any
+import configparser
+import functools
+import time
+from http.client import responses as http_reasons
+from typing import TYPE_CHECKING, Optional, Dict, Any, Iterable
+from urllib.parse import urlsplit
+
+from requests.structures import CaseInsensitiveDict
+
+from .aio import configure_async, run_in_io_thread
+from .cache import MODE_DEFAULT, CacheEntry, configure_cache, get_cache
+from .dns import configure_dns
+from .ratelimit import api_key_from_headers, configure_rate_limits, get_rate_limiter
+from .resilience import STATE_OPEN, configure_resilience, get_breakers, get_retry_policy, parse_retry_after
+from .session import configure_sessions, get_session_manager
+from .singleflight import get_singleflight, request_key
+from .steps import configure_steps
+from .tracing import get_active_trace, trace_request
+from .whois import WhoisRecord, configure_whois, get_whois_engine
+
+# shodan y whois se importan al usarlos: solo algunos módulos los necesitan
+if TYPE_CHECKING:
+    import shodan
 
 # Configuramos un logger para las utilidades
 logger = logging.getLogger(__name__)
 
-def get_shodan_client(api_key: Optional[str]) -> Optional[shodan.Shodan]:
+def get_shodan_client(api_key: Optional[str]) -> Optional['CachedShodanClient']:
     """
     Crea y devuelve un cliente de Shodan si la clave de API es válida.
     Maneja los errores de inicialización.
@@ -16,24 +37,222 @@ def get_shodan_client(api_key: Optional[str]) -> Optional[shodan.Shodan]:
         logger.warning("Shodan API key not provided.")
         return None
     try:
+        import shodan
         client = shodan.Shodan(api_key)
         # A veces, la API no da un error hasta la primera llamada, pero una validación básica es buena.
         logger.info("Shodan client initialized successfully.")
-        return client
+        return CachedShodanClient(client)
     except Exception as e:
         logger.error(f"Failed to initialize Shodan client: {e}")
         return None
 
-def make_request(url: str, method: str = 'GET', timeout: int = 10, **kwargs) -> Optional[requests.Response]:
+class CachedShodanClient:
+    """
+    Envoltorio de shodan.Shodan que guarda en la caché de respuestas las
+    consultas host(). El resto de métodos se delegan en el cliente original.
+    """
+    def __init__(self, client: 'shodan.Shodan'):
+        self._client = client
+
+    def host(self, ips, history: bool = False, minify: bool = False) -> Dict[str, Any]:
+        cache = get_cache()
+        key = f"host:{ips}:{history}:{minify}"
+        if cache is not None:
+            cached = cache.get_value('shodan', key)
+            if cached is not None:
+                return cached
+        # Consultas idénticas simultáneas comparten una única llamada a la API
+        return get_singleflight().do(('shodan', key), self._fetch_host, key, ips, history, minify)
+
+    def _fetch_host(self, key: str, ips, history: bool, minify: bool) -> Dict[str, Any]:
+        with get_rate_limiter().limit('api.shodan.io', getattr(self._client, 'api_key', None)):
+            result = self._client.host(ips, history=history, minify=minify)
+        cache = get_cache()
+        if cache is not None:
+            cache.set_value('shodan', key, result)
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+def cached_whois(domain: str) -> WhoisRecord:
+    """
+    Consulta WHOIS con el motor compartido (core.whois): se pregunta por el
+    dominio registrable, con caché de respuestas (fuente 'whois') y al ritmo
+    de cada servidor. Las fechas se devuelven como texto, igual que en el
+    JSON de resultados.
+    """
+    return get_whois_engine().lookup(domain)
+
+def configure_http(config: configparser.ConfigParser, cache_mode: str = MODE_DEFAULT):
+    """
+    Prepara la capa HTTP compartida (pools, caché, límites y reintentos)
+    a partir de config.ini. Debe llamarse una vez al arrancar, después de
+    cargar la configuración. 'cache_mode' refleja --no-cache / --refresh.
+    """
+    configure_sessions(config)
+    configure_async(config)
+    configure_steps(config)
+    configure_dns(config)
+    configure_whois(config)
+    configure_cache(config, mode=cache_mode)
+    configure_rate_limits(config)
+    configure_resilience(config)
+
+def _shareable_url(method: str, url: str, kwargs: Dict[str, Any]) -> Optional[str]:
+    """
+    URL completa (con parámetros) de una petición que se puede cachear y
+    compartir entre llamadas idénticas, o None si no se puede
+    (métodos con cuerpo o respuestas en streaming).
+    """
+    if method.upper() not in ('GET', 'HEAD'):
+        return None
+    if kwargs.get('stream') or any(kwargs.get(k) for k in ('data', 'json', 'files')):
+        return None
+    return requests.Request(method.upper(), url, params=kwargs.get('params')).prepare().url
+
+def _response_from_cache(url: str, entry: CacheEntry) -> requests.Response:
+    """Reconstruye un requests.Response a partir de una entrada de la caché."""
+    response = requests.Response()
+    response.status_code = entry.status
+    response.reason = http_reasons.get(entry.status, '')
+    response.headers = CaseInsensitiveDict(entry.headers)
+    response._content = entry.body
+    response.url = url
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """El circuit breaker del host está abierto: la petición ni se intenta."""
+
+def _request_size(request: requests.PreparedRequest) -> int:
+    """Tamaño aproximado en bytes de la petición enviada (línea, cabeceras y cuerpo)."""
+    size = len(request.method or '') + len(request.path_url or '') + 12
+    size += sum(len(k) + len(v) + 4 for k, v in request.headers.items())
+    body = request.body
+    if body is not None:
+        size += len(body) if isinstance(body, (bytes, str)) else 0
+    return size
+
+def _response_size(response: requests.Response, stream: bool) -> int:
+    """Tamaño aproximado en bytes de la respuesta recibida."""
+    size = sum(len(k) + len(v) + 4 for k, v in response.headers.items())
+    if stream:
+        # El cuerpo aún no se ha leído: nos fiamos de Content-Length
+        length = response.headers.get('Content-Length', '')
+        return size + (int(length) if length.isdigit() else 0)
+    return size + len(response.content)
+
+def _send(session: requests.Session, method: str, url: str, source: str, timeout: int,
+          api_key: Optional[str], rate_host: str, **kwargs) -> requests.Response:
+    """
+    Envía la petición respetando el límite de 'rate_host' y el circuit
+    breaker del host.
+    Reintenta timeouts, errores de conexión, 429 y 5xx con backoff exponencial
+    con jitter, respetando Retry-After cuando el servidor lo envía.
+    """
+    policy = get_retry_policy()
+    breaker = get_breakers().get(source)
+    trace = get_active_trace()
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit breaker open for host {source}")
+        retry_after = None
+        try:
+            with get_rate_limiter().limit(rate_host, api_key):
+                setup_before = trace.setup_ms() if trace else 0.0
+                response = session.request(method, url, timeout=timeout, **kwargs)
+            if trace is not None:
+                setup = trace.setup_ms() - setup_before
+                trace.ttfb_ms = round(max(0.0, response.elapsed.total_seconds() * 1000 - setup), 3)
+                trace.bytes_out += _request_size(response.request)
+                trace.bytes_in += _response_size(response, bool(kwargs.get('stream')))
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            breaker.record_failure()
+            if attempt >= policy.max_retries:
+                raise
+        else:
+            # Un 429 indica que el host está vivo (solo nos frena): no cuenta como fallo
+            if response.status_code >= 500:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if response.status_code not in policy.retry_statuses or attempt >= policy.max_retries:
+                return response
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            response.close()
+
+        if breaker.state == STATE_OPEN:
+            # El host acaba de darse por caído: no merece la pena esperar al reintento
+            raise CircuitOpenError(f"Circuit breaker open for host {source}")
+        delay = policy.delay(attempt, retry_after)
+        attempt += 1
+        if trace is not None:
+            trace.retries = attempt
+        logger.warning(f"Retrying {url} in {delay:.1f}s (attempt {attempt}/{policy.max_retries}).")
+        time.sleep(delay)
+
+def _fetch(method: str, url: str, full_url: Optional[str], source: str, timeout: int,
+           api_key: Optional[str], rate_host: str, kwargs: Dict[str, Any]) -> requests.Response:
+    """Obtiene la respuesta de la caché o de la red (guardándola si procede)."""
+    cache = get_cache()
+    cache_key = f"{method.upper()} {full_url}" if cache is not None and full_url else None
+    entry = cache.get(source, cache_key) if cache_key else None
+    trace = get_active_trace()
+    if trace is not None:
+        trace.cache = 'hit' if entry is not None else 'miss' if cache_key else 'bypass'
+    if entry is not None:
+        return _response_from_cache(url, entry)
+    session = get_session_manager().get_session(url)
+    response = _send(session, method, url, source, timeout, api_key, rate_host, **kwargs)
+    # Guardamos éxitos y también los 404 (caché negativa)
+    if cache_key and (response.ok or response.status_code == 404):
+        cache.set(source, cache_key, response.status_code, dict(response.headers), response.content)
+    return response
+
+def make_request(url: str, method: str = 'GET', timeout: int = 10,
+                 expected_statuses: Optional[Iterable[int]] = None,
+                 rate_key: Optional[str] = None, rate_host: Optional[str] = None,
+                 **kwargs) -> Optional[requests.Response]:
     """
     Realiza una petición HTTP con manejo básico de errores y logging.
+    Reutiliza las conexiones keep-alive del pool compartido por host.
+    Los códigos de 'expected_statuses' (ej: un 404 que es un resultado válido)
+    se devuelven sin tratarse como error.
+    Las peticiones GET/HEAD se sirven desde la caché de respuestas si está activa.
+    Las que salen a la red respetan el límite del host (y de la clave de API,
+    tomada de 'rate_key' o de las cabeceras) definido en el registro de límites;
+    'rate_host' aplica en su lugar la regla de otro nombre (p. ej. un endpoint
+    con cupo propio, como batch.ip-api.com),
+    se reintentan ante errores transitorios y fallan rápido si el circuit
+    breaker del host está abierto. Las peticiones GET/HEAD idénticas que
+    coinciden en el tiempo comparten una sola llamada (single-flight).
+    Cada llamada deja una traza de tiempos en core.tracing.
     Devuelve el objeto Response o None si falla.
     """
+    source = (urlsplit(url).hostname or '').lower()
+    full_url = _shareable_url(method, url, kwargs)
+    api_key = rate_key or api_key_from_headers(kwargs.get('headers'))
+    rate_host = rate_host or source
     try:
-        response = requests.request(method, url, timeout=timeout, **kwargs)
-        response.raise_for_status()  # Lanza una excepción para códigos de error (4xx o 5xx)
+        with trace_request(method, url, source) as trace:
+            if full_url is not None:
+                # Peticiones idénticas en vuelo comparten una única llamada real;
+                # si este hilo no es el que la hace, su traza queda como 'shared'
+                trace.cache = 'shared'
+                key = request_key(method, full_url, api_key)
+                response = get_singleflight().do(key, _fetch, method, url, full_url, source,
+                                                 timeout, api_key, rate_host, kwargs)
+            else:
+                response = _fetch(method, url, None, source, timeout, api_key, rate_host, kwargs)
+            trace.status = response.status_code
+            if expected_statuses is None or response.status_code not in expected_statuses:
+                response.raise_for_status()  # Lanza una excepción para códigos de error (4xx o 5xx)
         logger.debug(f"Request to {url} successful with status {response.status_code}.")
         return response
+    except CircuitOpenError:
+        logger.warning(f"Skipping request to {url}: host {source} is failing (circuit open).")
     except requests.exceptions.Timeout:
         logger.error(f"Request timed out for URL: {url}")
     except requests.exceptions.HTTPError as e:
@@ -41,3 +260,22 @@ def make_request(url: str, method: str = 'GET', timeout: int = 10, **kwargs) ->
     except requests.exceptions.RequestException as e:
         logger.error(f"Request failed for URL {url}: {e}")
     return None
+
+async def amake_request(url: str, method: str = 'GET', timeout: int = 10,
+                        expected_statuses: Optional[Iterable[int]] = None,
+                        rate_key: Optional[str] = None, rate_host: Optional[str] = None,
+                        **kwargs) -> Optional[requests.Response]:
+    """
+    Versión asíncrona de make_request para usar desde 'arun()'.
+    Delega en el pool de hilos de E/S y comparte con ella sesiones y pools.
+    Las corrutinas que piden lo mismo a la vez esperan a una única llamada.
+    """
+    call = functools.partial(run_in_io_thread, make_request, url, method=method, timeout=timeout,
+                             expected_statuses=expected_statuses, rate_key=rate_key, rate_host=rate_host,
+                             **kwargs)
+    full_url = _shareable_url(method, url, kwargs)
+    if full_url is None:
+        return await call()
+    api_key = rate_key or api_key_from_headers(kwargs.get('headers'))
+    key = request_key(method, full_url, api_key) + (tuple(sorted(expected_statuses or ())),)
+    return await get_singleflight().ado(key, call)
@@ -0,0 +1,242 @@
+# src/corrosive_rage/core/whois.py
+import configparser
+import json
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+from .cache import get_cache
+from .ratelimit import RateLimitRule, TokenBucket, parse_rule
+from .singleflight import get_singleflight
+from .subdomains import normalize_hostname, registrable_domain
+
+logger = logging.getLogger(__name__)
+
+# Ritmo por defecto de cada servidor WHOIS (uno por TLD). Los registros
+# suelen cortar a partir de unas decenas de consultas por minuto
+DEFAULT_WHOIS_RULE = RateLimitRule(rate=30, period=60, burst=3, max_in_flight=2)
+DEFAULT_RETRIES = 2
+# Segundos que se deja descansar a un servidor que nos ha limitado (se dobla en cada reintento)
+DEFAULT_BACKOFF = 30.0
+DEFAULT_TIMEOUT = 10
+
+# Textos con los que los servidores WHOIS avisan de que se ha superado su cupo
+THROTTLE_MARKERS = (
+    'limit exceeded', 'quota exceeded', 'exceeded the maximum', 'too many',
+    'try again later', 'rate limit', 'query rate', 'temporarily blocked',
+)
+
+
+class WhoisRecord(dict):
+    """
+    Registro WHOIS rehidratado desde la caché. Se comporta como el WhoisEntry
+    de python-whois: acceso por atributo y str() en formato JSON.
+    """
+    def __getattr__(self, name: str) -> Any:
+        return self.get(name)
+
+    def __str__(self) -> str:
+        return json.dumps(self, indent=2, default=str, ensure_ascii=False)
+
+
+class WhoisThrottled(Exception):
+    """El servidor WHOIS siguió limitando las consultas tras los reintentos."""
+
+
+def is_throttled(text: str) -> bool:
+    head = text[:2000].lower()
+    return any(marker in head for marker in THROTTLE_MARKERS)
+
+
+def _query_server(domain: str, timeout: int) -> str:
+    """Texto WHOIS de un dominio con el cliente de python-whois (puerto 43)."""
+    from whois import NICClient
+    return NICClient().whois_lookup(None, domain, 0, quiet=True, timeout=timeout)
+
+
+def _parse(domain: str, text: str) -> WhoisRecord:
+    import whois
+    if not text:
+        raise whois.WhoisError("Whois command returned no output")
+    entry = whois.WhoisEntry.load(domain, text)
+    # Las fechas se guardan como texto, igual que en el JSON de resultados
+    return WhoisRecord(json.loads(json.dumps(dict(entry), default=str)))
+
+
+class WhoisEngine:
+    """
+    Consultas WHOIS para muchos dominios. Cada nombre se reduce a su dominio
+    registrable (www.shop.example.co.uk -> example.co.uk), que es lo que
+    tiene WHOIS y la clave de la caché (fuente 'whois'); consultas iguales
+    simultáneas comparten una sola petición. Las consultas a cada servidor
+    (uno por TLD) pasan por su propio cubo de tokens y máximo en vuelo, y si
+    el servidor responde que se ha superado su cupo se le deja descansar y
+    se reintenta en lugar de guardar un registro vacío.
+    """
+    def __init__(self, default_rule: RateLimitRule = DEFAULT_WHOIS_RULE,
+                 rules: Optional[Dict[str, RateLimitRule]] = None, retries: int = DEFAULT_RETRIES,
+                 backoff: float = DEFAULT_BACKOFF, timeout: int = DEFAULT_TIMEOUT,
+                 fetch: Optional[Callable[[str, int], str]] = None):
+        self.default_rule = default_rule
+        self.rules = dict(rules or {})
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.timeout = timeout
+        # (dominio, timeout) -> texto WHOIS; se puede sustituir (benchmarks)
+        self._fetch_text = fetch or _query_server
+        self._slots: Dict[str, Tuple[TokenBucket, threading.BoundedSemaphore]] = {}
+        self._paused_until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: configparser.ConfigParser) -> 'WhoisEngine':
+        """
+        Sección [whois]: 'rate' (regla por servidor, con el formato de
+        [ratelimit]), 'retries', 'backoff', 'timeout' y reglas propias por
+        TLD (de = 10/60, max_in_flight=1).
+        """
+        default_rule, rules = DEFAULT_WHOIS_RULE, {}
+        options = dict(config.items('whois')) if config.has_section('whois') else {}
+        for name, value in options.items():
+            if name in ('retries', 'backoff', 'timeout'):
+                continue
+            try:
+                rule = parse_rule(value)
+            except ValueError as e:
+                logger.warning(f"Invalid WHOIS rate rule for {name} ('{value}'): {e}")
+                continue
+            if name == 'rate':
+                default_rule = rule
+            else:
+                rules[name.lower()] = rule
+        return cls(default_rule, rules,
+                   retries=int(options.get('retries', DEFAULT_RETRIES)),
+                   backoff=float(options.get('backoff', DEFAULT_BACKOFF)),
+                   timeout=int(options.get('timeout', DEFAULT_TIMEOUT)))
+
+    @staticmethod
+    def lookup_key(domain: str) -> str:
+        """Clave de la consulta: el dominio registrable (o el nombre tal cual)."""
+        return registrable_domain(domain) or normalize_hostname(domain) or domain.lower().rstrip('.')
+
+    @staticmethod
+    def server_key(key: str) -> str:
+        # El servidor del registro es el del TLD (co.uk y org.uk van a .uk)
+        return key.rsplit('.', 1)[-1]
+
+    def lookup(self, domain: str) -> WhoisRecord:
+        """Registro WHOIS del dominio registrable de 'domain' (desde la caché si está)."""
+        key = self.lookup_key(domain)
+        cache = get_cache()
+        if cache is not None:
+            cached = cache.get_value('whois', key)
+            if cached is not None:
+                return WhoisRecord(cached)
+        return get_singleflight().do(('whois', key), self._fetch, key)
+
+    def lookup_many(self, domains: Iterable[str]) -> Dict[str, Union[WhoisRecord, Exception]]:
+        """
+        Consulta muchos dominios de una vez: {dominio: registro o excepción}.
+        Los subdominios de un mismo dominio registrable cuestan una sola
+        consulta, y cada servidor avanza a su ritmo sin que uno lento o
+        limitado retrase a los demás.
+        """
+        keys = {domain: self.lookup_key(domain) for domain in dict.fromkeys(domains)}
+        unique = list(dict.fromkeys(keys.values()))
+        # Una cola por servidor, vaciada por tantos hilos como admita en vuelo
+        queues: Dict[str, deque] = {}
+        for key in unique:
+            queues.setdefault(self.server_key(key), deque()).append(key)
+        records: Dict[str, Union[WhoisRecord, Exception]] = {}
+
+        def drain(queue: deque):
+            while True:
+                try:
+                    key = queue.popleft()
+                except IndexError:
+                    return
+                try:
+                    records[key] = self.lookup(key)
+                except Exception as e:
+                    records[key] = e
+
+        drainers = [queue for server, queue in queues.items()
+                    for _ in range(min(len(queue), self._rule(server).max_in_flight or 1))]
+        if drainers:
+            with ThreadPoolExecutor(max_workers=len(drainers), thread_name_prefix='corrosive-whois') as executor:
+                for future in [executor.submit(drain, queue) for queue in drainers]:
+                    future.result()
+        logger.info(f"WHOIS for {len(keys)} domains: {len(unique)} registrable domains "
+                    f"on {len(queues)} servers")
+        return {domain: records[key] for domain, key in keys.items()}
+
+    def _rule(self, server: str) -> RateLimitRule:
+        return self.rules.get(server, self.default_rule)
+
+    def _slot(self, server: str) -> Tuple[TokenBucket, threading.BoundedSemaphore]:
+        with self._lock:
+            slot = self._slots.get(server)
+            if slot is None:
+                rule = self._rule(server)
+                slot = (TokenBucket(rule.rate, rule.period, rule.burst),
+                        threading.BoundedSemaphore(rule.max_in_flight or 1))
+                self._slots[server] = slot
+            return slot
+
+    def _pause(self, server: str, seconds: float):
+        with self._lock:
+            self._paused_until[server] = max(self._paused_until.get(server, 0.0), time.monotonic() + seconds)
+
+    def _wait_pause(self, server: str):
+        while True:
+            with self._lock:
+                delay = self._paused_until.get(server, 0.0) - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def _fetch(self, key: str) -> WhoisRecord:
+        server = self.server_key(key)
+        bucket, semaphore = self._slot(server)
+        for attempt in range(self.retries + 1):
+            self._wait_pause(server)
+            with semaphore:
+                waited = bucket.acquire()
+                if waited:
+                    logger.debug(f"WHOIS pacing for .{server}: waited {waited:.2f}s")
+                text = self._fetch_text(key, self.timeout)
+            if text and is_throttled(text):
+                delay = self.backoff * (2 ** attempt)
+                logger.warning(f"WHOIS server for .{server} is throttling; pausing it {delay:g}s")
+                self._pause(server, delay)
+                continue
+            record = _parse(key, text)
+            cache = get_cache()
+            if cache is not None:
+                cache.set_value('whois', key, record)
+            return record
+        raise WhoisThrottled(f"WHOIS server for .{server} kept throttling queries for {key}")
+
+
+_engine: Optional[WhoisEngine] = None
+_engine_lock = threading.Lock()
+
+
+def configure_whois(config: configparser.ConfigParser) -> WhoisEngine:
+    """Sustituye el motor WHOIS global por uno construido desde config.ini."""
+    global _engine
+    with _engine_lock:
+        _engine = WhoisEngine.from_config(config)
+        return _engine
+
+
+def get_whois_engine() -> WhoisEngine:
+    """Devuelve el motor WHOIS global, con los valores por defecto si no se configuró."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = WhoisEngine()
+        return _engine
@@ -12,6 +12,8 @@ class BreachReconModule(BaseModule):
     Módulo para verificar si un email ha aparecido en filtraciones de datos.
     Hereda de BaseModule para obtener funcionalidades comunes.
     """
+    consumes = ('email',)
+
     def run(self) -> dict:
         """
         Ejecuta la consulta en la API de Have I Been Pwned.
@@ -10,6 +10,8 @@ class CompanyReconModule(BaseModule):
     Módulo para recopilar inteligencia de empresas.
     Hereda de BaseModule para obtener funcionalidades comunes.
     """
+    consumes = ('company',)
+
     def run(self) -> dict:
         """
         Ejecuta la recopilación de inteligencia de la empresa.
@@ -2,101 +2,200 @@
 
 # Importamos las nuevas herramientas de nuestro núcleo
 from ..core.base import BaseModule
-from ..core.utils import get_shodan_client, make_request
+from ..core.cache import get_cache
+from ..core.dns import NOERROR, NXDOMAIN, get_resolver, host_records, is_live
+from ..core.steps import Step
+from ..core.streaming import iter_response_json_array
+from ..core.subdomains import SubdomainSet
+from ..core.utils import cached_whois, get_shodan_client, make_request
 
 # Importamos las librerías externas que necesitemos
-import whois
+import functools
 import re
+from typing import Iterator, Tuple
 
 class DomainReconModule(BaseModule):
     """
     Módulo para realizar reconocimiento de dominios.
     Hereda de BaseModule para obtener funcionalidades comunes.
     """
+    consumes = ('domain',)
+    produces = ('email', 'hostname', 'ip')
+
     def run(self) -> dict:
         """
         Ejecuta el proceso de reconocimiento de dominios.
         Ya no necesita 'target' ni 'config' como argumentos,
         porque están disponibles como 'self.target' y 'self.config'.
+        WHOIS, crt.sh, DNS y Shodan son independientes, así que se consultan
+        a la vez (core.steps) y el tiempo total es el de la fuente más lenta.
+        La resolución de los subdominios de crt.sh es un paso aparte, con su
+        propio plazo, para que un DNS lento no se lleve por delante la
+        enumeración ya obtenida.
         """
         self.logger.info(f"[*] Iniciando reconocimiento de dominio para: {self.target}")
 
-        # --- 1. Consulta WHOIS ---
-        try:
-            domain_info = whois.whois(self.target)
-            # La lógica para extraer los datos sigue siendo la misma...
-            registrar = domain_info.registrar
-            creation_date = domain_info.creation_date
-            expiration_date = domain_info.expiration_date
-            
-            emails_found = set()
-            whois_text = str(domain_info)
-            email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-            emails_found.update(re.findall(email_pattern, whois_text))
-
-            # ...pero en lugar de construir el diccionario a mano, usamos el método helper
-            self.add_finding('whois', {
-                'registrar': registrar[0] if isinstance(registrar, list) else registrar,
-                'creation_date': str(creation_date[0]) if isinstance(creation_date, list) else str(creation_date),
-                'expiration_date': str(expiration_date[0]) if isinstance(expiration_date, list) else str(expiration_date),
-                'emails': list(emails_found)
-            })
-            # El logging ya está incluido en add_finding, pero podemos añadir un extra si queremos
-            self.logger.info("[+] Información WHOIS encontrada.")
-        except Exception as e:
-            self.logger.error(f"[!] Error en la consulta WHOIS: {e}")
-
-        # --- 2. Enumeración de Subdominios ---
-        self.logger.info(f"[*] Buscando subdominios para {self.target}...")
-        try:
-            url = f"https://crt.sh/?q=%25.{self.target}&output=json"
-            # Usamos nuestra utilidad 'make_request' en lugar de 'requests.get'
-            response = make_request(url)
-            
-            if response:
-                certs = response.json()
-                subdomains = []
-                for cert in certs:
-                    name_value = cert.get('name_value', '')
-                    for name in name_value.split('\n'):
-                        if name and name not in subdomains:
-                            subdomains.append(name)
-                
-                unique_subdomains = sorted(list(set(sub for sub in subdomains if sub and sub != self.target and not sub.startswith('*.'))))
-
-                if unique_subdomains:
-                    self.add_finding('subdomain_enumeration', {'subdomains': unique_subdomains, 'count': len(unique_subdomains)})
-                    self.logger.info(f"[+] Se encontraron {len(unique_subdomains)} subdominios únicos.")
-                else:
-                    self.logger.info(f"[-] No se encontraron subdominios para {self.target}.")
-            
-        except Exception as e:
-            self.logger.error(f"[!] Error en la enumeración de subdominios: {e}")
-
-        # --- 3. Búsqueda en Shodan ---
+        steps = [Step('whois', self._whois_step), Step('crtsh', self._subdomains_step),
+                 Step('dns', self._dns_step)]
+
         # ¡Mira qué limpio queda esto ahora!
         shodan_api_key = self.get_api_key('shodan')
         api = get_shodan_client(shodan_api_key)
-        
         if api:
-            try:
-                host = api.host(self.target, history=False)
-                self.add_finding('shodan_host_info', {
-                    'country': host.get('country_name'),
-                    'city': host.get('city'),
-                    'org': host.get('org'),
-                    'ports': host.get('ports'),
-                    'vulns': list(host.get('vulns', []))[:5],
-                    'ip_str': host.get('ip_str')
-                })
-                self.logger.info("[+] Información de Shodan encontrada.")
-            except Exception as e:
-                self.logger.error(f"[!] Error al consultar Shodan: {e}")
+            steps.append(Step('shodan', functools.partial(self._shodan_step, api)))
         else:
             # El warning de que la clave no está configurado ya lo gestiona 'get_api_key'
             self.logger.info("[!] Omitiendo búsqueda en Shodan.")
 
+        self.run_steps(steps)
+
+        subdomains = [name for finding in self.results.findings if finding['type'] == 'subdomain_enumeration'
+                      for name in finding['data']['subdomains']]
+        if subdomains:
+            self.run_steps([Step('resolve', functools.partial(self._resolve_subdomains, subdomains))])
+
         # El método 'run' debe devolver los resultados, que la clase base ha estado construyendo.
         return self.results
 
+    # --- 1. Consulta WHOIS ---
+    def _whois_step(self) -> Iterator[Tuple[str, dict]]:
+        domain_info = cached_whois(self.target)
+        # La lógica para extraer los datos sigue siendo la misma...
+        registrar = domain_info.registrar
+        creation_date = domain_info.creation_date
+        expiration_date = domain_info.expiration_date
+
+        emails_found = set()
+        whois_text = str(domain_info)
+        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
+        emails_found.update(re.findall(email_pattern, whois_text))
+
+        yield 'whois', {
+            'registrar': registrar[0] if isinstance(registrar, list) else registrar,
+            'creation_date': str(creation_date[0]) if isinstance(creation_date, list) else str(creation_date),
+            'expiration_date': str(expiration_date[0]) if isinstance(expiration_date, list) else str(expiration_date),
+            'emails': list(emails_found)
+        }
+        self.logger.info("[+] Información WHOIS encontrada.")
+
+    # --- 2. Enumeración de Subdominios ---
+    def _subdomains_step(self) -> Iterator[Tuple[str, dict]]:
+        self.logger.info(f"[*] Buscando subdominios para {self.target}...")
+        # Normaliza, pliega comodines y filtra por ámbito en un solo paso
+        subdomains = SubdomainSet(self.target)
+        subdomains.update(self._iter_crtsh_names())
+        unique_subdomains = subdomains.sorted()
+
+        if unique_subdomains:
+            yield 'subdomain_enumeration', {
+                'subdomains': unique_subdomains,
+                'count': len(unique_subdomains),
+                'wildcards': subdomains.wildcards()
+            }
+            self.logger.info(f"[+] Se encontraron {len(unique_subdomains)} subdominios únicos.")
+        else:
+            self.logger.info(f"[-] No se encontraron subdominios para {self.target}.")
+
+    def _resolve_subdomains(self, names) -> Iterator[Tuple[str, dict]]:
+        """
+        Resuelve en bloque los subdominios de los certificados para separar
+        los que siguen vivos de las entradas antiguas: 'records' son los que
+        tienen algún registro, 'unresolved' los que no existen o no tienen
+        datos y 'failed' los que ningún servidor respondió.
+        """
+        self.logger.info(f"[*] Resolviendo {len(names)} subdominios...")
+        records, unresolved, failed = [], [], []
+        for name, answers in get_resolver().resolve_many(names).items():
+            record = host_records(name, answers)
+            if any(record[key] for key in record if key not in ('name', 'status')):
+                records.append(record)
+            elif record['status'] in (NOERROR, NXDOMAIN):
+                unresolved.append(name)
+            else:
+                failed.append(name)
+        live = sum(1 for record in records if is_live(record))
+        yield 'subdomain_resolution', {
+            'records': records,
+            'unresolved': unresolved,
+            'failed': failed,
+            'live': live,
+            'count': len(names)
+        }
+        self.logger.info(f"[+] {live} de {len(names)} subdominios resuelven a alguna dirección.")
+
+    # --- 3. Registros DNS del dominio ---
+    def _dns_step(self) -> Iterator[Tuple[str, dict]]:
+        answers = get_resolver().resolve_many([self.target])
+        for name, by_type in answers.items():
+            record = host_records(name, by_type)
+            if record['status'] not in (NOERROR, NXDOMAIN):
+                self.logger.warning(f"DNS lookup for {name} failed: {record['status']}")
+                return
+            yield 'dns_records', record
+            self.logger.info("[+] Registros DNS encontrados.")
+
+    # --- 4. Búsqueda en Shodan ---
+    def _shodan_step(self, api) -> Iterator[Tuple[str, dict]]:
+        host = api.host(self.target, history=False)
+        yield 'shodan_host_info', {
+            'country': host.get('country_name'),
+            'city': host.get('city'),
+            'org': host.get('org'),
+            'ports': host.get('ports'),
+            'vulns': list(host.get('vulns', []))[:5],
+            'ip_str': host.get('ip_str')
+        }
+        self.logger.info("[+] Información de Shodan encontrada.")
+
+    def extract_entities(self):
+        """Emails del WHOIS, subdominios, IPs del dominio e IP de Shodan."""
+        for finding in self.results['findings']:
+            data = finding['data']
+            if finding['type'] == 'whois':
+                for email in data.get('emails', []):
+                    yield 'email', email
+            elif finding['type'] == 'subdomain_enumeration':
+                for name in data.get('subdomains', []):
+                    yield 'hostname', name
+            elif finding['type'] == 'dns_records':
+                for address in data.get('a', []) + data.get('aaaa', []):
+                    yield 'ip', address
+            elif finding['type'] == 'shodan_host_info' and data.get('ip_str'):
+                yield 'ip', data['ip_str']
+
+    def _iter_crtsh_names(self) -> Iterator[str]:
+        """
+        Devuelve los nombres ('name_value') de los certificados de crt.sh a
+        medida que llegan. La respuesta se procesa en streaming, certificado a
+        certificado, así que la memoria no crece con el tamaño del JSON.
+        Los nombres de una consulta completa se guardan en la caché (fuente
+        'crt.sh') para que repetir el mismo dominio no vuelva a descargarlo.
+        """
+        cache = get_cache()
+        cache_key = f"names:{self.target.lower()}"
+        if cache is not None:
+            cached = cache.get_value('crt.sh', cache_key)
+            if cached is not None:
+                yield from cached
+                return
+
+        url = f"https://crt.sh/?q=%25.{self.target}&output=json"
+        # Usamos nuestra utilidad 'make_request' en lugar de 'requests.get'
+        response = make_request(url, stream=True)
+        if not response:
+            return
+
+        # Para la caché solo guardamos los nombres distintos, no cada aparición
+        seen = set() if cache is not None else None
+        with response:
+            for cert in iter_response_json_array(response):
+                name_value = cert.get('name_value', '')
+                for name in name_value.split('\n'):
+                    if seen is not None:
+                        seen.add(name)
+                    yield name
+
+        if cache is not None:
+            cache.set_value('crt.sh', cache_key, sorted(seen))
+
 # La función 'run' original ya no es necesaria aquí, la clase la encapsula todo.
\ No newline at end of file
@@ -2,9 +2,9 @@
 
 # Importamos las herramientas de nuestro núcleo
 from ..core.base import BaseModule
+from ..core.utils import make_request
 
 # Importamos las librerías externas
-import requests
 import hashlib
 from urllib.parse import quote
 
@@ -13,6 +13,8 @@ class EmailReconModule(BaseModule):
     Módulo para realizar investigación de direcciones de correo electrónico.
     Hereda de BaseModule para obtener funcionalidades comunes.
     """
+    consumes = ('email',)
+
     def run(self) -> dict:
         """
         Ejecuta el proceso de investigación de emails.
@@ -24,14 +26,13 @@ class EmailReconModule(BaseModule):
             email_hash = hashlib.md5(self.target.lower().strip().encode()).hexdigest()
             gravatar_url = f"https://www.gravatar.com/avatar/{email_hash}?d=404&s=80"
             
-            # Nota: Usamos requests.head directamente aquí.
-            # Nuestra utilidad 'make_request' está pensada para respuestas 2xx exitosas.
-            # En este caso, un 404 es un resultado válido (no hay perfil), así que manejamos la lógica específica aquí.
-            response = requests.head(gravatar_url, timeout=5)
-            if response.status_code == 200:
+            # Nota: En este caso, un 404 es un resultado válido (no hay perfil),
+            # así que se lo indicamos a 'make_request' para que no lo trate como error.
+            response = make_request(gravatar_url, method='HEAD', timeout=5, expected_statuses=(404,))
+            if response is not None and response.status_code == 200:
                 self.add_finding('gravatar_profile', {'profile_url': f"https://www.gravatar.com/{email_hash}"})
                 self.logger.info("[+] Perfil de Gravatar encontrado.")
-        except requests.RequestException as e:
+        except Exception as e:
             self.logger.error(f"[!] Error al comprobar Gravatar: {e}")
 
         # --- 2. Generación de Enlaces para Investigación Manual ---
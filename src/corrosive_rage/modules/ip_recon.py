@@ -2,72 +2,103 @@
 
 # Importamos las herramientas de nuestro núcleo
 from ..core.base import BaseModule
-from ..core.utils import get_shodan_client, make_request
+from ..core.dns import NOERROR, NXDOMAIN, get_resolver
+from ..core.geoip import get_geo_batcher, is_ip
+from ..core.steps import Step
+from ..core.utils import get_shodan_client
 
 # Importamos las librerías externas
-import socket
+import functools
+from typing import Iterator, Tuple
 
 class IpReconModule(BaseModule):
     """
     Módulo para realizar investigación de direcciones IP.
     Hereda de BaseModule para obtener funcionalidades comunes.
     """
+    consumes = ('ip',)
+    produces = ('hostname',)
+
     def run(self) -> dict:
         """
-        Ejecuta el proceso de investigación de IPs.
+        Ejecuta el proceso de investigación de IPs. Geolocalización, DNS
+        inverso y Shodan se consultan a la vez (core.steps).
         """
         self.logger.info(f"[*] Iniciando investigación de IP para: {self.target}")
 
-        # --- 1. Geolocalización con ip-api.com ---
-        try:
-            # Usamos nuestra utilidad 'make_request' para una petición más robusta
-            response = make_request(f"http://ip-api.com/json/{self.target}")
-            if response:
-                data = response.json()
-                if data.get('status') == 'success':
-                    self.add_finding('geolocation', {
-                        'country': data.get('country'),
-                        'region': data.get('regionName'),
-                        'city': data.get('city'),
-                        'isp': data.get('isp'),
-                        'org': data.get('org'),
-                        'query': data.get('query')
-                    })
-                    self.logger.info("[+] Información de geolocalización encontrada.")
-                else:
-                    self.logger.warning(f"Geolocalization API returned an error: {data.get('message')}")
-        except Exception as e:
-            self.logger.error(f"[!] Error en la consulta de geolocalización: {e}")
-
-        # --- 2. DNS Inverso ---
-        try:
-            hostname, _, _ = socket.gethostbyaddr(self.target)
-            self.add_finding('reverse_dns', {'hostname': hostname})
-            self.logger.info(f"[+] DNS inverso encontrado: {hostname}")
-        except socket.herror:
-            self.logger.info("[-] No se encontró DNS inverso para esta IP.")
-        except Exception as e:
-            self.logger.error(f"[!] Error en la consulta de DNS inverso: {e}")
+        steps = [Step('geolocation', self._geolocation_step), Step('reverse_dns', self._reverse_dns_step)]
 
-        # --- 3. Búsqueda en Shodan ---
         # ¡Fíjate qué idéntico y limpio es este bloque al del módulo de dominios!
         shodan_api_key = self.get_api_key('shodan')
         api = get_shodan_client(shodan_api_key)
-        
         if api:
-            try:
-                host = api.host(self.target, history=False)
-                self.add_finding('shodan_host_info', {
-                    'country': host.get('country_name'),
-                    'city': host.get('city'),
-                    'org': host.get('org'),
-                    'ports': host.get('ports'),
-                    'vulns': list(host.get('vulns', []))[:5]
-                })
-                self.logger.info("[+] Información de Shodan encontrada.")
-            except Exception as e:
-                self.logger.error(f"[!] Error al consultar Shodan: {e}")
+            steps.append(Step('shodan', functools.partial(self._shodan_step, api)))
         else:
             self.logger.info("[!] Omitiendo búsqueda en Shodan.")
 
-        return self.results
\ No newline at end of file
+        self.run_steps(steps)
+
+        return self.results
+
+    # --- 1. Geolocalización con ip-api.com ---
+    def _geolocation_step(self) -> Iterator[Tuple[str, dict]]:
+        # Las IPs que se consultan a la vez (modo batch, pipeline) se agrupan
+        # en peticiones al endpoint /batch de ip-api (core.geoip)
+        data = get_geo_batcher().lookup(self.target)
+        if data:
+            if data.get('status') == 'success':
+                yield 'geolocation', {
+                    'country': data.get('country'),
+                    'region': data.get('regionName'),
+                    'city': data.get('city'),
+                    'isp': data.get('isp'),
+                    'org': data.get('org'),
+                    'query': data.get('query')
+                }
+                self.logger.info("[+] Información de geolocalización encontrada.")
+            else:
+                self.logger.warning(f"Geolocalization API returned an error: {data.get('message')}")
+
+    # --- 2. DNS Inverso ---
+    def _reverse_dns_step(self) -> Iterator[Tuple[str, dict]]:
+        # Resolutor propio (core.dns): sin bloquear un hilo por consulta y con caché por TTL
+        resolver = get_resolver()
+        address = self.target
+        if not is_ip(address):
+            # Igual que gethostbyaddr(): un nombre se resuelve primero (A, si no AAAA)
+            # y se busca el PTR de su dirección
+            answers = next(iter(resolver.resolve_many([address], ('A', 'AAAA')).values()), {})
+            address = next((record for rtype in ('A', 'AAAA')
+                            for record in (answers[rtype].records if rtype in answers else ())), None)
+            if address is None:
+                self.logger.info(f"[-] No se pudo resolver {self.target} para buscar su DNS inverso.")
+                return
+        answer = resolver.reverse_many([address]).get(address)
+        if answer is None:
+            return
+        if answer.records:
+            hostname = answer.records[0]
+            yield 'reverse_dns', {'hostname': hostname}
+            self.logger.info(f"[+] DNS inverso encontrado: {hostname}")
+        elif answer.rcode in (NOERROR, NXDOMAIN):
+            self.logger.info("[-] No se encontró DNS inverso para esta IP.")
+        else:
+            self.logger.warning(f"Reverse DNS lookup for {self.target} failed: {answer.rcode}")
+
+    # --- 3. Búsqueda en Shodan ---
+    def _shodan_step(self, api) -> Iterator[Tuple[str, dict]]:
+        host = api.host(self.target, history=False)
+        yield 'shodan_host_info', {
+            'country': host.get('country_name'),
+            'city': host.get('city'),
+            'org': host.get('org'),
+            'ports': host.get('ports'),
+            'vulns': list(host.get('vulns', []))[:5]
+        }
+        self.logger.info("[+] Información de Shodan encontrada.")
+
+    def extract_entities(self):
+        """Nombre obtenido por DNS inverso."""
+        for finding in self.results['findings']:
+            if finding['type'] == 'reverse_dns' and finding['data'].get('hostname'):
+                yield 'hostname', finding['data']['hostname']
@@ -23,6 +23,8 @@ class MetadataReconModule(BaseModule):
     Módulo para analizar metadatos de documentos.
     Hereda de BaseModule para obtener funcionalidades comunes.
     """
+    consumes = ('url',)
+
     def run(self) -> dict:
         """
         Ejecuta el análisis de metadatos.
@@ -9,6 +9,8 @@ class PhoneReconModule(BaseModule):
     Módulo para validar y obtener información de números de teléfono.
     Hereda de BaseModule para obtener funcionalidades comunes.
     """
+    consumes = ('phone',)
+
     def run(self) -> dict:
         """
         Ejecuta la validación e investigación del número de teléfono.
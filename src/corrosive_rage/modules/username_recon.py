@@ -6,6 +6,7 @@ from ..core.utils import make_request
 
 # Importamos las librerías externas
 import concurrent.futures
+import contextvars
 
 # La lista de sitios sigue siendo una constante a nivel de módulo
 SITES = [
@@ -51,6 +52,8 @@ class UsernameReconModule(BaseModule):
     Módulo para realizar investigación de nombres de usuario en redes sociales.
     Hereda de BaseModule para obtener funcionalidades comunes.
     """
+    consumes = ('username',)
+
     def run(self) -> dict:
         """
         Ejecuta la búsqueda de nombres de usuario en paralelo.
@@ -60,9 +63,11 @@ class UsernameReconModule(BaseModule):
         
         # Usamos ThreadPoolExecutor para hacer las peticiones en paralelo.
         # La diferencia clave es que pasamos 'self.logger' a cada worker.
+        # Cada worker corre en una copia del contexto para conservar la
+        # etiqueta de módulo de las trazas HTTP.
         with concurrent.futures.ThreadPoolExecutor() as executor:
             futures = [
-                executor.submit(check_username, self.target, site, self.logger) 
+                executor.submit(contextvars.copy_context().run, check_username, self.target, site, self.logger)
                 for site in SITES
             ]
             
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from corrosive_rage.core.streaming import iter_json_array
+
+
+def split_every(text, size):
+    data = text.encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_values_split_across_chunks():
+    assert list(iter_json_array([b'[1, 2', b'34, 5]'])) == [1, 234, 5]
+    assert list(iter_json_array([b'[1.', b'5, 2e', b'3, tr', b'ue, nu', b'll]'])) == [1.5, 2e3, True, None]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64])
+def test_any_chunk_size_matches_json_loads(size):
+    document = [{'name_value': 'a.example.com\nb.example.com', 'id': 12345678901},
+                -0.5, 1e-7, 'café \\"x\\" ☃', [], {}, [1, [2, [3]]], False, None, 42]
+    text = json.dumps(document)
+    assert list(iter_json_array(split_every(text, size))) == document
+
+
+def test_empty_body_and_array():
+    assert list(iter_json_array([])) == []
+    assert list(iter_json_array([b'  [ ]  '])) == []
+
+
+@pytest.mark.parametrize('body', ['[1 2 3]', '[1,,2]', '[1, 2,]', '[{"a": 1}x]', '[1, {"a" 1}, 2]', '{"a": 1}'])
+def test_malformed_arrays_are_rejected(body):
+    with pytest.raises(ValueError):
+        list(iter_json_array(split_every(body, 3)))
+
+
+def test_malformed_element_fails_without_reading_the_rest():
+    def chunks():
+        yield b'[{"a": 1}, {"a" 2}, '
+        for _ in range(1000):
+            yield b'{"a": 3}, '
+        raise AssertionError("read past the malformed element")
+
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunks()))
+
+
+def test_truncated_array():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'[1, 2, {"a": ']))